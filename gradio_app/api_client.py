@@ -1,27 +1,179 @@
 """API client wrapper for communicating with FastAPI backend."""
 import os
+import asyncio
+import functools
+import threading
+import aiohttp
+import orjson
 import requests
-from typing import Optional, Dict, Any, List
+from cachetools import LRUCache, TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ReadTimeoutError
+from urllib3.util.retry import Retry
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+from typing import Optional, Dict, Any, AsyncIterator, Callable, Iterator, List
 
 # Get API base URL from environment or use default
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
 
+# Read-only list responses are reused for a few seconds to collapse duplicate calls
+LIST_CACHE_TTL_SECONDS = 5
+
+# Polled status URLs (one per job/evaluation id) whose ETag and body are kept for revalidation
+CONDITIONAL_CACHE_SIZE = 64
+
+# Gateway/unavailable statuses worth retrying on idempotent reads; 4xx are returned at once
+RETRY_STATUS_CODES = (502, 503, 504)
+
+
+class APIError(Exception):
+    """Error response from the backend, carrying its HTTP status."""
+    
+    def __init__(self, status: int, detail: str):
+        super().__init__(f"API Error: {detail}")
+        self.status = status
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """Retry connection failures, timeouts and gateway errors, mirroring the sync client's Retry."""
+    if isinstance(error, APIError):
+        return error.status in RETRY_STATUS_CODES
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+def _is_read_timeout(error: Exception) -> bool:
+    """True for a read timeout, whether raised before the body (ReadTimeout) or while iterating it."""
+    # requests re-raises a mid-body urllib3 ReadTimeoutError as a ConnectionError wrapping it
+    return isinstance(error, requests.exceptions.ReadTimeout) or (
+        isinstance(error, requests.exceptions.ConnectionError)
+        and any(isinstance(arg, ReadTimeoutError) for arg in error.args)
+    )
+
+
+def _fields_params(session_fields: Optional[List[str]], evaluation_fields: Optional[List[str]]) -> Dict[str, str]:
+    """Build /ui/bootstrap query params for projected session/evaluation rows."""
+    params = {}
+    if session_fields:
+        params["session_fields"] = ",".join(session_fields)
+    if evaluation_fields:
+        params["evaluation_fields"] = ",".join(evaluation_fields)
+    return params
+
+
+def _safe(default_factory: Callable[[], Dict[str, Any]]):
+    """Turn any exception raised by an endpoint call into default_factory() plus an "error" key."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                result = default_factory()
+                result["error"] = str(e)
+                return result
+        return wrapper
+    return decorator
+
 
 class APIClient:
     """Client for interacting with FastAPI backend."""
     
     def __init__(self, base_url: str = API_BASE_URL):
         self.base_url = base_url.rstrip("/")
+        
+        # Persistent session so repeated calls reuse pooled keep-alive connections.
+        # uvicorn only speaks HTTP/1.1, so concurrency comes from the pool (and the
+        # aiohttp client below) rather than HTTP/2 multiplexing.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                backoff_jitter=0.1,
+                status_forcelist=list(RETRY_STATUS_CODES),
+                # POSTs (chat, job starts) are not idempotent, so only reads retry on 5xx;
+                # connection errors are still retried for every method
+                allowed_methods=["HEAD", "GET"],
+                respect_retry_after_header=True,
+                raise_on_status=False
+            )
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Accept": "application/json"})
+        
+        self._cache: TTLCache = TTLCache(maxsize=32, ttl=LIST_CACHE_TTL_SECONDS)
+        
+        # Last (ETag, body) per polled status URL, for If-None-Match revalidation. Bounded, since
+        # every job or evaluation id polled adds a URL; the least recently polled ones are dropped
+        self._validators: LRUCache = LRUCache(maxsize=CONDITIONAL_CACHE_SIZE)
+        
+        # Open a pooled connection in the background so the first user click skips the handshake
+        threading.Thread(target=self._preconnect, daemon=True).start()
+    
+    def _preconnect(self):
+        """Issue a cheap HEAD /health to warm the connection pool; failures are ignored."""
+        try:
+            self.session.head(f"{self.base_url}/health", timeout=2)
+        except requests.exceptions.RequestException:
+            pass
+    
+    def close(self):
+        """Close the underlying HTTP session and its pooled connections."""
+        self.session.close()
+    
+    def invalidate(self):
+        """Drop cached list responses so the next call hits the backend."""
+        self._cache.clear()
+    
+    def _cached(self, key: tuple, fetch: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Return a cached response for key, fetching it on miss. Error responses are not cached."""
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        result = fetch()
+        if "error" not in result:
+            self._cache[key] = result
+        return result
+    
+    def _conditional_get(self, url: str, timeout: int = 10) -> Dict[str, Any]:
+        """GET a polled status URL, reusing the last body when the server answers 304 Not Modified."""
+        headers = {}
+        cached = self._validators.get(url)
+        if cached is not None:
+            headers["If-None-Match"] = cached[0]
+        response = self.session.get(url, headers=headers, timeout=timeout)
+        if response.status_code == 304 and cached is not None:
+            return cached[1]
+        result = self._handle_response(response)
+        etag = response.headers.get("ETag")
+        if etag:
+            self._validators[url] = (etag, result)
+        else:
+            self._validators.pop(url, None)
+        return result
+    
+    def _post_json(self, url: str, payload: Dict[str, Any], timeout: int) -> requests.Response:
+        """POST a JSON body encoded with orjson instead of the stdlib encoder."""
+        return self.session.post(
+            url,
+            data=orjson.dumps(payload),
+            headers={"Content-Type": "application/json"},
+            timeout=timeout
+        )
     
     def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
         """Handle API response and errors."""
         try:
             response.raise_for_status()
-            return response.json()
+            return orjson.loads(response.content)
         except requests.exceptions.HTTPError as e:
             error_detail = "Unknown error"
             try:
-                error_data = response.json()
+                error_data = orjson.loads(response.content)
                 error_detail = error_data.get("detail", str(e))
             except:
                 error_detail = str(e)
@@ -31,47 +183,49 @@ class APIClient:
     
     # ===== CHAT ENDPOINTS =====
     
+    @_safe(dict)
     def send_chat_message(self, message: str, session_id: Optional[str] = None) -> Dict[str, Any]:
         """Send a chat message."""
-        try:
-            response = requests.post(
-                f"{self.base_url}/chat",
-                json={
-                    "message": message,
-                    "session_id": session_id,
-                    "metadata": {}
-                },
-                timeout=60
-            )
-            return self._handle_response(response)
-        except Exception as e:
-            return {"error": str(e)}
+        response = self._post_json(
+            f"{self.base_url}/chat",
+            {
+                "message": message,
+                "session_id": session_id,
+                "metadata": {}
+            },
+            timeout=60
+        )
+        return self._handle_response(response)
     
+    @_safe(dict)
     def get_session(self, session_id: str) -> Dict[str, Any]:
         """Get session by ID."""
-        try:
-            response = requests.get(
-                f"{self.base_url}/sessions/{session_id}",
-                timeout=10
-            )
-            return self._handle_response(response)
-        except Exception as e:
-            return {"error": str(e)}
+        response = self.session.get(
+            f"{self.base_url}/sessions/{session_id}",
+            timeout=10
+        )
+        return self._handle_response(response)
     
-    def list_sessions(self, limit: int = 100) -> Dict[str, Any]:
-        """List all sessions."""
-        try:
-            response = requests.get(
-                f"{self.base_url}/sessions",
-                params={"limit": limit},
-                timeout=10
-            )
-            return self._handle_response(response)
-        except Exception as e:
-            return {"error": str(e), "sessions": [], "total": 0}
+    def list_sessions(self, limit: int = 100, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """List all sessions (cached briefly). With fields, rows are projected server-side."""
+        fields_param = ",".join(fields) if fields else None
+        return self._cached(("sessions", limit, fields_param), lambda: self._list_sessions(limit, fields_param))
+    
+    @_safe(lambda: {"sessions": [], "total": 0})
+    def _list_sessions(self, limit: int, fields: Optional[str]) -> Dict[str, Any]:
+        params = {"limit": limit}
+        if fields:
+            params["fields"] = fields
+        response = self.session.get(
+            f"{self.base_url}/sessions",
+            params=params,
+            timeout=10
+        )
+        return self._handle_response(response)
     
     # ===== RETRIEVAL ENDPOINTS =====
     
+    @_safe(dict)
     def retrieve_documents(
         self,
         query: str,
@@ -81,24 +235,22 @@ class APIClient:
         pipeline_type: str = "recursive_overlap"
     ) -> Dict[str, Any]:
         """Retrieve documents from vector database."""
-        try:
-            response = requests.post(
-                f"{self.base_url}/retrieve",
-                json={
-                    "query": query,
-                    "top_k": top_k,
-                    "use_query_enhancer": use_query_enhancer,
-                    "use_reranking": use_reranking,
-                    "pipeline_type": pipeline_type
-                },
-                timeout=60
-            )
-            return self._handle_response(response)
-        except Exception as e:
-            return {"error": str(e)}
+        response = self._post_json(
+            f"{self.base_url}/retrieve",
+            {
+                "query": query,
+                "top_k": top_k,
+                "use_query_enhancer": use_query_enhancer,
+                "use_reranking": use_reranking,
+                "pipeline_type": pipeline_type
+            },
+            timeout=60
+        )
+        return self._handle_response(response)
     
     # ===== INGESTION ENDPOINTS =====
     
+    @_safe(dict)
     def start_ingestion_job(
         self,
         folder_path: str,
@@ -106,47 +258,63 @@ class APIClient:
         pipeline_type: str = "recursive_overlap"
     ) -> Dict[str, Any]:
         """Start a folder ingestion job."""
-        try:
-            if file_types is None:
-                file_types = ["pdf", "json"]
+        if file_types is None:
+            file_types = ["pdf", "json"]
             
-            response = requests.post(
-                f"{self.base_url}/ingestion/start_job",
-                json={
-                    "folder_path": folder_path,
-                    "file_types": file_types,
-                    "pipeline_type": pipeline_type
-                },
-                timeout=10
-            )
-            return self._handle_response(response)
-        except Exception as e:
-            return {"error": str(e)}
+        response = self._post_json(
+            f"{self.base_url}/ingestion/start_job",
+            {
+                "folder_path": folder_path,
+                "file_types": file_types,
+                "pipeline_type": pipeline_type
+            },
+            timeout=10
+        )
+        return self._handle_response(response)
     
+    @_safe(dict)
     def get_ingestion_status(self, job_id: str) -> Dict[str, Any]:
         """Get ingestion job status."""
-        try:
-            response = requests.get(
-                f"{self.base_url}/ingestion/status/{job_id}",
-                timeout=10
-            )
-            return self._handle_response(response)
-        except Exception as e:
-            return {"error": str(e)}
+        return self._conditional_get(f"{self.base_url}/ingestion/status/{job_id}")
     
+    def stream_ingestion_status(self, job_id: str) -> Iterator[Dict[str, Any]]:
+        """
+        Yield ingestion status updates pushed by /ingestion/stream until the job finishes.
+        
+        A read timeout only means the stream went quiet, so it reconnects instead of yielding an error.
+        """
+        while True:
+            try:
+                with self.session.get(
+                    f"{self.base_url}/ingestion/stream/{job_id}",
+                    headers={"Accept": "text/event-stream"},
+                    stream=True,
+                    timeout=(5, 60)
+                ) as response:
+                    response.raise_for_status()
+                    for line in response.iter_lines():
+                        if line.startswith(b"data:"):
+                            yield orjson.loads(line[len(b"data:"):])
+                # The server closes the stream once the job completes or fails
+                return
+            except Exception as e:
+                if _is_read_timeout(e):
+                    continue
+                yield {"error": str(e)}
+                return
+    
+    @_safe(lambda: {"active_jobs": []})
     def list_ingestion_jobs(self) -> Dict[str, Any]:
         """List all active ingestion jobs."""
-        try:
-            response = requests.get(
-                f"{self.base_url}/ingestion/jobs",
-                timeout=10
-            )
-            return self._handle_response(response)
-        except Exception as e:
-            return {"error": str(e), "active_jobs": []}
+        response = self.session.get(
+            f"{self.base_url}/ingestion/jobs",
+            timeout=10
+        )
+        return self._handle_response(response)
     
     # ===== EVALUATION ENDPOINTS =====
     
+    @_safe(dict)
     def start_evaluation(
         self,
         folder_path: str,
@@ -158,68 +326,192 @@ class APIClient:
         question_group_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """Start an evaluation job."""
-        try:
-            payload = {
-                "folder_path": folder_path,
-                "top_k": top_k,
-                "use_query_enhancer": use_query_enhancer,
-                "use_reranking": use_reranking,
-                "num_questions_per_doc": num_questions_per_doc
-            }
+        payload = {
+            "folder_path": folder_path,
+            "top_k": top_k,
+            "use_query_enhancer": use_query_enhancer,
+            "use_reranking": use_reranking,
+            "num_questions_per_doc": num_questions_per_doc
+        }
             
-            if source_evaluation_id:
-                payload["source_evaluation_id"] = source_evaluation_id
-            if question_group_id:
-                payload["question_group_id"] = question_group_id
+        if source_evaluation_id:
+            payload["source_evaluation_id"] = source_evaluation_id
+        if question_group_id:
+            payload["question_group_id"] = question_group_id
             
-            response = requests.post(
-                f"{self.base_url}/evaluation/start",
-                json=payload,
-                timeout=10
-            )
-            return self._handle_response(response)
-        except Exception as e:
-            return {"error": str(e)}
+        response = self._post_json(
+            f"{self.base_url}/evaluation/start",
+            payload,
+            timeout=10
+        )
+        return self._handle_response(response)
     
+    @_safe(dict)
     def get_evaluation_status(self, evaluation_id: str) -> Dict[str, Any]:
         """Get evaluation status and results."""
-        try:
-            response = requests.get(
-                f"{self.base_url}/evaluation/{evaluation_id}",
-                timeout=10
+        return self._conditional_get(f"{self.base_url}/evaluation/{evaluation_id}")
+    
+    def list_evaluations(self, limit: int = 50, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """List all evaluations (cached briefly). With fields, rows are projected server-side."""
+        fields_param = ",".join(fields) if fields else None
+        return self._cached(("evaluations", limit, fields_param), lambda: self._list_evaluations(limit, fields_param))
+    
+    @_safe(lambda: {"evaluations": [], "total": 0})
+    def _list_evaluations(self, limit: int, fields: Optional[str]) -> Dict[str, Any]:
+        params = {"limit": limit}
+        if fields:
+            params["fields"] = fields
+        response = self.session.get(
+            f"{self.base_url}/evaluations",
+            params=params,
+            timeout=10
+        )
+        return self._handle_response(response)
+    
+    # ===== UI ENDPOINTS =====
+    
+    @_safe(dict)
+    def bootstrap(
+        self,
+        session_fields: Optional[List[str]] = None,
+        evaluation_fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Fetch sessions, assets and evaluations for the initial UI in one request."""
+        response = self.session.get(
+            f"{self.base_url}/ui/bootstrap",
+            params=_fields_params(session_fields, evaluation_fields),
+            timeout=10
+        )
+        return self._handle_response(response)
+    
+    # ===== ASSETS ENDPOINTS =====
+    
+    def list_assets(self, path: Optional[str] = None) -> Dict[str, Any]:
+        """List assets folders and files (cached briefly)."""
+        return self._cached(("assets", path), lambda: self._list_assets(path))
+    
+    @_safe(lambda: {"folders": [], "files": []})
+    def _list_assets(self, path: Optional[str]) -> Dict[str, Any]:
+        params = {"path": path} if path else {}
+        response = self.session.get(
+            f"{self.base_url}/assets/list",
+            params=params,
+            timeout=10
+        )
+        return self._handle_response(response)
+
+
+class AsyncAPIClient:
+    """Async client for read-only endpoints that can be fetched concurrently."""
+    
+    def __init__(self, base_url: str = API_BASE_URL):
+        self.base_url = base_url.rstrip("/")
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Create the aiohttp session lazily (it must be bound to a running event loop)."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60),
+                headers={"Accept": "application/json"},
+                timeout=aiohttp.ClientTimeout(total=10),
+                json_serialize=lambda obj: orjson.dumps(obj).decode()
             )
-            return self._handle_response(response)
+        return self._session
+    
+    async def close(self):
+        """Close the underlying aiohttp session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+    
+    @retry(
+        retry=retry_if_exception(_is_retryable),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=0.2, max=2),
+        reraise=True
+    )
+    async def _get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """GET a path and return the parsed JSON body."""
+        async with self._get_session().get(f"{self.base_url}{path}", params=params) as resp:
+            if resp.status >= 400:
+                try:
+                    error_data = await resp.json(loads=orjson.loads)
+                    error_detail = error_data.get("detail", resp.reason)
+                except Exception:
+                    error_detail = resp.reason
+                raise APIError(resp.status, error_detail)
+            return await resp.json(loads=orjson.loads)
+    
+    async def stream_chat_message(self, message: str, session_id: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """Send a chat message and yield the Server-Sent Events pushed by /chat/stream."""
+        try:
+            async with self._get_session().post(
+                f"{self.base_url}/chat/stream",
+                json={
+                    "message": message,
+                    "session_id": session_id,
+                    "metadata": {}
+                },
+                timeout=aiohttp.ClientTimeout(total=None, sock_read=60)
+            ) as resp:
+                if resp.status >= 400:
+                    try:
+                        error_data = await resp.json(loads=orjson.loads)
+                        error_detail = error_data.get("detail", resp.reason)
+                    except Exception:
+                        error_detail = resp.reason
+                    yield {"type": "error", "detail": f"API Error: {error_detail}"}
+                    return
+                
+                # aiohttp's StreamReader iterates line by line, so frames never arrive split
+                async for raw_line in resp.content:
+                    line = raw_line.decode("utf-8").strip()
+                    if line.startswith("data:"):
+                        yield orjson.loads(line[len("data:"):])
+        except Exception as e:
+            yield {"type": "error", "detail": str(e)}
+    
+    async def bootstrap(
+        self,
+        session_fields: Optional[List[str]] = None,
+        evaluation_fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Fetch sessions, assets and evaluations for the initial UI in one request."""
+        try:
+            return await self._get_json("/ui/bootstrap", params=_fields_params(session_fields, evaluation_fields))
         except Exception as e:
             return {"error": str(e)}
     
-    def list_evaluations(self, limit: int = 50) -> Dict[str, Any]:
-        """List all evaluations."""
+    async def list_sessions(self, limit: int = 100, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """List all sessions. With fields, rows are projected server-side."""
         try:
-            response = requests.get(
-                f"{self.base_url}/evaluations",
-                params={"limit": limit},
-                timeout=10
-            )
-            return self._handle_response(response)
+            params = {"limit": limit}
+            if fields:
+                params["fields"] = ",".join(fields)
+            return await self._get_json("/sessions", params=params)
         except Exception as e:
-            return {"error": str(e), "evaluations": [], "total": 0}
+            return {"error": str(e), "sessions": [], "total": 0}
     
-    # ===== ASSETS ENDPOINTS =====
+    async def list_evaluations(self, limit: int = 50, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """List all evaluations. With fields, rows are projected server-side."""
+        try:
+            params = {"limit": limit}
+            if fields:
+                params["fields"] = ",".join(fields)
+            return await self._get_json("/evaluations", params=params)
+        except Exception as e:
+            return {"error": str(e), "evaluations": [], "total": 0}
     
-    def list_assets(self, path: Optional[str] = None) -> Dict[str, Any]:
+    async def list_assets(self, path: Optional[str] = None) -> Dict[str, Any]:
         """List assets folders and files."""
         try:
             params = {"path": path} if path else {}
-            response = requests.get(
-                f"{self.base_url}/assets/list",
-                params=params,
-                timeout=10
-            )
-            return self._handle_response(response)
+            return await self._get_json("/assets/list", params=params)
         except Exception as e:
             return {"error": str(e), "folders": [], "files": []}
 
 
-# Global API client instance
+# Global API client instances
 api_client = APIClient()
+async_api_client = AsyncAPIClient()
 
@@ -1,8 +1,10 @@
 """Main Gradio application for RAG Boilerplate system."""
+import asyncio
 import gradio as gr
 import time
 from typing import Optional, Tuple
-from api_client import api_client
+from api_client import api_client, async_api_client
+from choice_builders import session_choices, evaluation_reuse_choices, evaluation_choices
 from components import (
     format_chat_history,
     format_retrieved_documents,
@@ -11,44 +13,41 @@ from components import (
     format_evaluation_results,
     format_evaluations_comparison_table,
     format_assets_tree,
-    format_status_badge
+    STARTED_BADGE
 )
 
+# Evaluations are fetched once at the larger limit; smaller views slice the newest-first list
+EVALUATIONS_FETCH_LIMIT = 100
+EVALUATIONS_DROPDOWN_LIMIT = 50
+
+# Shared worker pool for sync handlers; slow chat/retrieval/ingestion calls get a
+# smaller per-event limit so they cannot take every worker from the other tabs
+QUEUE_WORKER_THREADS = 8
+HEAVY_HANDLER_CONCURRENCY = 4
+
+# Only the fields the dropdowns render are requested; rows come back as positional tuples
+SESSION_FIELDS = ["session_id", "first_message", "message_count"]
+EVALUATION_FIELDS = ["evaluation_id", "status", "folder_path", "num_documents_processed"]
+
 
 # ===== CHAT TAB FUNCTIONS =====
 
 def get_sessions_choices():
     """Get sessions as dropdown choices list."""
+    return build_sessions_choices(api_client.list_sessions(fields=SESSION_FIELDS))
+
+
+def build_sessions_choices(result):
+    """Build session dropdown choices from a projected /sessions response."""
     try:
-        result = api_client.list_sessions()
-        sessions = result.get("sessions", [])
-        
-        if not sessions:
-            return []
-        
-        # Format as (display_name, session_id)
-        choices = []
-        for session in sessions:
-            session_id = session.get("session_id", "")
-            first_message = session.get("first_message", "")
-            msg_count = session.get("message_count", 0)
-            last_activity = session.get("last_activity", "")[:19] if session.get("last_activity") else "N/A"
-            
-            # Use first message as display if available, otherwise use session ID
-            if first_message:
-                display = f"{first_message}... ({msg_count} msgs)"
-            else:
-                display = f"Session {session_id[:8]}... ({msg_count} msgs)"
-            
-            choices.append((display, session_id))
-        
-        return choices
+        return session_choices(result.get("rows", []))
     except Exception as e:
         print(f"Error loading sessions: {e}")
         return []
 
 def load_sessions_list():
     """Load list of all sessions for dropdown update."""
+    api_client.invalidate()
     choices = get_sessions_choices()
     return gr.update(choices=choices, value=None)
 
@@ -62,23 +61,30 @@ def load_session_history(session_id):
     return format_chat_history(result)
 
 
-def send_message(message, session_id):
-    """Send a chat message."""
+async def send_message(message, session_id):
+    """Send a chat message over /chat/stream, showing the answer once the backend sends it."""
     if not message.strip():
-        return "Please enter a message", ""
-    
-    result = api_client.send_chat_message(message, session_id)
-    
-    if "error" in result:
-        return f"Error: {result['error']}", ""
+        yield "Please enter a message", ""
+        return
     
-    response = result.get("message", "")
-    sources = result.get("sources", [])
-    new_session_id = result.get("session_id", session_id)
-    
-    sources_text = "\n\n**Sources:**\n" + "\n".join([f"- {s}" for s in sources]) if sources else ""
-    
-    return response + sources_text, new_session_id
+    partial_text = ""
+    async for event in async_api_client.stream_chat_message(message, session_id):
+        event_type = event.get("type")
+        
+        if event_type == "delta":
+            partial_text += event.get("text", "")
+            yield partial_text, session_id
+        elif event_type == "error":
+            yield f"Error: {event.get('detail', 'Unknown error')}", ""
+            return
+        elif event_type == "done":
+            # A new message may have created a session; don't serve a stale list
+            api_client.invalidate()
+            
+            sources = event.get("sources", [])
+            new_session_id = event.get("session_id", session_id)
+            sources_text = "\n\n**Sources:**\n" + "\n".join([f"- {s}" for s in sources]) if sources else ""
+            yield partial_text + sources_text, new_session_id
 
 
 def refresh_chat_history(session_id):
@@ -112,7 +118,11 @@ def test_retrieval(query, top_k, use_query_enhancer, use_reranking, pipeline_typ
 
 def load_assets_folders():
     """Load list of asset folders."""
-    result = api_client.list_assets()
+    return build_assets_folders(api_client.list_assets())
+
+
+def build_assets_folders(result):
+    """Build asset folder choices from an /assets/list response."""
     folders = result.get("folders", [])
     
     if not folders:
@@ -124,6 +134,7 @@ def load_assets_folders():
 
 def refresh_assets_folders():
     """Refresh the assets folders dropdown."""
+    api_client.invalidate()
     choices = load_assets_folders()
     return gr.update(choices=choices, value=None)
 
@@ -154,7 +165,7 @@ def start_ingestion(folder_path, pdf_checked, json_checked, pipeline_type):
     job_id = result.get("job_id", "")
     message = result.get("message", "")
     
-    return f"{format_status_badge('started')} {message}\n\nJob ID: {job_id}", job_id
+    return f"{STARTED_BADGE} {message}\n\nJob ID: {job_id}", job_id
 
 
 def check_ingestion_status(job_id):
@@ -169,6 +180,15 @@ def check_ingestion_status(job_id):
     return formatted, progress
 
 
+def stream_ingestion_updates(live_updates, job_id):
+    """Push status and progress to the UI each time the server reports a change."""
+    if not (live_updates and job_id):
+        return
+    
+    for result in api_client.stream_ingestion_status(job_id):
+        yield format_ingestion_status(result), result.get("progress_percentage", 0)
+
+
 def refresh_jobs_list():
     """Refresh active jobs list."""
     result = api_client.list_ingestion_jobs()
@@ -184,36 +204,30 @@ def load_evaluation_folders():
 
 def refresh_evaluation_folders():
     """Refresh the evaluation folders dropdown."""
+    api_client.invalidate()
     choices = load_evaluation_folders()
     return gr.update(choices=choices, value=None)
 
 
 def get_evaluations_for_reuse_choices():
     """Get completed evaluations choices list."""
+    return build_evaluations_for_reuse_choices(
+        api_client.list_evaluations(limit=EVALUATIONS_FETCH_LIMIT, fields=EVALUATION_FIELDS)
+    )
+
+
+def build_evaluations_for_reuse_choices(result):
+    """Build question-reuse dropdown choices from a projected /evaluations response."""
+    choices = [("None (generate new questions)", None)]
     try:
-        result = api_client.list_evaluations(limit=100)
-        evaluations = result.get("evaluations", [])
-        
-        completed = [e for e in evaluations if e.get("status") == "completed"]
-        
-        if not completed:
-            return [("None (generate new questions)", None)]
-        
-        choices = [("None (generate new questions)", None)]
-        for eval_data in completed:
-            eval_id = eval_data.get("evaluation_id", "")
-            folder = eval_data.get("folder_path", "").split("/")[-1]
-            num_docs = eval_data.get("num_documents_processed", 0)
-            display = f"{eval_id[:20]}... ({folder}, {num_docs} docs)"
-            choices.append((display, eval_id))
-        
-        return choices
+        choices.extend(evaluation_reuse_choices(result.get("rows", [])))
     except Exception as e:
         print(f"Error loading evaluations for reuse: {e}")
-        return [("None (generate new questions)", None)]
+    return choices
 
 def load_evaluations_for_reuse():
     """Load completed evaluations for question reuse (for dropdown update)."""
+    api_client.invalidate()
     choices = get_evaluations_for_reuse_choices()
     return gr.update(choices=choices, value=None)
 
@@ -242,39 +256,34 @@ def start_evaluation_job(
     if "error" in result:
         return f"Error: {result['error']}"
     
+    api_client.invalidate()
     eval_id = result.get("evaluation_id", "")
     message = result.get("message", "")
     reused = result.get("reused_questions", False)
     
     reused_text = " (Reused questions)" if reused else " (Generated new questions)"
     
-    return f"{format_status_badge('started')} {message}{reused_text}\n\nEvaluation ID: {eval_id}"
+    return f"{STARTED_BADGE} {message}{reused_text}\n\nEvaluation ID: {eval_id}"
 
 
 def get_evaluations_dropdown_choices():
     """Get evaluations choices list."""
+    return build_evaluations_dropdown_choices(
+        api_client.list_evaluations(limit=EVALUATIONS_FETCH_LIMIT, fields=EVALUATION_FIELDS)
+    )
+
+
+def build_evaluations_dropdown_choices(result):
+    """Build evaluation results dropdown choices from a projected /evaluations response."""
     try:
-        result = api_client.list_evaluations(limit=50)
-        evaluations = result.get("evaluations", [])
-        
-        if not evaluations:
-            return []
-        
-        choices = []
-        for eval_data in evaluations:
-            eval_id = eval_data.get("evaluation_id", "")
-            status = eval_data.get("status", "unknown")
-            folder = eval_data.get("folder_path", "").split("/")[-1]
-            display = f"{eval_id[:20]}... ({status}, {folder})"
-            choices.append((display, eval_id))
-        
-        return choices
+        return evaluation_choices(result.get("rows", [])[:EVALUATIONS_DROPDOWN_LIMIT])
     except Exception as e:
         print(f"Error loading evaluations: {e}")
         return []
 
 def load_evaluations_dropdown():
     """Load evaluations for dropdown (for dropdown update)."""
+    api_client.invalidate()
     choices = get_evaluations_dropdown_choices()
     return gr.update(choices=choices, value=None)
 
@@ -290,11 +299,51 @@ def load_evaluation_results(eval_id):
 
 def load_evaluations_comparison():
     """Load all evaluations for comparison."""
-    result = api_client.list_evaluations(limit=50)
-    evaluations = result.get("evaluations", [])
+    api_client.invalidate()
+    result = api_client.list_evaluations(limit=EVALUATIONS_FETCH_LIMIT)
+    evaluations = result.get("evaluations", [])[:EVALUATIONS_DROPDOWN_LIMIT]
     return format_evaluations_comparison_table(evaluations)
 
 
+# ===== PAGE LOAD =====
+
+async def load_all_dropdowns():
+    """Populate every dropdown on page load from a single /ui/bootstrap round trip."""
+    boot = await async_api_client.bootstrap(
+        session_fields=SESSION_FIELDS,
+        evaluation_fields=EVALUATION_FIELDS
+    )
+    
+    if "error" in boot:
+        # Older backends without /ui/bootstrap: fetch the sections concurrently instead
+        sessions, assets, evaluations = await asyncio.gather(
+            async_api_client.list_sessions(fields=SESSION_FIELDS),
+            async_api_client.list_assets(),
+            async_api_client.list_evaluations(limit=EVALUATIONS_FETCH_LIMIT, fields=EVALUATION_FIELDS)
+        )
+        evaluations_recent = evaluations
+    else:
+        sessions = boot.get("sessions", {})
+        assets = boot.get("assets", {})
+        evaluations = boot.get("evaluations_full", {})
+        evaluations_recent = boot.get("evaluations_recent", {})
+    
+    session_choices = build_sessions_choices(sessions)
+    folders = build_assets_folders(assets)
+    
+    return (
+        gr.update(
+            choices=session_choices,
+            value=None,
+            info="Select a session to view its history" if session_choices else "No sessions available. Start a new chat below."
+        ),
+        gr.update(choices=folders, value=None),
+        gr.update(choices=folders, value=None),
+        gr.update(choices=build_evaluations_for_reuse_choices(evaluations), value=None),
+        gr.update(choices=build_evaluations_dropdown_choices(evaluations_recent), value=None)
+    )
+
+
 # ===== BUILD GRADIO INTERFACE =====
 
 with gr.Blocks(title=" Document RAG System", theme=gr.themes.Soft()) as demo:
@@ -308,14 +357,13 @@ with gr.Blocks(title=" Document RAG System", theme=gr.themes.Soft()) as demo:
             
             with gr.Row():
                 with gr.Column(scale=1):
-                    initial_choices = get_sessions_choices()
                     session_dropdown = gr.Dropdown(
                         label="Select Session",
-                        choices=initial_choices,
+                        choices=[],
                         value=None,
                         interactive=True,
                         allow_custom_value=False,
-                        info="Select a session to view its history" if initial_choices else "No sessions available. Start a new chat below."
+                        info="Select a session to view its history"
                     )
                     refresh_sessions_btn = gr.Button("🔄 Refresh Sessions", size="sm")
                 
@@ -366,7 +414,9 @@ with gr.Blocks(title=" Document RAG System", theme=gr.themes.Soft()) as demo:
             send_btn.click(
                 fn=send_message,
                 inputs=[message_input, current_session_id],
-                outputs=[response_output, current_session_id]
+                outputs=[response_output, current_session_id],
+                queue=True,
+                concurrency_limit=HEAVY_HANDLER_CONCURRENCY
             ).then(
                 fn=lambda: "",
                 inputs=[],
@@ -430,7 +480,8 @@ with gr.Blocks(title=" Document RAG System", theme=gr.themes.Soft()) as demo:
             retrieve_btn.click(
                 fn=test_retrieval,
                 inputs=[retrieval_query, retrieval_top_k, retrieval_query_enhancer, retrieval_reranking, retrieval_pipeline],
-                outputs=[retrieval_results]
+                outputs=[retrieval_results],
+                concurrency_limit=HEAVY_HANDLER_CONCURRENCY
             )
         
         # ===== TAB 3: INGESTION =====
@@ -443,7 +494,7 @@ with gr.Blocks(title=" Document RAG System", theme=gr.themes.Soft()) as demo:
                     
                     ingestion_folder = gr.Dropdown(
                         label="Select Folder",
-                        choices=load_assets_folders(),
+                        choices=["assets/"],
                         interactive=True
                     )
                     
@@ -490,7 +541,7 @@ with gr.Blocks(title=" Document RAG System", theme=gr.themes.Soft()) as demo:
                     
                     with gr.Row():
                         check_status_btn = gr.Button("🔄 Check Status")
-                        auto_refresh_checkbox = gr.Checkbox(label="Auto-refresh (3s)", value=False)
+                        auto_refresh_checkbox = gr.Checkbox(label="Live updates", value=False)
             
             gr.Markdown("### Active Jobs")
             jobs_list_output = gr.Dataframe(
@@ -506,10 +557,15 @@ with gr.Blocks(title=" Document RAG System", theme=gr.themes.Soft()) as demo:
                 outputs=[ingestion_folder]
             )
             
-            start_ingestion_btn.click(
+            start_stream = start_ingestion_btn.click(
                 fn=start_ingestion,
                 inputs=[ingestion_folder, ingest_pdf, ingest_json, ingestion_pipeline],
-                outputs=[ingestion_start_output, ingestion_job_id]
+                outputs=[ingestion_start_output, ingestion_job_id],
+                concurrency_limit=HEAVY_HANDLER_CONCURRENCY
+            ).then(
+                fn=stream_ingestion_updates,
+                inputs=[auto_refresh_checkbox, ingestion_job_id],
+                outputs=[ingestion_status_output, ingestion_progress]
             )
             
             check_status_btn.click(
@@ -524,11 +580,15 @@ with gr.Blocks(title=" Document RAG System", theme=gr.themes.Soft()) as demo:
                 outputs=[jobs_list_output]
             )
             
-            # Auto-refresh functionality
-            def auto_refresh_status(auto_refresh, job_id):
-                if auto_refresh and job_id:
-                    return check_ingestion_status(job_id)
-                return None, None
+            # Live updates: the server pushes a frame only when progress changes. The stream starts
+            # one step after the toggle, so the cancel listener below only stops streams already running
+            live_stream = auto_refresh_checkbox.change(fn=None).then(
+                fn=stream_ingestion_updates,
+                inputs=[auto_refresh_checkbox, ingestion_job_id],
+                outputs=[ingestion_status_output, ingestion_progress]
+            )
+            # Every toggle stops the previous stream: unchecking ends it, re-checking replaces it
+            auto_refresh_checkbox.change(fn=None, cancels=[start_stream, live_stream])
         
         # ===== TAB 4: EVALUATION =====
         with gr.Tab("📊 Evaluation"):
@@ -540,7 +600,7 @@ with gr.Blocks(title=" Document RAG System", theme=gr.themes.Soft()) as demo:
                     
                     eval_folder = gr.Dropdown(
                         label="Select Folder",
-                        choices=load_evaluation_folders(),
+                        choices=["assets/"],
                         interactive=True
                     )
                     
@@ -574,7 +634,7 @@ with gr.Blocks(title=" Document RAG System", theme=gr.themes.Soft()) as demo:
                     
                     eval_reuse_dropdown = gr.Dropdown(
                         label="Reuse Questions From",
-                        choices=get_evaluations_for_reuse_choices(),
+                        choices=[("None (generate new questions)", None)],
                         interactive=True,
                         value=None
                     )
@@ -594,7 +654,7 @@ with gr.Blocks(title=" Document RAG System", theme=gr.themes.Soft()) as demo:
                     
                     eval_results_dropdown = gr.Dropdown(
                         label="Select Evaluation",
-                        choices=get_evaluations_dropdown_choices(),
+                        choices=[],
                         interactive=True,
                         value=None
                     )
@@ -666,11 +726,26 @@ with gr.Blocks(title=" Document RAG System", theme=gr.themes.Soft()) as demo:
                 inputs=[],
                 outputs=[eval_comparison_table]
             )
+    
+    # Populate all dropdowns in one concurrent round instead of serial calls at build time
+    demo.load(
+        fn=load_all_dropdowns,
+        inputs=[],
+        outputs=[session_dropdown, ingestion_folder, eval_folder, eval_reuse_dropdown, eval_results_dropdown]
+    )
+
+# Let several users' handlers run at once instead of serializing on the queue;
+# max_size bounds the backlog so bursts get rejected early rather than piling up
+demo.queue(default_concurrency_limit=8, max_size=64, api_open=False)
 
 if __name__ == "__main__":
-    demo.launch(
-        server_name="0.0.0.0",
-        server_port=7860,
-        share=False
-    )
+    try:
+        demo.launch(
+            server_name="0.0.0.0",
+            server_port=7860,
+            share=False,
+            max_threads=QUEUE_WORKER_THREADS
+        )
+    finally:
+        api_client.close()
 
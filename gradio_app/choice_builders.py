@@ -0,0 +1,50 @@
+"""Dropdown choice builders over projected list rows.
+
+Kept free of Gradio and dynamic typing so the module can be compiled with mypyc
+(`mypyc choice_builders.py`) for large lists; it runs unchanged as plain Python.
+"""
+from typing import Any, List, Optional, Sequence, Tuple
+
+
+def _basename(path: Optional[str]) -> str:
+    return (path or "").rsplit("/", 1)[-1]
+
+
+def session_choices(rows: Sequence[Sequence[Any]]) -> List[Tuple[str, str]]:
+    """Rows of (session_id, first_message, message_count) -> (display, session_id)."""
+    choices: List[Tuple[str, str]] = []
+    for row in rows:
+        session_id: str = row[0] or ""
+        first_message: str = row[1] or ""
+        msg_count: int = row[2] or 0
+        # Use first message as display if available, otherwise use session ID
+        if first_message:
+            display = "{}... ({} msgs)".format(first_message, msg_count)
+        else:
+            display = "Session {}... ({} msgs)".format(session_id[:8], msg_count)
+        choices.append((display, session_id))
+    return choices
+
+
+def evaluation_reuse_choices(rows: Sequence[Sequence[Any]]) -> List[Tuple[str, str]]:
+    """Completed rows of (evaluation_id, status, folder_path, num_documents) -> (display, evaluation_id)."""
+    choices: List[Tuple[str, str]] = []
+    for row in rows:
+        if row[1] != "completed":
+            continue
+        eval_id: str = row[0] or ""
+        num_docs: int = row[3] or 0
+        display = "{}... ({}, {} docs)".format(eval_id[:20], _basename(row[2]), num_docs)
+        choices.append((display, eval_id))
+    return choices
+
+
+def evaluation_choices(rows: Sequence[Sequence[Any]]) -> List[Tuple[str, str]]:
+    """Rows of (evaluation_id, status, folder_path, ...) -> (display, evaluation_id)."""
+    choices: List[Tuple[str, str]] = []
+    for row in rows:
+        eval_id: str = row[0] or ""
+        status: str = row[1] or "unknown"
+        display = "{}... ({}, {})".format(eval_id[:20], status, _basename(row[2]))
+        choices.append((display, eval_id))
+    return choices
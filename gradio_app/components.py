@@ -1,20 +1,39 @@
 """Reusable UI components and formatters for Gradio interface."""
+import functools
 import pandas as pd
 from typing import Dict, Any, List
 
 
+STATUS_COLORS = {
+    "completed": "🟢",
+    "running": "🟡",
+    "processing": "🟡",
+    "pending": "⚪",
+    "failed": "🔴",
+    "started": "🟡"
+}
+
+# Badges for known statuses are built once at import
+_STATUS_BADGES = {status: f"{icon} {status.upper()}" for status, icon in STATUS_COLORS.items()}
+STARTED_BADGE = _STATUS_BADGES["started"]
+
+
+@functools.lru_cache(maxsize=64)
+def _compute_badge(status: str) -> str:
+    """Badge for a status outside STATUS_COLORS."""
+    return f"{STATUS_COLORS.get(status.lower(), '⚫')} {status.upper()}"
+
+
 def format_status_badge(status: str) -> str:
     """Format status as a colored badge."""
-    status_colors = {
-        "completed": "🟢",
-        "running": "🟡",
-        "processing": "🟡",
-        "pending": "⚪",
-        "failed": "🔴",
-        "started": "🟡"
-    }
-    icon = status_colors.get(status.lower(), "⚫")
-    return f"{icon} {status.upper()}"
+    return _STATUS_BADGES.get(status) or _compute_badge(status)
+
+
+_ROLE_TEMPLATES = {
+    "USER": "👤 **USER** ({ts}):\n{c}\n",
+    "ASSISTANT": "🤖 **ASSISTANT** ({ts}):\n{c}\n"
+}
+_DEFAULT_ROLE_TEMPLATE = "**{role}** ({ts}):\n{c}\n"
 
 
 def format_chat_history(session_data: Dict[str, Any]) -> str:
@@ -28,23 +47,19 @@ def format_chat_history(session_data: Dict[str, Any]) -> str:
         return "No messages in this session."
     
     formatted = []
+    append = formatted.append
+    template_for = _ROLE_TEMPLATES.get
     for msg in messages:
-        role = msg.get("role", "unknown").upper()
-        content = msg.get("content", "")
-        timestamp = msg.get("timestamp", "")
-        
-        if role == "USER":
-            formatted.append(f"👤 **USER** ({timestamp}):\n{content}\n")
-        elif role == "ASSISTANT":
-            formatted.append(f"🤖 **ASSISTANT** ({timestamp}):\n{content}\n")
-        else:
-            formatted.append(f"**{role}** ({timestamp}):\n{content}\n")
+        msg_get = msg.get
+        role = msg_get("role", "unknown").upper()
+        template = template_for(role, _DEFAULT_ROLE_TEMPLATE)
+        append(template.format(role=role, ts=msg_get("timestamp", ""), c=msg_get("content", "")))
     
     return "\n".join(formatted)
 
 
-def format_retrieved_documents(results: Dict[str, Any]) -> str:
-    """Format retrieved documents for display."""
+def format_retrieved_documents(results: Dict[str, Any], max_items: int = 50) -> str:
+    """Format retrieved documents for display, rendering at most max_items results."""
     if "error" in results:
         return f"Error: {results['error']}"
     
@@ -57,10 +72,13 @@ def format_retrieved_documents(results: Dict[str, Any]) -> str:
     
     formatted = [f"**Query:** {query}\n**Total Retrieved:** {total}\n"]
     
-    for i, doc in enumerate(documents, 1):
-        text = doc.get("text", "")[:300]  # Truncate to 300 chars
-        source = doc.get("source", "Unknown")
-        score = doc.get("score")
+    for i, doc in enumerate(documents[:max_items], 1):
+        get = doc.get
+        text = get("text", "")
+        if len(text) > 300:
+            text = text[:300]  # Truncate to 300 chars
+        source = get("source", "Unknown")
+        score = get("score")
         
         formatted.append(f"\n---\n**Result {i}:**")
         formatted.append(f"**Source:** {source}")
@@ -68,6 +86,9 @@ def format_retrieved_documents(results: Dict[str, Any]) -> str:
             formatted.append(f"**Score:** {score:.4f}")
         formatted.append(f"**Text:** {text}...")
     
+    if len(documents) > max_items:
+        formatted.append(f"\n---\n… and {len(documents) - max_items} more")
+    
     return "\n".join(formatted)
 
 
@@ -76,15 +97,17 @@ def format_ingestion_status(status_data: Dict[str, Any]) -> str:
     if "error" in status_data:
         return f"Error: {status_data['error']}"
     
-    job_id = status_data.get("job_id", "Unknown")
-    status = status_data.get("status", "unknown")
-    progress = status_data.get("progress_percentage", 0)
-    total = status_data.get("total_documents", 0)
-    processed = status_data.get("processed_documents", 0)
-    successful = status_data.get("successful_documents", 0)
-    failed = status_data.get("failed_documents", 0)
-    current_file = status_data.get("current_file", "")
-    time_remaining = status_data.get("estimated_time_remaining_seconds")
+    get = status_data.get
+    
+    job_id = get("job_id", "Unknown")
+    status = get("status", "unknown")
+    progress = get("progress_percentage", 0)
+    total = get("total_documents", 0)
+    processed = get("processed_documents", 0)
+    successful = get("successful_documents", 0)
+    failed = get("failed_documents", 0)
+    current_file = get("current_file", "")
+    time_remaining = get("estimated_time_remaining_seconds")
     
     lines = [
         f"**Job ID:** {job_id}",
@@ -106,27 +129,58 @@ def format_ingestion_status(status_data: Dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
+# Placeholder tables are built once; callers get a cheap copy so Gradio can't mutate the originals
+_EMPTY_JOBS_DF = pd.DataFrame({"Message": ["No active jobs"]})
+_EMPTY_EVALUATIONS_DF = pd.DataFrame({"Message": ["No evaluations found"]})
+
+
 def format_jobs_list(jobs_data: Dict[str, Any]) -> pd.DataFrame:
     """Format active jobs list as DataFrame."""
     if "error" in jobs_data:
-        return pd.DataFrame([{"Error": jobs_data["error"]}])
+        return pd.DataFrame({"Error": [jobs_data["error"]]})
     
     jobs = jobs_data.get("active_jobs", [])
     
     if not jobs:
-        return pd.DataFrame([{"Message": "No active jobs"}])
-    
-    # Convert to DataFrame
-    df_data = []
+        return _EMPTY_JOBS_DF.copy()
+    
+    # Build column lists so the DataFrame skips row-wise dict inference
+    cols = {"Job ID": [], "Status": [], "Progress": [], "Updated": []}
+    job_id_append = cols["Job ID"].append
+    status_append = cols["Status"].append
+    progress_append = cols["Progress"].append
+    updated_append = cols["Updated"].append
     for job in jobs:
-        df_data.append({
-            "Job ID": job.get("job_id", "")[:20] + "...",  # Truncate
-            "Status": format_status_badge(job.get("status", "unknown")),
-            "Progress": f"{job.get('progress_percentage', 0):.1f}%",
-            "Updated": job.get("updated_at", "")
-        })
+        get = job.get
+        job_id_append(get("job_id", "")[:20] + "...")  # Truncate
+        status_append(format_status_badge(get("status", "unknown")))
+        progress_append(f"{get('progress_percentage', 0):.1f}%")
+        updated_append(get("updated_at", ""))
     
-    return pd.DataFrame(df_data)
+    return pd.DataFrame(cols)
+
+
+# Fixed sections of the evaluation report, each rendered with a single str.format call
+_render_eval_header = (
+    "# Evaluation Results\n"
+    "\n**Evaluation ID:** {eid}\n"
+    "**Status:** {badge}\n"
+    "**Folder:** {folder}\n"
+    "**Documents Processed:** {n}"
+).format
+_render_eval_config = (
+    "\n## Configuration\n"
+    "- Top-K: {top_k}\n"
+    "- Query Enhancer: {qe}\n"
+    "- Reranking: {rr}"
+).format
+_render_eval_metrics = (
+    "\n## Metrics\n"
+    "- **Hit Rate:** {hit_rate:.4f}\n"
+    "- **MRR (Mean Reciprocal Rank):** {mrr:.4f}\n"
+    "- **Average Score:** {avg:.4f}\n"
+    "- **Total Questions:** {total}"
+).format
 
 
 def format_evaluation_results(eval_data: Dict[str, Any]) -> str:
@@ -134,38 +188,38 @@ def format_evaluation_results(eval_data: Dict[str, Any]) -> str:
     if "error" in eval_data:
         return f"Error: {eval_data['error']}"
     
-    eval_id = eval_data.get("evaluation_id", "Unknown")
-    status = eval_data.get("status", "unknown")
-    folder = eval_data.get("folder_path", "")
-    num_docs = eval_data.get("num_documents_processed", 0)
+    get = eval_data.get
     
-    lines = [
-        f"# Evaluation Results",
-        f"\n**Evaluation ID:** {eval_id}",
-        f"**Status:** {format_status_badge(status)}",
-        f"**Folder:** {folder}",
-        f"**Documents Processed:** {num_docs}"
-    ]
+    eval_id = get("evaluation_id", "Unknown")
+    status = get("status", "unknown")
+    folder = get("folder_path", "")
+    num_docs = get("num_documents_processed", 0)
+    
+    lines = [_render_eval_header(eid=eval_id, badge=format_status_badge(status), folder=folder, n=num_docs)]
     
     # Retrieval parameters
-    params = eval_data.get("retrieve_params", {})
+    params = get("retrieve_params", {})
     if params:
-        lines.append("\n## Configuration")
-        lines.append(f"- Top-K: {params.get('top_k', 'N/A')}")
-        lines.append(f"- Query Enhancer: {params.get('use_query_enhancer', False)}")
-        lines.append(f"- Reranking: {params.get('use_reranking', False)}")
+        p_get = params.get
+        lines.append(_render_eval_config(
+            top_k=p_get("top_k", "N/A"),
+            qe=p_get("use_query_enhancer", False),
+            rr=p_get("use_reranking", False)
+        ))
     
     # Results summary
-    results = eval_data.get("results_summary")
+    results = get("results_summary")
     if results:
-        lines.append("\n## Metrics")
-        lines.append(f"- **Hit Rate:** {results.get('hit_rate', 0):.4f}")
-        lines.append(f"- **MRR (Mean Reciprocal Rank):** {results.get('mrr', 0):.4f}")
-        lines.append(f"- **Average Score:** {results.get('average_score', 0):.4f}")
-        lines.append(f"- **Total Questions:** {results.get('total_questions', 0)}")
+        r_get = results.get
+        lines.append(_render_eval_metrics(
+            hit_rate=r_get("hit_rate", 0),
+            mrr=r_get("mrr", 0),
+            avg=r_get("average_score", 0),
+            total=r_get("total_questions", 0)
+        ))
     
     # Related evaluations
-    related = eval_data.get("related_evaluation_ids", [])
+    related = get("related_evaluation_ids", [])
     if related:
         lines.append(f"\n## Related Evaluations")
         lines.append(f"This evaluation shares questions with {len(related)} other evaluation(s):")
@@ -173,7 +227,7 @@ def format_evaluation_results(eval_data: Dict[str, Any]) -> str:
             lines.append(f"- {rel_id}")
     
     # Error message
-    error = eval_data.get("error_message")
+    error = get("error_message")
     if error:
         lines.append(f"\n**Error:** {error}")
     
@@ -183,25 +237,45 @@ def format_evaluation_results(eval_data: Dict[str, Any]) -> str:
 def format_evaluations_comparison_table(evaluations: List[Dict[str, Any]]) -> pd.DataFrame:
     """Format multiple evaluations as comparison table."""
     if not evaluations:
-        return pd.DataFrame([{"Message": "No evaluations found"}])
+        return _EMPTY_EVALUATIONS_DF.copy()
     
-    df_data = []
+    # Build column lists so the DataFrame skips row-wise dict inference
+    cols = {
+        "ID": [], "Status": [], "Top-K": [], "Query Enh.": [],
+        "Reranking": [], "Hit Rate": [], "MRR": [], "Docs": []
+    }
+    id_append = cols["ID"].append
+    status_append = cols["Status"].append
+    top_k_append = cols["Top-K"].append
+    query_enh_append = cols["Query Enh."].append
+    reranking_append = cols["Reranking"].append
+    hit_rate_append = cols["Hit Rate"].append
+    mrr_append = cols["MRR"].append
+    docs_append = cols["Docs"].append
     for eval_data in evaluations:
-        results = eval_data.get("results_summary", {})
-        params = eval_data.get("retrieve_params", {})
+        get = eval_data.get
+        results = get("results_summary", {})
+        params = get("retrieve_params", {})
         
-        df_data.append({
-            "ID": eval_data.get("evaluation_id", "")[:15] + "...",
-            "Status": format_status_badge(eval_data.get("status", "unknown")),
-            "Top-K": params.get("top_k", "N/A"),
-            "Query Enh.": "✓" if params.get("use_query_enhancer") else "✗",
-            "Reranking": "✓" if params.get("use_reranking") else "✗",
-            "Hit Rate": f"{results.get('hit_rate', 0):.4f}" if results else "N/A",
-            "MRR": f"{results.get('mrr', 0):.4f}" if results else "N/A",
-            "Docs": eval_data.get("num_documents_processed", 0)
-        })
-    
-    return pd.DataFrame(df_data)
+        id_append(get("evaluation_id", "")[:15] + "...")
+        status_append(format_status_badge(get("status", "unknown")))
+        top_k_append(params.get("top_k", "N/A"))
+        query_enh_append("✓" if params.get("use_query_enhancer") else "✗")
+        reranking_append("✓" if params.get("use_reranking") else "✗")
+        hit_rate_append(f"{results.get('hit_rate', 0):.4f}" if results else "N/A")
+        mrr_append(f"{results.get('mrr', 0):.4f}" if results else "N/A")
+        docs_append(get("num_documents_processed", 0))
+    
+    return pd.DataFrame(cols)
+
+
+def _format_size(size_bytes: int) -> str:
+    """Human-readable file size; integer KB below 1 MB, so the common case skips float formatting."""
+    if size_bytes < 1048576:
+        return f"{size_bytes >> 10} KB"
+    if size_bytes < 1073741824:
+        return f"{size_bytes / 1048576:.1f} MB"
+    return f"{size_bytes / 1073741824:.1f} GB"
 
 
 def format_assets_tree(assets_data: Dict[str, Any]) -> str:
@@ -209,9 +283,11 @@ def format_assets_tree(assets_data: Dict[str, Any]) -> str:
     if "error" in assets_data:
         return f"Error: {assets_data['error']}"
     
-    current_path = assets_data.get("current_path", ".")
-    folders = assets_data.get("folders", [])
-    files = assets_data.get("files", [])
+    get = assets_data.get
+    
+    current_path = get("current_path", ".")
+    folders = get("folders", [])
+    files = get("files", [])
     
     lines = [f"**Current Path:** assets/{current_path}\n"]
     
@@ -226,9 +302,7 @@ def format_assets_tree(assets_data: Dict[str, Any]) -> str:
         lines.append(f"\n**Files:** (showing first {len(files)})")
         for file in files[:20]:  # Limit display
             name = file.get("name", "")
-            size = file.get("size_bytes", 0)
-            size_kb = size / 1024
-            lines.append(f"📄 {name} ({size_kb:.1f} KB)")
+            lines.append(f"📄 {name} ({_format_size(file.get('size_bytes', 0))})")
     
     return "\n".join(lines)
 
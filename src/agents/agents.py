@@ -1,3 +1,5 @@
+import functools
+
 from .chat_agent.agent import ChatAgent
 
 # Registry of all available agents
@@ -5,8 +7,9 @@ AVAILABLE_AGENTS = {
 	"chat_agent": ChatAgent,
 }
 
+@functools.lru_cache(maxsize=None)
 def get_agent(agent_name: str):
-	"""Get an agent instance by name."""
+	"""Get an agent instance by name. Instances are built once and shared."""
 	if agent_name not in AVAILABLE_AGENTS:
 		raise ValueError(f"Unknown agent: {agent_name}. Available: {list(AVAILABLE_AGENTS.keys())}")
 	return AVAILABLE_AGENTS[agent_name]()
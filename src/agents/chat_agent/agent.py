@@ -1,13 +1,22 @@
 from typing import Optional
 
 from crewai import Agent  # type: ignore
+from langchain_openai import ChatOpenAI  # type: ignore
 
 from src.config import OPENAI_API_KEY
+from src.agents.http_clients import SHARED_OPENAI_ASYNC_HTTP_CLIENT, SHARED_OPENAI_HTTP_CLIENT
 
 
 class ChatAgent:
 	def __init__(self):
-		self.agent = Agent(
+		# The LLM (and its pooled httpx clients) is the expensive part and is safe to share;
+		# CrewAI Agents hold per-run state, so build_agent() makes a fresh one per crew run
+		self.llm = self._create_crewai_llm()
+		self.agent = self.build_agent()
+
+	def build_agent(self) -> Agent:
+		"""Build a new CrewAI Agent on the shared LLM."""
+		return Agent(
 			role="Legal Research Assistant",
 			goal="Answer user questions accurately using retrieved documents with proper citations",
 			backstory="""You are a legal research assistant specializing in European Union legislation and regulations. 
@@ -18,16 +27,17 @@ When answering questions:
 4. List all cited sources at the end with their document paths
 5. If the context doesn't contain relevant information, say so clearly
 6. Be concise but thorough in your explanations""",
-			llm=self._create_crewai_llm(),
+			llm=self.llm,
 			verbose=True,
 		)
 
 	def _create_crewai_llm(self):
-		from langchain_openai import ChatOpenAI  # type: ignore
 		return ChatOpenAI(
 			model="gpt-4o-mini",
 			temperature=0.7,
 			openai_api_key=OPENAI_API_KEY,
+			http_client=SHARED_OPENAI_HTTP_CLIENT,
+			http_async_client=SHARED_OPENAI_ASYNC_HTTP_CLIENT,
 		)
 
 	def answer(self, question: str, context: Optional[str] = None) -> str:
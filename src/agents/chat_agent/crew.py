@@ -1,79 +1,111 @@
+import functools
+import logging
 from typing import Optional
 from crewai import Crew  # type: ignore
 
-from .agent import ChatAgent
+from src.agents.agents import get_agent
 from .tasks import create_chat_task
-from src.agents.retrieval_agent.agent import RetrievalAgent
+from src.agents.retrieval_agent.agent import get_retrieval_agent
 from src.embeddings.base import BaseEmbedding as CustomBaseEmbedding
-from src.data_preprocess_pipelines.data_preprocess import data_preprocess_semantic_pipeline
+from src.data_preprocess_pipelines.data_preprocess import get_data_preprocess_semantic_pipeline
+
+logger = logging.getLogger(__name__)
+
+# Fixed citation templates, bound once; %-formatting a tuple skips per-call f-string assembly
+_format_context_part = "[Source %d] from %s:\n%s".__mod__
+_format_source_line = "[%d] %s".__mod__
 
 
 class ChatCrew:
 	def __init__(self, embedding: Optional[CustomBaseEmbedding] = None, use_query_enhancer: bool = True, use_reranking: bool = True):
 		"""Initialize ChatCrew. Uses RetrievalAgent with query enhancement and reranking."""
-		self.agent = ChatAgent()
+		self.agent = get_agent("chat_agent")
 		
 		# Get embedding from pipeline if not provided
 		if embedding is None:
-			embedding = data_preprocess_semantic_pipeline.embedding
+			embedding = get_data_preprocess_semantic_pipeline().embedding
 		
 		# Initialize retrieval agent (agents initialized but not used unless requested in retrieve())
 		self.retrieval_agent = None
 		self.use_query_enhancer = use_query_enhancer
 		self.use_reranking = use_reranking
 		if embedding is not None:
-			self.retrieval_agent = RetrievalAgent(embedding=embedding)
-		
-		self.crew = Crew(
-			agents=[self.agent.agent],
-			tasks=[create_chat_task(self.agent.agent)],
-			verbose=True,
-		)
+			self.retrieval_agent = get_retrieval_agent(embedding)
 
 	def chat(self, question: str, context: Optional[str] = None) -> tuple[str, list[str]]:
 		"""Run chat crew with question. Uses RetrievalAgent with query enhancement and reranking.
 		
+		When context is given it is used as-is and the retrieval pipeline (including its
+		query-enhancement and reranking LLM calls) is skipped; sources are then empty.
+		
 		Returns:
 			tuple: (answer, sources) where sources is a list of document source identifiers
 		"""
 		# Use retrieval agent to get context for the question (with query enhancement and reranking)
+		# Skipped when the caller already supplied context, since it would take precedence anyway
 		retrieved_context = None
 		sources = []
-		if self.retrieval_agent is not None:
+		if not context and self.retrieval_agent is not None:
 			try:
-				# retrieve() returns a list of dicts with keys: text, source, score, metadata
+				# retrieve() returns a list of RetrievedDoc with text, source, score, metadata
 				retrieved_docs = self.retrieval_agent.retrieve(
 					question=question,
 					use_query_enhancer=self.use_query_enhancer,
 					use_reranking=self.use_reranking
 				)
 				if retrieved_docs:
-					# Extract text and sources from the retrieved documents
-					sources = [doc["source"] for doc in retrieved_docs]
-					
-					# Format context with numbered sources for proper citation
+					# Extract sources, numbered context parts and the source list in one pass
 					context_parts = []
+					source_lines = []
+					sources_append = sources.append
+					parts_append = context_parts.append
+					lines_append = source_lines.append
 					for i, doc in enumerate(retrieved_docs, 1):
-						context_parts.append(f"[Source {i}] from {doc['source']}:\n{doc['text']}")
+						source = doc.source
+						sources_append(source)
+						parts_append(_format_context_part((i, source, doc.text)))
+						lines_append(_format_source_line((i, source)))
 					
 					context_text = "\n\n---\n\n".join(context_parts)
 					
 					# Add source list at the end
-					sources_list = "\n".join([f"[{i}] {source}" for i, source in enumerate(sources, 1)])
+					sources_list = "\n".join(source_lines)
 					retrieved_context = f"Retrieved Documents:\n\n{context_text}\n\nAvailable Sources:\n{sources_list}"
-					print(f"Retrieved {len(sources)} sources for chat")
+					logger.debug("Retrieved %d sources for chat", len(sources))
 			except Exception as e:
 				# If retrieval fails, continue without context
-				print(f"Warning: Retrieval failed: {e}")
+				logger.warning("Retrieval failed: %s", e)
 		
 		# Use provided context or retrieved context
 		final_context = context or retrieved_context
 		context_instruction = f"Use this context if relevant: {final_context}" if final_context else "No additional context provided."
 		
 		inputs = {"question": question, "context_instruction": context_instruction}
-		result = self.crew.kickoff(inputs=inputs)
+		# kickoff writes per-run state (crew, executor, tools) onto the Agent, so concurrent requests
+		# sharing this ChatCrew each get their own Agent, Task and Crew; only the LLM is shared
+		agent = self.agent.build_agent()
+		crew = Crew(
+			agents=[agent],
+			tasks=[create_chat_task(agent)],
+			verbose=True,
+		)
+		result = crew.kickoff(inputs=inputs)
 		answer = str(result)
 		
 		# Return answer and sources separately (don't append to answer text)
 		return answer, sources
 
+
+@functools.lru_cache(maxsize=8)
+def _cached_chat_crew(use_query_enhancer: bool, use_reranking: bool, embedding: Optional[CustomBaseEmbedding]) -> ChatCrew:
+	return ChatCrew(embedding=embedding, use_query_enhancer=use_query_enhancer, use_reranking=use_reranking)
+
+
+def get_chat_crew(embedding: Optional[CustomBaseEmbedding] = None, use_query_enhancer: bool = True, use_reranking: bool = True) -> ChatCrew:
+	"""Return a shared ChatCrew for this configuration, building its agents and retrieval agent only once.
+
+	Embeddings are keyed by identity, so the default pipeline embedding maps to a single crew.
+	"""
+	if embedding is None:
+		embedding = get_data_preprocess_semantic_pipeline().embedding
+	return _cached_chat_crew(use_query_enhancer, use_reranking, embedding)
@@ -0,0 +1,13 @@
+import httpx
+
+
+_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+
+# One keep-alive pool shared by every ChatOpenAI instance, so agents that fire back to back
+# (query enhancer -> reranker -> chat) reuse open TLS connections instead of handshaking per client.
+# HTTP/2 multiplexes concurrent requests (e.g. parallel enhanced-query calls) over one connection.
+SHARED_OPENAI_HTTP_CLIENT = httpx.Client(http2=True, timeout=_TIMEOUT, limits=_LIMITS)
+
+# Async counterpart used by ChatOpenAI's ainvoke/astream paths, which ignore http_client
+SHARED_OPENAI_ASYNC_HTTP_CLIENT = httpx.AsyncClient(http2=True, timeout=_TIMEOUT, limits=_LIMITS)
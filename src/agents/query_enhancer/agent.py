@@ -1,38 +1,65 @@
-from typing import Optional, List
+import functools
+import logging
+from typing import Optional, List, Tuple
 from crewai import Agent, LLM  # type: ignore
 from langchain_openai import ChatOpenAI  # type: ignore
 
 from src.config import OPENAI_API_KEY
+from src.agents.http_clients import SHARED_OPENAI_ASYNC_HTTP_CLIENT, SHARED_OPENAI_HTTP_CLIENT
 from src.agents.schemas import EnhancedQueries
 
+logger = logging.getLogger(__name__)
+
 
 class QueryEnhancerAgent:
 	"""Agent that enhances queries for better legal document retrieval."""
 	
 	def __init__(self):
-		self.agent = Agent(
-			role="Legal Query Enhancement Specialist",
-			goal="Transform user queries into optimized search queries for European legislation and legal documents",
-			backstory="""You are a legal research specialist with deep expertise in European Union legislation, 
+		# Structured-output LLM is built once; its response schema is parsed here, not per query
+		self._structured_llm = LLM(model="gpt-4o-mini", api_key=OPENAI_API_KEY, response_format=EnhancedQueries)
+		# Per-instance memo of successful enhancements; failures raise and are not cached
+		self._enhance_cached = functools.lru_cache(maxsize=1024)(self._enhance_uncached)
+		# CrewAI Agent is not used by the structured LLM path; built on first access
+		self._agent = None
+	
+	@property
+	def agent(self) -> Agent:
+		if self._agent is None:
+			self._agent = Agent(
+				role="Legal Query Enhancement Specialist",
+				goal="Transform user queries into optimized search queries for European legislation and legal documents",
+				backstory="""You are a legal research specialist with deep expertise in European Union legislation, 
 			directives, regulations, and legal terminology. Your role is to enhance user queries to improve 
 			document retrieval from legal databases containing EU laws, regulations, and legal documents.""",
-			llm=self._create_llm(),
-			verbose=True,
-			allow_delegation=False,
-		)
+				llm=self._create_llm(),
+				verbose=True,
+				allow_delegation=False,
+			)
+		return self._agent
 	
 	def _create_llm(self):
 		return ChatOpenAI(
 			model="gpt-4o-mini",
 			temperature=0.3,  # Lower temperature for more consistent legal terminology
 			openai_api_key=OPENAI_API_KEY,
+			http_client=SHARED_OPENAI_HTTP_CLIENT,
+			http_async_client=SHARED_OPENAI_ASYNC_HTTP_CLIENT,
 		)
 	
 	def enhance_query(self, original_query: str) -> List[str]:
 		"""
 		Enhance a single query into multiple optimized variations for legal document retrieval.
-		Returns a list of enhanced queries.
+		Returns a list of enhanced queries. Repeated questions are served from an in-memory LRU.
 		"""
+		try:
+			return list(self._enhance_cached(original_query))
+		except Exception as e:
+			logger.warning("Query enhancement failed: %s", e)
+			# Fallback to original query
+			return [original_query]
+	
+	def _enhance_uncached(self, original_query: str) -> Tuple[str, ...]:
+		"""Run the enhancement LLM call; raises on failure so the result is not cached."""
 		enhancement_prompt = f"""You are a legal agent reading EURO legislation law docs. Enhance this query for better document retrieval.
 
 Original query: "{original_query}"
@@ -50,30 +77,17 @@ Guidelines:
 - Consider both English and common legal Latin terms
 - Think about related legal areas that might contain relevant information"""
 
-		try:
-			# Use CrewAI's structured LLM output
-			llm = LLM(model="gpt-4o-mini", api_key=OPENAI_API_KEY, response_format=EnhancedQueries)
-			
-			response = llm.call(enhancement_prompt)
-			
-			# Extract enhanced queries from structured response
-			if hasattr(response, 'enhanced_queries') and isinstance(response.enhanced_queries, list):
-				enhanced_queries = response.enhanced_queries
-				
-				# Always include the original query as fallback
-				if original_query not in enhanced_queries:
-					enhanced_queries.insert(0, original_query)  
-				print(f"Enhanced queries (after post-processing): {enhanced_queries}")
-
-				return enhanced_queries[:5]  # Limit to 5 queries max
-			else:
-				print(f"Invalid response format: {response}")
-				return [original_query]
-			
-		except Exception as e:
-			print(f"Query enhancement failed: {e}")
-			# Fallback to original query
-			return [original_query]
+		# Use CrewAI's structured LLM output
+		response = self._structured_llm.call(enhancement_prompt)
+		
+		# Extract enhanced queries from structured response
+		if hasattr(response, 'enhanced_queries') and isinstance(response.enhanced_queries, list):
+			# Always include the original query first as fallback; dict keys dedupe in insertion order
+			enhanced_queries = tuple(dict.fromkeys([original_query, *response.enhanced_queries]))[:5]  # Limit to 5 queries max
+			logger.debug("Enhanced queries (after post-processing): %s", enhanced_queries)
+			return enhanced_queries
+		
+		raise ValueError(f"Invalid response format: {response}")
 	
 	def enhance_query_simple(self, original_query: str) -> str:
 		"""
@@ -1,31 +1,69 @@
+import heapq
+import io
+import logging
 from typing import List, Tuple
 from crewai import Agent, LLM  # type: ignore
 from langchain_openai import ChatOpenAI  # type: ignore
 
 from src.config import OPENAI_API_KEY
+from src.agents.http_clients import SHARED_OPENAI_ASYNC_HTTP_CLIENT, SHARED_OPENAI_HTTP_CLIENT
 from src.agents.schemas import RerankedResults
 
+logger = logging.getLogger(__name__)
+
+# Upper bound on documents scored per rerank call (avoids very long prompts)
+MAX_DOCS_TO_RERANK = 20
+
+_RERANKING_INSTRUCTIONS = """You are analyzing legal documents for relevance to a user's question about European legislation.
+
+Your Task:
+1. Carefully evaluate how relevant each document is to answering the user's question
+2. Consider:
+   - Direct relevance to the question topic
+   - Presence of key legal concepts, terms, or frameworks mentioned in the query
+   - Quality and specificity of information provided
+   - Whether the document actually helps answer the question
+3. Assign each document a relevance score from 0.0 to 10.0, where:
+   - 10.0 = Perfectly relevant, directly answers the question
+   - 7.0-9.0 = Highly relevant, contains important information
+   - 4.0-6.0 = Moderately relevant, contains some useful context
+   - 1.0-3.0 = Minimally relevant, tangentially related
+   - 0.0 = Not relevant at all
+
+"""
+
 
 class RerankingAgent:
 	"""Agent that reranks retrieved documents based on relevance to the original query."""
 	
 	def __init__(self):
-		self.agent = Agent(
-			role="Legal Document Relevance Analyst",
-			goal="Accurately assess and rank the relevance of legal documents to user queries",
-			backstory="""You are an expert legal analyst specializing in European Union legislation. 
+		# Structured-output LLM is built once; its response schema is parsed here, not per call
+		self._structured_llm = LLM(model="gpt-4o-mini", api_key=OPENAI_API_KEY, response_format=RerankedResults)
+		# CrewAI Agent is not used by the structured LLM path; built on first access
+		self._agent = None
+	
+	@property
+	def agent(self) -> Agent:
+		if self._agent is None:
+			self._agent = Agent(
+				role="Legal Document Relevance Analyst",
+				goal="Accurately assess and rank the relevance of legal documents to user queries",
+				backstory="""You are an expert legal analyst specializing in European Union legislation. 
 			Your role is to evaluate how relevant each document is to a user's question, considering 
 			legal context, terminology, and the specific information needs of legal research.""",
-			llm=self._create_llm(),
-			verbose=True,
-			allow_delegation=False,
-		)
+				llm=self._create_llm(),
+				verbose=True,
+				allow_delegation=False,
+			)
+		return self._agent
 	
 	def _create_llm(self):
 		return ChatOpenAI(
 			model="gpt-4o-mini",
 			temperature=0.1,  # Very low temperature for consistent relevance scoring
 			openai_api_key=OPENAI_API_KEY,
+			http_client=SHARED_OPENAI_HTTP_CLIENT,
+			http_async_client=SHARED_OPENAI_ASYNC_HTTP_CLIENT,
 		)
 	
 	def rerank(
@@ -51,86 +89,81 @@ class RerankingAgent:
 			return "", []
 		
 		# Limit documents to rerank (avoid very long prompts)
-		max_docs_to_rerank = min(len(documents), 20)
+		max_docs_to_rerank = min(len(documents), MAX_DOCS_TO_RERANK)
 		documents_to_rank = documents[:max_docs_to_rerank]
 		sources_to_rank = sources[:max_docs_to_rerank] if sources else [f"doc_{i}" for i in range(max_docs_to_rerank)]
 		
+		top_indices = self.rerank_indices(query, documents_to_rank, top_k, max_docs=max_docs_to_rerank)
+		return "\n\n".join([documents_to_rank[i] for i in top_indices]), [sources_to_rank[i] for i in top_indices]
+	
+	def rerank_indices(
+		self,
+		query: str,
+		documents: List[str],
+		top_k: int = 10,
+		max_docs: int = MAX_DOCS_TO_RERANK
+	) -> List[int]:
+		"""
+		Rank documents by relevance to the query and return the indices of the top_k, best first.
+		
+		Only the first max_docs documents are scored. If the LLM call fails or returns an invalid
+		response, the original order is kept.
+		"""
+		if not documents:
+			return []
+		
+		documents_to_rank = documents[:max_docs]
+		fallback = list(range(min(top_k, len(documents_to_rank))))
+		
 		# Build the reranking prompt
 		reranking_prompt = self._build_reranking_prompt(query, documents_to_rank)
 		
 		try:
 			# Use CrewAI's structured LLM output
-			llm = LLM(model="gpt-4o-mini", api_key=OPENAI_API_KEY, response_format=RerankedResults)
-			
-			response = llm.call(reranking_prompt)
+			response = self._structured_llm.call(reranking_prompt)
 			
 			# Extract ranked documents from structured response
 			if hasattr(response, 'ranked_documents') and isinstance(response.ranked_documents, list):
 				ranked_docs = response.ranked_documents
 				
-				# Sort by relevance score (highest first)
-				ranked_docs.sort(key=lambda x: x.relevance_score, reverse=True)
-				
-				# Get top_k documents
-				top_ranked = ranked_docs[:top_k]
-				
-				# Build context and sources from reranked results
-				reranked_context_parts = []
-				reranked_sources = []
-				
-				for ranked_doc in top_ranked:
-					idx = ranked_doc.index
-					if 0 <= idx < len(documents_to_rank):
-						reranked_context_parts.append(documents_to_rank[idx])
-						reranked_sources.append(sources_to_rank[idx])
+				# Get top_k documents by relevance score (highest first) without sorting the tail
+				top_ranked = heapq.nlargest(top_k, ranked_docs, key=lambda x: x.relevance_score)
+				top_indices = [doc.index for doc in top_ranked if 0 <= doc.index < len(documents_to_rank)]
 				
-				print(f"Reranked {len(reranked_context_parts)} documents (from {len(documents_to_rank)} total)")
-				
-				return "\n\n".join(reranked_context_parts), reranked_sources
+				logger.debug("Reranked %d documents (from %d total)", len(top_indices), len(documents_to_rank))
+				return top_indices
 			else:
-				print(f"Invalid reranking response format: {response}")
+				logger.warning("Invalid reranking response format: %s", response)
 				# Fallback to original order
-				return "\n\n".join(documents_to_rank[:top_k]), sources_to_rank[:top_k]
+				return fallback
 			
 		except Exception as e:
-			print(f"Reranking failed: {e}")
+			logger.warning("Reranking failed: %s", e)
 			# Fallback to original order
-			return "\n\n".join(documents_to_rank[:top_k]), sources_to_rank[:top_k]
+			return fallback
 	
 	def _build_reranking_prompt(self, query: str, documents: List[str]) -> str:
-		"""Build the prompt for document reranking."""
+		"""Build the prompt for document reranking.
+		
+		Static instructions come first and the documents precede the question, so repeated
+		reranks over the same chunks share a long identical prefix that the provider's prompt
+		cache can reuse; only the trailing question differs.
+		"""
+		# Written into a single buffer so document previews are not joined and then copied again
+		buf = io.StringIO()
+		w = buf.write
+		w(_RERANKING_INSTRUCTIONS)
+		w("Documents to Rank:\n")
 		
 		# Format documents with indices
-		formatted_docs = []
 		for i, doc in enumerate(documents):
+			if i:
+				w("\n\n")
+			w(f"Document {i}:\n")
 			# Truncate very long documents for the prompt
-			doc_preview = doc[:500] + "..." if len(doc) > 500 else doc
-			formatted_docs.append(f"Document {i}:\n{doc_preview}")
+			w(doc[:500] + "..." if len(doc) > 500 else doc)
 		
-		docs_text = "\n\n".join(formatted_docs)
+		w(f'\n\nUser\'s Question: "{query}"\n\n')
+		w(f"Return a relevance score for each document based on the document index (0 to {len(documents)-1}).")
 		
-		prompt = f"""You are analyzing legal documents for relevance to a user's question about European legislation.
-
-User's Question: "{query}"
-
-Documents to Rank:
-{docs_text}
-
-Your Task:
-1. Carefully evaluate how relevant each document is to answering the user's question
-2. Consider:
-   - Direct relevance to the question topic
-   - Presence of key legal concepts, terms, or frameworks mentioned in the query
-   - Quality and specificity of information provided
-   - Whether the document actually helps answer the question
-3. Assign each document a relevance score from 0.0 to 10.0, where:
-   - 10.0 = Perfectly relevant, directly answers the question
-   - 7.0-9.0 = Highly relevant, contains important information
-   - 4.0-6.0 = Moderately relevant, contains some useful context
-   - 1.0-3.0 = Minimally relevant, tangentially related
-   - 0.0 = Not relevant at all
-
-Return a relevance score for each document based on the document index (0 to {len(documents)-1})."""
-
-		return prompt
-
+		return buf.getvalue()
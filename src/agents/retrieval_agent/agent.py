@@ -1,11 +1,31 @@
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 from crewai import Agent  # type: ignore
 from langchain_openai import ChatOpenAI  # type: ignore
 
 from src.config import OPENAI_API_KEY
+from src.agents.http_clients import SHARED_OPENAI_ASYNC_HTTP_CLIENT, SHARED_OPENAI_HTTP_CLIENT
 from src.retrieval.simple_qdrant_retriever import SimpleQdrantRetriever
+from src.retrieval.schemas import RetrievedDoc
 from src.agents.query_enhancer.agent import QueryEnhancerAgent
 from src.agents.reranking_agent.agent import RerankingAgent
 from src.embeddings.base import BaseEmbedding as CustomBaseEmbedding
+from src.embeddings.schemas import EmbeddingInput
+from .cache import retrieval_cache
+
+logger = logging.getLogger(__name__)
+
+# Shared pool for fanning out enhanced-query retrievals; sized for a few concurrent requests x 3 queries
+_RETRIEVAL_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="retrieval")
+
+# Chunks whose stored embeddings are at least this cosine-similar are treated as duplicates
+DEDUP_SIMILARITY_THRESHOLD = 0.95
+# Reciprocal Rank Fusion constant (standard value from the RRF paper)
+RRF_K = 60
 
 
 class RetrievalAgent:
@@ -16,20 +36,31 @@ class RetrievalAgent:
 		# Always initialize agents (they're lightweight)
 		self.query_enhancer = QueryEnhancerAgent()
 		self.reranker = RerankingAgent()
-		self.agent = Agent(
-			role="Legal Research Assistant",
-			goal="Answer user questions accurately by retrieving relevant information from European legal documents and providing citations",
-			backstory="You are a legal research assistant specializing in European Union legislation, directives, and regulations. You retrieve relevant legal documents and always cite your sources.",
-			llm=self._create_llm(),
-			verbose=True,
-			allow_delegation=False,
-		)
+		# Built once and shared with RetrievalCrew for answer generation
+		self.llm = self._create_llm()
+		# CrewAI Agent is only needed by RetrievalCrew; built on first access
+		self._agent = None
+
+	@property
+	def agent(self) -> Agent:
+		if self._agent is None:
+			self._agent = Agent(
+				role="Legal Research Assistant",
+				goal="Answer user questions accurately by retrieving relevant information from European legal documents and providing citations",
+				backstory="You are a legal research assistant specializing in European Union legislation, directives, and regulations. You retrieve relevant legal documents and always cite your sources.",
+				llm=self.llm,
+				verbose=True,
+				allow_delegation=False,
+			)
+		return self._agent
 
 	def _create_llm(self):
 		return ChatOpenAI(
 			model="gpt-4o-mini",
 			temperature=0.7,
 			openai_api_key=OPENAI_API_KEY,
+			http_client=SHARED_OPENAI_HTTP_CLIENT,
+			http_async_client=SHARED_OPENAI_ASYNC_HTTP_CLIENT,
 		)
 
 	def retrieve(
@@ -38,7 +69,7 @@ class RetrievalAgent:
 		use_query_enhancer: bool = False,
 		use_reranking: bool = False,
 		top_k: int = 10
-	) -> list[dict]:
+	) -> list[RetrievedDoc]:
 		"""
 		Retrieve relevant chunks for a question with optional query enhancement and reranking.
 		
@@ -49,14 +80,65 @@ class RetrievalAgent:
 			top_k: Number of documents to return (default: 10)
 		
 		Returns:
-			List of dicts with keys: text, source, score, metadata
+			List of RetrievedDoc with text, source, score, metadata
 			Note: Scores are only available when both use_query_enhancer and use_reranking are False
 		"""
 		# If no LLM features, just use direct retrieval with scores
 		if not use_query_enhancer and not use_reranking:
 			return self.retriever.retrieve(query=question, top_k=top_k)
 		
-		# Otherwise, use LLM features (query enhancement and/or reranking)
+		# LLM-assisted retrieval is cached: exact question first, then a near-duplicate question
+		cache_options = (self.embedding.embedding_name, use_query_enhancer, use_reranking, top_k)
+		cached = retrieval_cache.get(question, cache_options)
+		if cached is not None:
+			logger.debug("Retrieval cache hit (exact)")
+			return cached
+		
+		question_vector = None
+		try:
+			question_vector = self.embedding.embed(EmbeddingInput(documents=[question])).embeddings[0]
+			cached = retrieval_cache.get_similar(question_vector, cache_options)
+			if cached is not None:
+				logger.debug("Retrieval cache hit (semantic)")
+				return cached
+		except Exception as e:
+			logger.warning("Semantic cache lookup failed: %s", e)
+		
+		results = self._retrieve_with_llm(question, use_query_enhancer, use_reranking, top_k, question_vector)
+		if results and question_vector is not None:
+			retrieval_cache.put(question, question_vector, cache_options, results)
+		return results
+
+	async def aretrieve(
+		self,
+		question: str,
+		use_query_enhancer: bool = False,
+		use_reranking: bool = False,
+		top_k: int = 10
+	) -> list[RetrievedDoc]:
+		"""Async retrieve() for event-loop callers.
+		
+		Direct retrieval awaits the async Qdrant client; the LLM-assisted path (blocking CrewAI
+		calls) runs retrieve() in a worker thread so the event loop is never blocked.
+		"""
+		if not use_query_enhancer and not use_reranking:
+			return await self.retriever.aretrieve(query=question, top_k=top_k)
+		return await asyncio.to_thread(self.retrieve, question, use_query_enhancer, use_reranking, top_k)
+
+	def _retrieve_with_llm(
+		self,
+		question: str,
+		use_query_enhancer: bool,
+		use_reranking: bool,
+		top_k: int,
+		question_vector=None
+	) -> list[RetrievedDoc]:
+		"""Query enhancement and/or reranking path of retrieve().
+		
+		question_vector is the question embedding already computed for the cache lookup; it is
+		reused so the original question is not embedded twice.
+		"""
+		# Use LLM features (query enhancement and/or reranking)
 		# Determine queries to search
 		queries_to_search = [question]  # Always include original
 		if use_query_enhancer:
@@ -64,81 +146,167 @@ class RetrievalAgent:
 				enhanced_queries = self.query_enhancer.enhance_query(question)
 				# Use enhanced queries, but limit total queries to avoid too many API calls
 				queries_to_search = enhanced_queries[:3]  # Use top 3 enhanced queries
-				print(f"Enhanced queries: {queries_to_search}")
+				logger.debug("Enhanced queries: %s", queries_to_search)
 			except Exception as e:
-				print(f"Query enhancement failed, using original query: {e}")
+				logger.warning("Query enhancement failed, using original query: %s", e)
 				queries_to_search = [question]
 		
-		# Collect results from all queries using SimpleQdrantRetriever
-		all_documents = []
-		seen_texts = set()  # To avoid duplicate content
-		
 		# If using reranking, retrieve more documents per query
 		per_query_multiplier = 2 if use_reranking else 1
 		
-		for search_query in queries_to_search:
-			try:
-				# Retrieve more documents if we're going to rerank
-				per_query_k = max(4, (top_k // len(queries_to_search)) * per_query_multiplier)
-				detailed_results = self.retriever.retrieve(query=search_query, top_k=per_query_k)
-				print(f"Retrieved {per_query_k} docs for query: {search_query[:50]}...")
-				
-				# Deduplicate by text content
-				for doc in detailed_results:
-					if doc["text"] not in seen_texts:
-						seen_texts.add(doc["text"])
-						all_documents.append(doc)
-					
-			except Exception as e:
-				print(f"Retrieval failed for query '{search_query}': {e}")
-				continue
+		# Retrieve more documents if we're going to rerank
+		per_query_k = max(4, (top_k // len(queries_to_search)) * per_query_multiplier)
+		
+		per_query_results = self._retrieve_many(queries_to_search, per_query_k, question, question_vector)
+		
+		# Merge results from all queries with rank fusion, dropping near-duplicate chunks
+		all_documents = _fuse_documents(per_query_results)
 		
 		if not all_documents:
 			return []
 		
 		# Apply reranking if enabled
 		if use_reranking:
-			print(f"Reranking {len(all_documents)} documents using original query: {question}")
+			logger.debug("Reranking %d documents using original query: %s", len(all_documents), question)
 			try:
-				# Extract texts and sources for reranking
-				texts = [doc["text"] for doc in all_documents]
-				sources = [doc["source"] for doc in all_documents]
-				
-				final_context, reranked_sources = self.reranker.rerank(
+				top_indices = self.reranker.rerank_indices(
 					query=question,  # Use original question, not enhanced queries
-					documents=texts,
-					sources=sources,
+					documents=[doc.text for doc in all_documents],
 					top_k=top_k
 				)
-				print(f"Reranked to top {top_k} documents")
+				logger.debug("Reranked to top %d documents", top_k)
 				
-				# Convert reranked results back to detailed format (without scores)
-				reranked_texts = [doc.strip() for doc in final_context.split('\n\n') if doc.strip()]
-				results = []
-				for i, text in enumerate(reranked_texts[:top_k]):
-					results.append({
-						"text": text,
-						"source": reranked_sources[i] if i < len(reranked_sources) else "unknown",
-						"score": None,  # Scores not available after reranking
-						"metadata": {"enhanced": use_query_enhancer, "reranked": True}
-					})
+				# Reranked documents keep their text and source; scores are not available after reranking
+				results = [all_documents[i] for i in top_indices]
+				for doc in results:
+					doc.score = None
+					doc.vector = None
+					doc.metadata = {"enhanced": use_query_enhancer, "reranked": True}
 				return results
 				
 			except Exception as e:
-				print(f"Reranking failed, falling back to original order: {e}")
+				logger.warning("Reranking failed, falling back to original order: %s", e)
 				# Fallback to non-reranked results
 		
 		# If reranking is disabled or failed, use original ordering
 		results = all_documents[:top_k]
 		# Update metadata to indicate processing
 		for doc in results:
-			doc["score"] = None  # Clear scores when using query enhancement
-			doc["metadata"] = {"enhanced": use_query_enhancer, "reranked": False}
+			doc.score = None  # Clear scores when using query enhancement
+			doc.metadata = {"enhanced": use_query_enhancer, "reranked": False}
+			doc.vector = None  # Only needed for dedup; keeps cached results small
 		
-		print(f"Final results (no reranking): {len(results)} documents")
+		logger.debug("Final results (no reranking): %d documents", len(results))
 		return results
 
+	def _retrieve_many(self, queries: list[str], per_query_k: int, question: str, question_vector=None) -> list[list[RetrievedDoc]]:
+		"""Retrieve for several queries, results in query order so deduplication stays deterministic.
+		
+		All queries are embedded in one call (reusing the question embedding when available), then
+		searched with one Qdrant query_batch_points round trip; if that fails, the vectors are
+		searched concurrently one by one.
+		"""
+		try:
+			vectors = self._embed_queries(queries, question, question_vector)
+		except Exception as e:
+			logger.warning("Query embedding failed: %s", e)
+			return [[] for _ in queries]
+		
+		try:
+			per_query_results = self.retriever.search_batch(vectors, top_k=per_query_k)
+			logger.debug("Retrieved %d docs for each of %d queries in one batch", per_query_k, len(queries))
+			return per_query_results
+		except Exception as e:
+			logger.warning("Batched retrieval failed, retrieving queries individually: %s", e)
+		
+		# Each search is a Qdrant RPC, so run them concurrently
+		return list(_RETRIEVAL_EXECUTOR.map(
+			lambda search_query, vector: self._search_one(search_query, vector, per_query_k),
+			queries,
+			vectors
+		))
+
+	def _embed_queries(self, queries: list[str], question: str, question_vector=None) -> list:
+		"""Embed queries in one call, filling in the precomputed question embedding where it applies."""
+		if question_vector is None:
+			return self.retriever.embed_queries(queries)
+		
+		to_embed = [q for q in queries if q != question]
+		embedded = iter(self.retriever.embed_queries(to_embed) if to_embed else [])
+		return [question_vector if q == question else next(embedded) for q in queries]
+
+	def _search_one(self, search_query: str, vector, per_query_k: int) -> list[RetrievedDoc]:
+		"""Search a single query embedding; failures are logged and yield no documents."""
+		try:
+			detailed_results = self.retriever.search_vector(vector, top_k=per_query_k)
+			logger.debug("Retrieved %d docs for query: %.50s...", per_query_k, search_query)
+			return detailed_results
+		except Exception as e:
+			logger.warning("Retrieval failed for query '%s': %s", search_query, e)
+			return []
+
 	def is_available(self) -> bool:
 		"""Check if the retriever is available."""
 		return self.retriever.is_available()
 
+
+def _fuse_documents(per_query_results: list[list[RetrievedDoc]]) -> list[RetrievedDoc]:
+	"""Merge per-query results with Reciprocal Rank Fusion, collapsing duplicate chunks.
+	
+	A chunk scores sum(1 / (RRF_K + rank)) over the queries that returned it, so chunks found by
+	several enhanced queries rank above ones only a single query returned. Ties keep first-seen order.
+	"""
+	documents = []
+	contributions = []
+	documents_append = documents.append
+	contributions_append = contributions.append
+	for detailed_results in per_query_results:
+		for rank, doc in enumerate(detailed_results, RRF_K + 1):
+			documents_append(doc)
+			contributions_append(1.0 / rank)
+	
+	if not documents:
+		return []
+	
+	# Keyed by first occurrence, so dict order is first-seen order and the stable sort keeps it on ties
+	scores = {}
+	scores_get = scores.get
+	for owner, contribution in zip(_duplicate_owners(documents), contributions):
+		scores[owner] = scores_get(owner, 0.0) + contribution
+	
+	return [documents[i] for i in sorted(scores, key=scores.__getitem__, reverse=True)]
+
+
+def _duplicate_owners(documents: list[RetrievedDoc]) -> list[int]:
+	"""For each document, the index of the first document it duplicates (itself if unique).
+	
+	Uses one similarity matrix over the stored chunk embeddings so whitespace-level variants of
+	the same chunk are caught; falls back to exact text matching when vectors are missing.
+	"""
+	vectors = [doc.vector for doc in documents]
+	if any(v is None for v in vectors):
+		first_seen = {}
+		return [first_seen.setdefault(doc.text, i) for i, doc in enumerate(documents)]
+	
+	E = np.asarray(vectors, dtype=np.float32)
+	E /= np.maximum(np.linalg.norm(E, axis=1, keepdims=True), 1e-12)
+	sim = E @ E.T
+	
+	kept = []
+	owners = []
+	for i in range(len(documents)):
+		if kept:
+			row = sim[i, kept]
+			j = int(row.argmax())
+			if row[j] >= DEDUP_SIMILARITY_THRESHOLD:
+				owners.append(kept[j])
+				continue
+		kept.append(i)
+		owners.append(i)
+	return owners
+
+
+@functools.lru_cache(maxsize=8)
+def get_retrieval_agent(embedding: CustomBaseEmbedding) -> RetrievalAgent:
+	"""Return a shared RetrievalAgent for this embedding, so its retriever and LLM agents are built once."""
+	return RetrievalAgent(embedding=embedding)
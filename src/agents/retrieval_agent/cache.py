@@ -0,0 +1,125 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Hashable, List, Optional, Sequence
+
+import numpy as np
+
+from src.retrieval.schemas import RetrievedDoc
+
+RETRIEVAL_CACHE_SIZE = 512
+RETRIEVAL_CACHE_TTL_SECONDS = 600
+SEMANTIC_CACHE_THRESHOLD = 0.97
+
+
+def _copy_docs(results: Sequence[RetrievedDoc]) -> List[RetrievedDoc]:
+	"""Copy each doc (and its metadata dict) so callers mutating results cannot alter cached entries."""
+	return [replace(doc, metadata=dict(doc.metadata or {})) for doc in results]
+
+
+class _SemanticTier:
+	"""Ring buffer of normalized question embeddings with their cached results."""
+
+	def __init__(self, capacity: int, dim: int):
+		self.capacity = capacity
+		self.vectors = np.zeros((capacity, dim), dtype=np.float32)
+		self.entries: List[Optional[tuple]] = [None] * capacity
+		self.size = 0
+		self.next = 0
+
+	def lookup(self, vector: np.ndarray, threshold: float, now: float, ttl: float) -> Optional[List[RetrievedDoc]]:
+		if not self.size:
+			return None
+		# One GEMV over all cached questions; vectors are unit length, so this is cosine similarity
+		scores = self.vectors[:self.size] @ vector
+		idx = int(scores.argmax())
+		if scores[idx] < threshold:
+			return None
+		created_at, results = self.entries[idx]
+		if now - created_at > ttl:
+			return None
+		return results
+
+	def add(self, vector: np.ndarray, results: List[RetrievedDoc], now: float):
+		idx = self.next
+		self.vectors[idx] = vector
+		self.entries[idx] = (now, results)
+		self.next = (idx + 1) % self.capacity
+		self.size = min(self.size + 1, self.capacity)
+
+
+class RetrievalCache:
+	"""Two-tier cache for LLM-assisted retrieval: exact question match, then nearest cached question.
+
+	Entries are scoped by an options key (embedding model, enhancer/reranker flags, top_k) and
+	expire after ttl_seconds so newly ingested documents show up.
+	"""
+
+	def __init__(
+		self,
+		max_entries: int = RETRIEVAL_CACHE_SIZE,
+		ttl_seconds: float = RETRIEVAL_CACHE_TTL_SECONDS,
+		similarity_threshold: float = SEMANTIC_CACHE_THRESHOLD
+	):
+		self.max_entries = max_entries
+		self.ttl_seconds = ttl_seconds
+		self.similarity_threshold = similarity_threshold
+		self._exact: "OrderedDict[tuple, tuple]" = OrderedDict()
+		self._semantic: dict = {}
+		self._lock = threading.Lock()
+
+	def get(self, question: str, options: Hashable) -> Optional[List[RetrievedDoc]]:
+		"""Return cached results for exactly this question, if fresh."""
+		key = (options, question)
+		with self._lock:
+			entry = self._exact.get(key)
+			if entry is None:
+				return None
+			created_at, results = entry
+			if time.monotonic() - created_at > self.ttl_seconds:
+				del self._exact[key]
+				return None
+			self._exact.move_to_end(key)
+		return _copy_docs(results)
+
+	def get_similar(self, vector: Sequence[float], options: Hashable) -> Optional[List[RetrievedDoc]]:
+		"""Return cached results for a near-duplicate question (cosine >= threshold), if fresh."""
+		query = self._normalize(vector)
+		with self._lock:
+			tier = self._semantic.get(options)
+			if tier is None:
+				return None
+			results = tier.lookup(query, self.similarity_threshold, time.monotonic(), self.ttl_seconds)
+		return _copy_docs(results) if results is not None else None
+
+	def put(self, question: str, vector: Sequence[float], options: Hashable, results: List[RetrievedDoc]):
+		"""Store results under both the exact question and its embedding."""
+		query = self._normalize(vector)
+		now = time.monotonic()
+		results = _copy_docs(results)
+		with self._lock:
+			self._exact[(options, question)] = (now, results)
+			self._exact.move_to_end((options, question))
+			while len(self._exact) > self.max_entries:
+				self._exact.popitem(last=False)
+			
+			tier = self._semantic.get(options)
+			if tier is None:
+				tier = self._semantic[options] = _SemanticTier(self.max_entries, query.shape[0])
+			tier.add(query, results, now)
+
+	def clear(self):
+		with self._lock:
+			self._exact.clear()
+			self._semantic.clear()
+
+	@staticmethod
+	def _normalize(vector: Sequence[float]) -> np.ndarray:
+		arr = np.asarray(vector, dtype=np.float32)
+		norm = np.linalg.norm(arr)
+		return arr / norm if norm else arr
+
+
+# Shared across RetrievalAgent instances (the /retrieve route builds one per request)
+retrieval_cache = RetrievalCache()
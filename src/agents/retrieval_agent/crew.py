@@ -1,16 +1,22 @@
 from crewai import Crew, Task  # type: ignore
-from langchain_openai import ChatOpenAI  # type: ignore
 
-from .agent import RetrievalAgent
-from src.config import OPENAI_API_KEY
+from .agent import get_retrieval_agent
 from src.embeddings.base import BaseEmbedding as CustomBaseEmbedding
 
+# Answer prompt template, parsed once at import
+_ANSWER_PROMPT = """Based on the following context, answer the question: {question}
+
+Context:
+{context}
+
+Provide a clear, accurate answer based on the context above. Do not make up information not found in the context.""".format
+
 
 class RetrievalCrew:
 	def __init__(self, embedding: CustomBaseEmbedding, use_query_enhancer: bool = True, use_reranking: bool = True):
 		self.use_query_enhancer = use_query_enhancer
 		self.use_reranking = use_reranking
-		self.retrieval_agent_obj = RetrievalAgent(embedding=embedding)
+		self.retrieval_agent_obj = get_retrieval_agent(embedding)
 		self.crew = Crew(
 			agents=[self.retrieval_agent_obj.agent],
 			tasks=[self._create_task()],
@@ -40,23 +46,18 @@ At the end, provide citations in the format: [Source: <filename>] for each sourc
 			return "No relevant documents found to answer the question."
 		
 		# Extract context and sources from detailed results
-		context_parts = [doc["text"] for doc in detailed_results]
-		sources = list(dict.fromkeys([doc["source"] for doc in detailed_results]))  # Deduplicate
+		context_parts = [doc.text for doc in detailed_results]
+		sources = list(dict.fromkeys([doc.source for doc in detailed_results]))  # Deduplicate
 		context_text = "\n\n".join(context_parts)
 		
 		# Format citations
 		citations = "\n\nCitations:\n" + "\n".join([f"[Source: {s}]" for s in sources]) if sources else ""
 		
 		# Get answer from agent
-		answer_prompt = f"""Based on the following context, answer the question: {question}
-
-Context:
-{context_text}
-
-Provide a clear, accurate answer based on the context above. Do not make up information not found in the context."""
+		answer_prompt = _ANSWER_PROMPT(question=question, context=context_text)
 		
-		# Use agent directly to get answer
-		llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7, openai_api_key=OPENAI_API_KEY)
+		# Reuse the retrieval agent's LLM (and its pooled HTTP client)
+		llm = self.retrieval_agent_obj.llm
 		response = llm.invoke(answer_prompt)
 		answer = response.content if hasattr(response, 'content') else str(response)
 		
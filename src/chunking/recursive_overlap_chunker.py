@@ -25,84 +25,118 @@ class RecursiveOverlapChunker(BaseChunker):
 
     def chunk(self, request: ChunkRequest) -> ChunkResponse:
         all_chunks: List[ChunkItem] = []
-        for item in request.items:
-            base_chunks = self._split_text(item.text)
-            overlapped_chunks = self._apply_overlap(base_chunks)
-            for ch in overlapped_chunks:
-                if not ch:
-                    continue
-                all_chunks.append(
-                    ChunkItem(source=item.source, len_characters=len(ch), text=ch)
-                )
-        return ChunkResponse(chunks=all_chunks)
+        append = all_chunks.append
+        from_text = ChunkItem.from_text
+        # Read each item's fields once, not once per produced chunk
+        for source, text in [(item.source, item.text) for item in request.items]:
+            for ch in self._apply_overlap(self._split_text(text)):
+                append(from_text(source, ch))
+        # Items are built internally, so the response skips re-validating them
+        return ChunkResponse.model_construct(chunks=all_chunks)
 
     def _split_text(self, text: str) -> List[str]:
+        # _split_fragment trims the entry text and only ever emits non-empty chunks
         chunks: List[str] = []
-        self._split_fragment(text.strip(), 0, chunks)
-        return [chunk for chunk in chunks if chunk]
+        self._split_fragment(text, 0, chunks)
+        return chunks
 
     def _split_fragment(self, fragment: str, level: int, chunks: List[str]) -> None:
-        fragment = fragment.strip()
-        if not fragment:
-            return
-        if len(fragment) <= self.chunk_size:
-            chunks.append(fragment)
-            return
-
-        if level >= len(self.separators):
-            for start in range(0, len(fragment), self.chunk_size):
-                chunk = fragment[start : start + self.chunk_size].strip()
-                if chunk:
-                    chunks.append(chunk)
-            return
-
-        separator = self.separators[level]
-        pieces = fragment.split(separator) if separator else list(fragment)
-        if len(pieces) == 1:
-            self._split_fragment(fragment, level + 1, chunks)
-            return
-
-        buffer = ""
-        for idx, piece in enumerate(pieces):
-            piece = piece.strip()
-            if not piece:
+        # Explicit worklist instead of recursion: sub-fragments are pushed in reverse so they are
+        # popped, and their chunks emitted, in the same depth-first order recursion would give
+        # Only the entry fragment is trimmed here; sub-fragments are trimmed when built (pieces are
+        # stripped, flushed buffers are stripped once) instead of again on every pop
+        chunk_size = self.chunk_size
+        separators = self.separators
+        stack = [(fragment.strip(), level)]
+        pop = stack.pop
+        while stack:
+            fragment, level = pop()
+            if not fragment:
+                continue
+            if len(fragment) <= chunk_size:
+                chunks.append(fragment)
+                continue
+
+            if level >= len(separators):
+                for start in range(0, len(fragment), chunk_size):
+                    chunk = fragment[start : start + chunk_size].strip()
+                    if chunk:
+                        chunks.append(chunk)
+                continue
+
+            separator = separators[level]
+            pieces = fragment.split(separator) if separator else list(fragment)
+            if len(pieces) == 1:
+                stack.append((fragment, level + 1))
                 continue
-            candidate = piece if not buffer else f"{buffer}{separator}{piece}"
-            if len(candidate) > self.chunk_size and buffer:
-                self._split_fragment(buffer, level + 1, chunks)
-                buffer = piece
-            elif len(candidate) > self.chunk_size:
-                self._split_fragment(piece, level + 1, chunks)
-                buffer = ""
-            else:
-                buffer = candidate
-
-            if buffer and idx < len(pieces) - 1 and separator:
-                buffer = f"{buffer}{separator}"
-
-        if buffer:
-            if buffer.endswith(separator):
-                buffer = buffer[: -len(separator)]
-            self._split_fragment(buffer, level + 1, chunks)
+
+            children: List[str] = []
+            # Buffer is kept as a list of parts plus a running length, so growing it never copies
+            # the accumulated text; it is joined only when handed to the next level
+            buf_parts: List[str] = []
+            buf_len = 0
+            sep_len = len(separator)
+            last_idx = len(pieces) - 1
+            for idx, piece in enumerate(pieces):
+                piece = piece.strip()
+                if not piece:
+                    continue
+                candidate_len = buf_len + sep_len + len(piece) if buf_len else len(piece)
+                if candidate_len > chunk_size and buf_len:
+                    # Flushed mid-loop, the buffer still ends with the separator added after its last piece
+                    children.append("".join(buf_parts).strip())
+                    buf_parts = [piece]
+                    buf_len = len(piece)
+                elif candidate_len > chunk_size:
+                    children.append(piece)
+                    buf_parts = []
+                    buf_len = 0
+                else:
+                    if buf_len:
+                        buf_parts.append(separator)
+                    buf_parts.append(piece)
+                    buf_len = candidate_len
+
+                if buf_len and idx < last_idx and separator:
+                    buf_parts.append(separator)
+                    buf_len += sep_len
+
+            if buf_len:
+                buffer = "".join(buf_parts)
+                if buffer.endswith(separator):
+                    buffer = buffer[: -len(separator)]
+                children.append(buffer)
+
+            next_level = level + 1
+            stack.extend((child, next_level) for child in reversed(children))
 
     def _apply_overlap(self, chunks: List[str]) -> List[str]:
         if self.chunk_overlap <= 0 or len(chunks) <= 1:
             return chunks
 
-        overlapped: List[str] = []
-        prev = ""
-        for chunk in chunks:
-            chunk = chunk.strip()
-            if not chunk:
-                continue
-            if not prev:
-                overlapped.append(chunk)
-            else:
-                tail = prev[-self.chunk_overlap :]
-                combined = f"{tail}{chunk}"
-                if len(combined) > self.chunk_size:
-                    combined = combined[-self.chunk_size :]
-                overlapped.append(combined)
-            prev = chunk
+        # Chunks from _split_text are already stripped and non-empty; only the previous
+        # chunk's tail is kept, sliced once, rather than the whole previous chunk
+        size = self.chunk_size
+        overlapped: List[str] = [chunks[0]]
+        append = overlapped.append
+        prev_tail = self._overlap_tail(chunks[0])
+        for chunk in chunks[1:]:
+            combined = f"{prev_tail} {chunk}" if prev_tail else chunk
+            if len(combined) > size:
+                combined = combined[-size:].lstrip()
+            append(combined)
+            prev_tail = self._overlap_tail(chunk)
         return overlapped
 
+    def _overlap_tail(self, chunk: str) -> str:
+        # Last chunk_overlap characters, advanced to the next word boundary so the overlap
+        # never starts mid-word; a tail with no whitespace is kept whole
+        tail = chunk[-self.chunk_overlap :]
+        if tail[0].isspace():
+            # Already cut on a boundary; dropping the first word here would lose a whole word
+            return tail.lstrip()
+        if len(tail) < len(chunk) and not chunk[-len(tail) - 1].isspace():
+            parts = tail.split(None, 1)
+            if len(parts) == 2:
+                return parts[1]
+        return tail
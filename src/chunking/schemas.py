@@ -6,6 +6,11 @@ class ChunkItem(BaseModel):
 	len_characters: int
 	text: str
 
+	@classmethod
+	def from_text(cls, source: str, text: str) -> "ChunkItem":
+		"""Build a chunk from trusted internal values, skipping pydantic validation (chunker hot paths)."""
+		return cls.model_construct(source=source, len_characters=len(text), text=text)
+
 class ChunkRequest(BaseModel):
 	items: List[ChunkItem]
 
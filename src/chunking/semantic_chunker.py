@@ -1,22 +1,52 @@
+import functools
+import hashlib
 import os
 import re
 from typing import List, Tuple
 
 
+import numpy as np
 import torch
-import torch.nn.functional as F
 import spacy
-from spacy.lang.en import English
 
 
 from .base import BaseChunker
 from .schemas import ChunkItem, ChunkRequest, ChunkResponse
 from src.propositioner.base import BasePropositioner
 from src.embeddings.base import BaseEmbedding
+from src.embeddings.cache import EmbeddingCache
 from src.embeddings.schemas import EmbeddingInput
+from src.config import EMBEDDING_CACHE_PATH
 
 # LangChain splitters
-from langchain_text_splitters import RecursiveCharacterTextSplitter, NLTKTextSplitter, SpacyTextSplitter  # type: ignore
+from langchain_text_splitters import RecursiveCharacterTextSplitter, SpacyTextSplitter  # type: ignore
+
+# Texts per embedding forward pass when embedding sentence groups from many documents at once
+EMBED_BATCH_SIZE = 64
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def _simhash(text: str) -> int:
+	"""64-bit SimHash over lowercased word 3-shingles; near-identical texts share a signature."""
+	tokens = _WORD_RE.findall(text.lower())
+	shingles = [" ".join(tokens[i:i + 3]) for i in range(len(tokens) - 2)] or [" ".join(tokens)]
+	digests = b"".join([hashlib.blake2b(sh.encode(), digest_size=8).digest() for sh in shingles])
+	bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(-1, 8), axis=1)
+	# Each bit is set when the majority of shingle hashes set it
+	return int.from_bytes(np.packbits(bits.sum(axis=0) * 2 > len(shingles)).tobytes(), "big")
+
+
+@functools.lru_cache(maxsize=1)
+def _get_sentence_splitter():
+	"""Load the spaCy sentence splitter once per process; every SemanticChunker shares it."""
+	# Only sentence boundaries are needed: drop the parser/tagger/NER and use the statistical senter
+	nlp = spacy.load('en_core_web_sm', exclude=['parser', 'tagger', 'ner', 'lemmatizer', 'attribute_ruler'])
+	if 'senter' in nlp.component_names:
+		nlp.enable_pipe('senter')
+	else:
+		nlp.add_pipe('sentencizer')
+	return nlp
 
 
 class SemanticChunker(BaseChunker):
@@ -44,45 +74,93 @@ class SemanticChunker(BaseChunker):
 		self.embeddings = embeddings
 		self.buffer_size = max(1, int(buffer_size))
 		self.sentence_split_regex = sentence_split_regex
+		self.sentence_split_pattern = re.compile(sentence_split_regex)
 		self.breakpoint_percentile = float(breakpoint_percentile)
-		self.sentence_split_nlp = spacy.load('en_core_web_sm')
+		# Re-ingested text reuses stored vectors instead of re-running the embedding model
+		self.embedding_cache = EmbeddingCache(EMBEDDING_CACHE_PATH) if EMBEDDING_CACHE_PATH else None
+		self.sentence_split_nlp = _get_sentence_splitter()
+		self.sentence_split_batch_size = 64
+		# Celery prefork workers are daemonic and cannot spawn spaCy worker processes, so default to 1
+		self.sentence_split_processes = 1
 
 	def chunk(self, request: ChunkRequest) -> ChunkResponse:
 		all_chunks: List[ChunkItem] = []
-		for item in request.items:
-			proposed = self._propositionize_item(item)
-			# Flatten propositions text for this item
-			proposition_text = " ".join([c.text for c in proposed])
-			sentences = self._langchain_split_to_sentences(proposition_text)
+		# Sources are read off the items once and carried as plain strings
+		sources = [item.source for item in request.items]
+		proposed_per_item = self._propositionize_items(request.items)
+		# Flatten propositions text per item, then sentence-split all items in one spaCy pipe
+		proposition_texts = [" ".join([c.text for c in proposed]) for proposed in proposed_per_item]
+		sentences_per_item = self._split_to_sentences_batch(proposition_texts)
+		# First pass: trivial items become chunks directly, the rest are grouped for embedding
+		pending = []
+		all_combined: List[str] = []
+		for source, proposition_text, sentences in zip(sources, proposition_texts, sentences_per_item):
 			if len(sentences) <= 1:
 				# trivial case
 				text = sentences[0] if sentences else proposition_text
-				all_chunks.append(ChunkItem(source=item.source, len_characters=len(text), text=text))
+				all_chunks.append(ChunkItem.from_text(source, text))
 				continue
 
-			grouped = self._combine_with_buffer(sentences, self.buffer_size)
-			embeddings_tensor = self._embed_texts([g["combined_sentence"] for g in grouped])
-			# attach for clarity
-			for i in range(len(grouped)):
-				grouped[i]["embedding"] = embeddings_tensor[i]
+			combined = self._combine_with_buffer(sentences, self.buffer_size)
+			pending.append((source, sentences, len(all_combined)))
+			all_combined.extend(combined)
 
-			distances = self._cosine_distances_adjacent(embeddings_tensor)
+		# Embed the grouped sentences of every item together, then slice back per item by offset
+		all_embeddings = self._embed_texts(all_combined) if all_combined else None
+		for source, sentences, offset in pending:
+			# One combined group per sentence, so the item's rows are the next len(sentences)
+			embeddings_tensor = all_embeddings[offset:offset + len(sentences)]
+
+			# One host transfer for all distances; threshold and breakpoints are computed on the array
+			distances = self._cosine_distances_adjacent(embeddings_tensor).cpu().numpy()
 			threshold = self._percentile_threshold(distances, self.breakpoint_percentile)
-			break_indices = [i for i, d in enumerate(distances) if d > threshold]
+			break_indices = np.flatnonzero(distances > threshold).tolist()
 
-			# Build chunks by breakpoints (operate over original sentences via grouped map)
-			chunks_for_doc = self._slice_by_breakpoints(sentences, grouped, break_indices)
+			# Build chunks by breakpoints (group i is centred on sentence i)
+			chunks_for_doc = self._slice_by_breakpoints(sentences, break_indices)
 			for ch in chunks_for_doc:
-				all_chunks.append(ChunkItem(source=item.source, len_characters=len(ch), text=ch))
+				all_chunks.append(ChunkItem.from_text(source, ch))
+
+		# Items are built internally, so the response skips re-validating them
+		return ChunkResponse.model_construct(chunks=all_chunks)
 
-		return ChunkResponse(chunks=all_chunks)
+	def _propositionize_items(self, items: List[ChunkItem]) -> List[List[ChunkItem]]:
+		# Runs the propositioner once over all items; it returns one proposition chunk per item, in order.
+		# The items are already ChunkItems, so the request wrapping them skips validation
+		resp = self.propositioner.propose(ChunkRequest.model_construct(items=list(items)))
+		if len(resp.chunks) == len(items):
+			return [[c] for c in resp.chunks]
+		# Propositioner did not keep item boundaries; fall back to one request per item
+		return [self._propositionize_item(item) for item in items]
 
 	def _propositionize_item(self, item: ChunkItem) -> List[ChunkItem]:
 		# Runs propositioner on a single-item request
-		req = ChunkRequest(items=[item])
+		req = ChunkRequest.model_construct(items=[item])
 		resp = self.propositioner.propose(req)
 		return resp.chunks
 
+	def _split_to_sentences_batch(self, texts: List[str]) -> List[List[str]]:
+		# Empty texts are skipped by the pipe and map back to no sentences
+		results: List[List[str]] = [[] for _ in texts]
+		indices = [i for i, t in enumerate(texts) if t]
+		if not indices:
+			return results
+		try:
+			docs = self.sentence_split_nlp.pipe(
+				[texts[i] for i in indices],
+				batch_size=self.sentence_split_batch_size,
+				n_process=self.sentence_split_processes,
+			)
+			for i, doc in zip(indices, docs):
+				# Slice the doc text directly rather than going through Span.__str__
+				doc_text = doc.text
+				results[i] = [doc_text[s.start_char:s.end_char] for s in doc.sents]
+		except Exception:
+			# Fall back to splitting documents one by one
+			for i in indices:
+				results[i] = self._langchain_split_to_sentences(texts[i])
+		return results
+
 	def _langchain_split_to_sentences(self, text: str) -> List[str]:
 		if not text:
 			return []
@@ -97,10 +175,12 @@ class SemanticChunker(BaseChunker):
 		if SpacyTextSplitter is not None:
 			try:
 				#text=text.replace("\n", " ")
-				sentences.extend([ str(s) for s  in self.sentence_split_nlp(text).sents])
+				sentences.extend([text[s.start_char:s.end_char] for s in self.sentence_split_nlp(text).sents])
+				return sentences
 			except Exception:
 				pass
-		# sentences.extend([s for s in re.split(self.sentence_split_regex, text) if s and s.strip()])
+		# Regex fallback when spaCy is unavailable or fails
+		sentences.extend([s for s in self.sentence_split_pattern.split(text) if s and s.strip()])
 		return sentences
 
 	def _split_paragraphs(self, text: str) -> List[str]:
@@ -114,56 +194,67 @@ class SemanticChunker(BaseChunker):
 		)
 		return splitter.split_text(text)
 
-	def _combine_with_buffer(self, sentences: List[str], buffer_size: int) -> List[dict]:
-		combined: List[dict] = []
-		for idx, s in enumerate(sentences):
+	def _combine_with_buffer(self, sentences: List[str], buffer_size: int) -> List[str]:
+		# Group i is sentence i joined with up to buffer_size neighbours on each side
+		combined: List[str] = []
+		n = len(sentences)
+		for idx in range(n):
 			start = max(0, idx - buffer_size)
-			end = min(len(sentences), idx + buffer_size + 1)
-			group = sentences[start:end]
-			combined.append({"sentence": s, "index": idx, "combined_sentence": " ".join(group)})
+			end = min(n, idx + buffer_size + 1)
+			combined.append(" ".join(sentences[start:end]))
 		return combined
 
 	def _embed_texts(self, texts: List[str]) -> torch.Tensor:
-		out = self.embeddings.embed(EmbeddingInput(documents=texts))
+		# Near-duplicate texts (repeated headers/footers, boilerplate) share a SimHash signature;
+		# only the first text per signature is embedded and its vector is reused for the rest
+		first_by_signature = {}
+		owners = [first_by_signature.setdefault(_simhash(t), i) for i, t in enumerate(texts)]
+		representatives = list(first_by_signature.values())
+		rep_vectors = dict(zip(representatives, self._embed_batched([texts[i] for i in representatives])))
 		# Convert to torch tensor (N, D)
-		return torch.tensor(out.embeddings, dtype=torch.float32)
-
-	def _cosine_distances_adjacent(self, embeddings: torch.Tensor) -> List[float]:
-		# Normalize
-		normed = F.normalize(embeddings, p=2, dim=1)
-		# Similarity between consecutive vectors
-		cos_sims: List[float] = []
-		for i in range(len(normed) - 1):
-			cos = float((normed[i] * normed[i + 1]).sum().item())
-			cos_sims.append(cos)
-		# Convert to distances
-		return [1.0 - s for s in cos_sims]
-
-	def _percentile_threshold(self, distances: List[float], percentile: float) -> float:
-		if not distances:
+		return torch.tensor([rep_vectors[o] for o in owners], dtype=torch.float32)
+
+	def _embed_batched(self, texts: List[str]) -> List[List[float]]:
+		# Embed in length-sorted batches so similar-length texts share padding, then restore input order
+		order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+		vectors: List[List[float]] = [None] * len(texts)  # type: ignore
+		for start in range(0, len(order), EMBED_BATCH_SIZE):
+			batch = order[start:start + EMBED_BATCH_SIZE]
+			batch_texts = [texts[i] for i in batch]
+			if self.embedding_cache is not None:
+				batch_vectors = self.embedding_cache.embed(self.embeddings, batch_texts)
+			else:
+				batch_vectors = self.embeddings.embed(EmbeddingInput(documents=batch_texts)).embeddings
+			for i, vector in zip(batch, batch_vectors):
+				vectors[i] = vector
+		return vectors
+
+	def _cosine_distances_adjacent(self, embeddings: torch.Tensor) -> torch.Tensor:
+		# Divide the raw pairwise dot products by the row norms instead of materialising a
+		# normalized (N, D) copy; stays in float32 since breakpoints hinge on small distance gaps
+		norms = torch.linalg.vector_norm(embeddings, dim=1).clamp_min(1e-12)
+		cos_sims = (embeddings[:-1] * embeddings[1:]).sum(dim=1) / (norms[:-1] * norms[1:])
+		# Convert to distances, shape (N - 1,)
+		return 1.0 - cos_sims
+
+	def _percentile_threshold(self, distances: np.ndarray, percentile: float) -> float:
+		if distances.size == 0:
 			return 1.0
-		dist_tensor = torch.tensor(distances, dtype=torch.float32)
-		q = torch.quantile(dist_tensor, min(max(percentile / 100.0, 0.0), 1.0))
-		return float(q.item())
+		# Linear interpolation, same as torch.quantile
+		return float(np.percentile(distances, min(max(percentile, 0.0), 100.0)))
 
-	def _slice_by_breakpoints(self, sentences: List[str], grouped: List[dict], break_indices: List[int]) -> List[str]:
+	def _slice_by_breakpoints(self, sentences: List[str], break_indices: List[int]) -> List[str]:
 		chunks: List[str] = []
-		# Map from grouped index to original sentence index
-		# We will slice based on breakpoints in grouped pairs (between i and i+1)
+		# Breakpoint i falls between groups i and i + 1; group i is centred on sentence i,
+		# so group positions are sentence positions
 		start_idx = 0
 		for idx in break_indices:
 			end_idx = idx + 1  # inclusive end in grouped space
-			# Map to sentences indices covered by groups [start_idx, end_idx]
-			left = grouped[start_idx]["index"]
-			right = grouped[end_idx]["index"]
-			segment = sentences[left:right + 1]
-			chunks.append(" ".join(segment))
+			chunks.append(" ".join(sentences[start_idx:end_idx + 1]))
 			start_idx = end_idx + 1
 		# Tail
-		if start_idx < len(grouped):
-			left = grouped[start_idx]["index"]
-			right = grouped[-1]["index"]
-			segment = sentences[left:right + 1]
+		if start_idx < len(sentences):
+			segment = sentences[start_idx:]
 			if segment:
 				chunks.append(" ".join(segment))
 		return chunks
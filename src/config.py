@@ -5,8 +5,15 @@ load_dotenv()
 
 # Existing configs
 EMBEDDING_WEIGHTS_DIR = os.getenv('EMBEDDING_WEIGHTS_DIR', 'embedding_weights')
+# Persistent content-hash embedding cache used during ingestion; set to empty to disable
+EMBEDDING_CACHE_PATH = os.getenv('EMBEDDING_CACHE_PATH', os.path.join(EMBEDDING_WEIGHTS_DIR, 'embedding_cache.sqlite3'))
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY', '')
 
+# Worker processes for parsing a folder of PDFs in-process (outside Celery)
+INGEST_WORKERS = int(os.getenv('INGEST_WORKERS', max(1, (os.cpu_count() or 2) - 1)))
+# Files per Celery ingestion subtask, processed together by the pipeline's run_batch
+INGEST_BATCH_SIZE = int(os.getenv('INGEST_BATCH_SIZE', 4))
+
 # Redis configuration
 REDIS_HOST = os.getenv('REDIS_HOST', 'localhost')
 REDIS_PORT = int(os.getenv('REDIS_PORT', 6379))
@@ -27,4 +34,5 @@ CHROMADB_DB_PATH = os.getenv('CHROMADB_DB_PATH', './legal_chromadb')
 # Qdrant configuration
 QDRANT_HOST = os.getenv('QDRANT_HOST', 'localhost')
 QDRANT_PORT = int(os.getenv('QDRANT_PORT', 6333))
+QDRANT_GRPC_PORT = int(os.getenv('QDRANT_GRPC_PORT', 6334))
 QDRANT_COLLECTION_NAME = os.getenv('QDRANT_COLLECTION_NAME', 'documents')
\ No newline at end of file
@@ -1,5 +1,14 @@
-from .data_preprocessrecursiveoverlap import data_preprocess_recursive_overlap_pipeline
 from .base import DataPreprocessBase
-from .data_preprocess import data_preprocess_semantic_pipeline
 
 __all__ = ["data_preprocess_recursive_overlap_pipeline", "DataPreprocessBase", "data_preprocess_semantic_pipeline"]
+
+
+def __getattr__(name: str):
+	# Pipelines load embedding/propositioner models, so they are imported and built on first access only
+	if name == "data_preprocess_recursive_overlap_pipeline":
+		from .data_preprocessrecursiveoverlap import get_data_preprocess_recursive_overlap_pipeline
+		return get_data_preprocess_recursive_overlap_pipeline()
+	if name == "data_preprocess_semantic_pipeline":
+		from .data_preprocess import get_data_preprocess_semantic_pipeline
+		return get_data_preprocess_semantic_pipeline()
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
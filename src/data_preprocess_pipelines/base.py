@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Sequence
+
+from src.ingestion.schemas import IngestedItem
 
 class DataPreprocessBase(ABC):	
 	@abstractmethod
@@ -7,3 +9,13 @@ class DataPreprocessBase(ABC):
 		"""Process a single document and return result"""
 		pass
 
+	def run_batch(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+		"""Process several documents and return one result per path, in order"""
+		return [self.run_single_doc(file_path) for file_path in file_paths]
+
+	@staticmethod
+	def _non_empty_items(items: Sequence[IngestedItem]) -> List[IngestedItem]:
+		"""Drop empty and whitespace-only items (blank pages) before chunking"""
+		# len_characters rules out empty text without touching it; isspace() stops at the first
+		# non-space character and, unlike strip(), never copies the text
+		return [item for item in items if item.len_characters and not item.text.isspace()]
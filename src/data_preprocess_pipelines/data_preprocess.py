@@ -1,12 +1,13 @@
+import functools
 import os
 import time
 import logging
 from abc import ABC, abstractmethod
-from typing import Callable, Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 
 from src.ingestion.pdf_ingestor import PDFIngestor
 from src.ingestion.pdf_docling_ingestor import PDFDoclingIngestor
-from src.ingestion.schemas import IngestedItem
+from src.ingestion.schemas import IngestedItem, IngestRequest
 from src.chunking.schemas import ChunkItem, ChunkRequest, ChunkResponse
 from src.chunking.semantic_chunker import SemanticChunker
 from src.propositioner.t5_propositioner import T5Propositioner
@@ -57,7 +58,7 @@ class DataPreprocessSemantic(DataPreprocessBase):
 		emb_name = config.get("embedding", "e5-small")
 		chunker_name = config.get("chunker", "semantic_chunking")
 
-		logger.info(f"📋 Configuration: ingestor={ingestor_name}, propositioner={prop_name}, embedding={emb_name}, chunker={chunker_name}")
+		logger.info("📋 Configuration: ingestor=%s, propositioner=%s, embedding=%s, chunker=%s", ingestor_name, prop_name, emb_name, chunker_name)
 
 		ingestor_cls = INGESTORS[ingestor_name]
 		prop_cls = PROPOSITIONERS[prop_name]
@@ -93,17 +94,19 @@ class DataPreprocessSemantic(DataPreprocessBase):
 
 	def run_single_doc(self, file_path: str) -> Dict[str, Any]:
 		"""Process a single document and return result"""
-		logger.info(f"📄 Starting run_single_doc() for: {os.path.basename(file_path)}")
-		logger.info(f"📍 Full path: {file_path}")
+		basename = os.path.basename(file_path)
+		logger.info("📄 Starting run_single_doc() for: %s", basename)
+		logger.info("📍 Full path: %s", file_path)
 		
 		try:
 			# Ingest the single document
-			logger.info(f"📖 Ingesting document: {os.path.basename(file_path)}")
-			resp = self.ingestor.ingest(type("Req", (), {"path_or_url": file_path, "media_type": "pdf"})())
-			logger.info(f"✅ Ingestion complete: {len(resp.items)} items extracted")
+			logger.info("📖 Ingesting document: %s", basename)
+			resp = self.ingestor.ingest(IngestRequest(path_or_url=file_path, media_type="pdf"))
+			logger.info("✅ Ingestion complete: %s items extracted", len(resp.items))
 			
-			if not resp.items or not any(item.text.strip() for item in resp.items):
-				logger.warning(f"⚠️ No content extracted from document: {os.path.basename(file_path)}")
+			items = self._non_empty_items(resp.items)
+			if not items:
+				logger.warning("⚠️ No content extracted from document: %s", basename)
 				return {
 					"success": False,
 					"error": "No content extracted from document",
@@ -111,69 +114,124 @@ class DataPreprocessSemantic(DataPreprocessBase):
 					"character_count": 0
 				}
 			
-			total_chars = sum(item.len_characters for item in resp.items)
-			logger.info(f"📊 Document stats: {total_chars} total characters across {len(resp.items)} items")
+			total_chars = sum(item.len_characters for item in items)
+			logger.info("📊 Document stats: %s total characters across %s items", total_chars, len(items))
 			
-			# Process chunks for this single document
-			logger.info(f"🔪 Starting semantic chunking for: {os.path.basename(file_path)}")
-			chunk_request = ChunkRequest(
-				items=[ChunkItem(source=i.source, len_characters=i.len_characters, text=i.text) for i in resp.items]
-			)
-			chunk_response: ChunkResponse = self.chunker.chunk(chunk_request)
-			logger.info(f"✅ Chunking complete: {len(chunk_response.chunks) if chunk_response.chunks else 0} chunks generated")
-			
-			# Build parent texts dict
-			logger.info("🏗️ Building parent texts dictionary...")
-			parent_texts: Dict[str, str] = {}
-			for item in resp.items:
-				source = item.source
-				if source not in parent_texts:
-					parent_texts[source] = item.text
-			logger.info(f"✅ Parent texts built for {len(parent_texts)} unique sources")
-			
-			# Build nodes and write to Qdrant
-			if chunk_response.chunks:
-				logger.info(f"🔨 Building nodes from {len(chunk_response.chunks)} chunks...")
-				leaf_nodes, parent_docs = NodeBuilder.build_nodes_from_chunks(
-					chunk_response.chunks, parent_texts
-				)
-				node_count = len(leaf_nodes)
-				logger.info(f"✅ Built {node_count} leaf nodes and {len(parent_docs)} parent documents")
-				
-				# Write to Qdrant (no retry needed - better concurrent write support)
-				logger.info(f"💾 Writing {node_count} nodes to Qdrant...")
-				try:
-					self.storage_setup.create_index_from_nodes(leaf_nodes)
-					logger.info(f"✅ Successfully wrote {node_count} nodes to Qdrant")
-				except Exception as e:
-					logger.error(f"❌ Failed to write to Qdrant: {e}")
-					raise
-			else:
-				logger.warning("⚠️ No chunks to process, no nodes built")
-				node_count = 0
+			# Chunk, build nodes and write to Qdrant
+			logger.info("🔪 Starting semantic chunking for: %s", basename)
+			counts = self._run_items(items)
 			
 			result = {
 				"success": True,
 				"file_path": file_path,
 				"character_count": total_chars,
-				"chunk_count": len(chunk_response.chunks) if chunk_response.chunks else 0,
-				"node_count": node_count
+				"chunk_count": sum(chunk_count for chunk_count, _ in counts.values()),
+				"node_count": sum(node_count for _, node_count in counts.values())
 			}
-			logger.info(f"✅ run_single_doc() completed successfully for: {os.path.basename(file_path)}")
-			logger.info(f"📊 Final stats: {result['character_count']} chars, {result['chunk_count']} chunks, {result['node_count']} nodes")
+			logger.info("✅ run_single_doc() completed successfully for: %s", basename)
+			logger.info("📊 Final stats: %s chars, %s chunks, %s nodes", result['character_count'], result['chunk_count'], result['node_count'])
 			return result
 			
 		except Exception as e:
-			logger.error(f"❌ Failed to process {os.path.basename(file_path)}: {str(e)}")
-			logger.error(f"❌ Exception type: {type(e).__name__}")
+			logger.error("❌ Failed to process %s: %s", basename, str(e))
+			logger.error("❌ Exception type: %s", type(e).__name__)
 			import traceback
-			logger.error(f"❌ Stack trace:\n{traceback.format_exc()}")
+			logger.error("❌ Stack trace:\n%s", traceback.format_exc())
 			return {
 				"success": False,
 				"error": str(e),
 				"file_path": file_path,
 				"character_count": 0
 			}
+
+	def run_batch(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+		"""Process several documents with one chunker call and one Qdrant write; returns one result per path"""
+		logger.info("📚 Starting run_batch() for %s documents", len(file_paths))
+		results: Dict[str, Dict[str, Any]] = {}
+		ingested: Dict[str, List[IngestedItem]] = {}
+
+		for file_path in file_paths:
+			try:
+				resp = self.ingestor.ingest(IngestRequest(path_or_url=file_path, media_type="pdf"))
+			except Exception as e:
+				logger.error("❌ Failed to ingest %s: %s", os.path.basename(file_path), str(e))
+				results[file_path] = {"success": False, "error": str(e), "file_path": file_path, "character_count": 0}
+				continue
+			items = self._non_empty_items(resp.items)
+			if not items:
+				logger.warning("⚠️ No content extracted from document: %s", os.path.basename(file_path))
+				results[file_path] = {
+					"success": False,
+					"error": "No content extracted from document",
+					"file_path": file_path,
+					"character_count": 0
+				}
+				continue
+			ingested[file_path] = items
+
+		if ingested:
+			try:
+				# One chunker call over every document, so the propositioner and embedder see full batches
+				all_items = [item for items in ingested.values() for item in items]
+				logger.info("🔪 Starting semantic chunking for %s documents (%s items)", len(ingested), len(all_items))
+				counts = self._run_items(all_items)
+				for file_path, items in ingested.items():
+					doc_counts = [counts.get(source, (0, 0)) for source in dict.fromkeys(item.source for item in items)]
+					results[file_path] = {
+						"success": True,
+						"file_path": file_path,
+						"character_count": sum(item.len_characters for item in items),
+						"chunk_count": sum(chunk_count for chunk_count, _ in doc_counts),
+						"node_count": sum(node_count for _, node_count in doc_counts)
+					}
+			except Exception as e:
+				logger.error("❌ Failed to process batch: %s", str(e))
+				import traceback
+				logger.error("❌ Stack trace:\n%s", traceback.format_exc())
+				for file_path in ingested:
+					results[file_path] = {"success": False, "error": str(e), "file_path": file_path, "character_count": 0}
+
+		logger.info("✅ run_batch() completed: %s/%s documents succeeded", sum(1 for r in results.values() if r['success']), len(file_paths))
+		return [results[file_path] for file_path in file_paths]
+
+	def _run_items(self, items: List[IngestedItem]) -> Dict[str, Tuple[int, int]]:
+		"""
+		Chunk ingested items in one chunker call, build nodes per source and write them to Qdrant in one call.
+		Returns (chunk_count, node_count) per source.
+		"""
+		# Ingested items are already validated, so the chunk request skips re-validation
+		chunk_request = ChunkRequest.model_construct(
+			items=[ChunkItem.model_construct(source=i.source, len_characters=i.len_characters, text=i.text) for i in items]
+		)
+		chunk_response: ChunkResponse = self.chunker.chunk(chunk_request)
+		logger.info("✅ Chunking complete: %s chunks generated", len(chunk_response.chunks) if chunk_response.chunks else 0)
+		
+		chunks_by_source: Dict[str, List[ChunkItem]] = {}
+		for chunk in chunk_response.chunks or []:
+			chunks_by_source.setdefault(chunk.source, []).append(chunk)
+		parent_texts = NodeBuilder.parent_texts_from_items(items)
+		
+		# Nodes are built per source so chunk indices stay per document
+		counts: Dict[str, Tuple[int, int]] = {}
+		all_nodes = []
+		for source, chunks in chunks_by_source.items():
+			leaf_nodes, _ = NodeBuilder.build_nodes_from_chunks(chunks, {source: parent_texts.get(source, "")})
+			all_nodes.extend(leaf_nodes)
+			counts[source] = (len(chunks), len(leaf_nodes))
+		
+		if not all_nodes:
+			logger.warning("⚠️ No chunks to process, no nodes built")
+			return counts
+		
+		# Write to Qdrant (no retry needed - better concurrent write support)
+		logger.info("💾 Writing %s nodes from %s sources to Qdrant...", len(all_nodes), len(counts))
+		try:
+			self.storage_setup.write_nodes(all_nodes)
+		except Exception as e:
+			logger.error("❌ Failed to write to Qdrant: %s", e)
+			raise
+		logger.info("✅ Successfully wrote %s nodes to Qdrant", len(all_nodes))
+		return counts
 	
 
 data_preprocess_semantic_config = {
@@ -183,9 +241,19 @@ data_preprocess_semantic_config = {
 	"propositioner": "t5-propositioner",
 }
 
-data_preprocess_semantic_pipeline = DataPreprocessSemantic(config=data_preprocess_semantic_config)
-# Export alias expected by router
 
-# Default pipeline: recursive overlap chunker
-from src.data_preprocess_pipelines.data_preprocessrecursiveoverlap import data_preprocess_recursive_overlap_pipeline
-data_preprocess_pipeline = data_preprocess_recursive_overlap_pipeline
+@functools.lru_cache(maxsize=1)
+def get_data_preprocess_semantic_pipeline() -> DataPreprocessSemantic:
+	"""Return the shared semantic pipeline, loading its models (T5 propositioner, E5, spaCy) on first use."""
+	return DataPreprocessSemantic(config=data_preprocess_semantic_config)
+
+
+def __getattr__(name: str):
+	# Module-level pipeline names stay importable, but are only built when first accessed
+	if name == "data_preprocess_semantic_pipeline":
+		return get_data_preprocess_semantic_pipeline()
+	if name == "data_preprocess_pipeline":
+		# Default pipeline: recursive overlap chunker
+		from src.data_preprocess_pipelines.data_preprocessrecursiveoverlap import get_data_preprocess_recursive_overlap_pipeline
+		return get_data_preprocess_recursive_overlap_pipeline()
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
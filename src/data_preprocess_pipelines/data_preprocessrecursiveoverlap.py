@@ -1,11 +1,14 @@
+import functools
 import os
+import queue
 import logging
-from typing import Any, Dict, Optional
+import threading
+from typing import Any, Dict, List, Optional
 
 from src.data_preprocess_pipelines.base import DataPreprocessBase
 from src.ingestion.pdf_ingestor import PDFIngestor
 from src.ingestion.pdf_docling_ingestor import PDFDoclingIngestor
-from src.ingestion.schemas import IngestedItem
+from src.ingestion.schemas import IngestedItem, IngestRequest
 from src.chunking.schemas import ChunkItem, ChunkRequest, ChunkResponse
 from src.chunking.router import get_chunker
 from src.embeddings.e5_small import E5SmallEmbedding
@@ -23,6 +26,11 @@ from llama_index.core import VectorStoreIndex  # type: ignore
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# Documents buffered between run_batch pipeline stages
+PIPELINE_QUEUE_SIZE = 4
+# Marks the end of a stage's input
+_STAGE_DONE = object()
+
 
 INGESTORS: Dict[str, Any] = {
 	"pdf": PDFIngestor,
@@ -43,7 +51,10 @@ class DataPreprocessRecursiveOverlap(DataPreprocessBase):
 		chunker_name = config.get("chunker", "recursive_overlap")
 
 		logger.info(
-			f"📋 Configuration: ingestor={ingestor_name}, embedding={embedding_name}, chunker={chunker_name}"
+			"📋 Configuration: ingestor=%s, embedding=%s, chunker=%s",
+			ingestor_name,
+			embedding_name,
+			chunker_name,
 		)
 
 		ingestor_cls = INGESTORS[ingestor_name]
@@ -75,19 +86,20 @@ class DataPreprocessRecursiveOverlap(DataPreprocessBase):
 		logger.info("✅ DataPreprocessRecursiveOverlap pipeline fully initialized")
 
 	def run_single_doc(self, file_path: str) -> Dict[str, Any]:
-		logger.info(f"📄 Starting run_single_doc() for: {os.path.basename(file_path)}")
-		logger.info(f"📍 Full path: {file_path}")
+		basename = os.path.basename(file_path)
+		logger.info("📄 Starting run_single_doc() for: %s", basename)
+		logger.info("📍 Full path: %s", file_path)
 
 		try:
-			logger.info(f"📖 Ingesting document: {os.path.basename(file_path)}")
-			resp = self.ingestor.ingest(
-				type("Req", (), {"path_or_url": file_path, "media_type": "pdf"})()
-			)
-			logger.info(f"✅ Ingestion complete: {len(resp.items)} items extracted")
+			logger.info("📖 Ingesting document: %s", basename)
+			resp = self.ingestor.ingest(IngestRequest(path_or_url=file_path, media_type="pdf"))
+			logger.info("✅ Ingestion complete: %s items extracted", len(resp.items))
 
-			if not resp.items or not any(item.text.strip() for item in resp.items):
+			items = self._non_empty_items(resp.items)
+			if not items:
 				logger.warning(
-					f"⚠️ No content extracted from document: {os.path.basename(file_path)}"
+					"⚠️ No content extracted from document: %s",
+					basename,
 				)
 				return {
 					"success": False,
@@ -96,45 +108,40 @@ class DataPreprocessRecursiveOverlap(DataPreprocessBase):
 					"character_count": 0,
 				}
 
-			total_chars = sum(item.len_characters for item in resp.items)
+			total_chars = sum(item.len_characters for item in items)
 			logger.info(
-				f"📊 Document stats: {total_chars} total characters across {len(resp.items)} items"
+				"📊 Document stats: %s total characters across %s items",
+				total_chars,
+				len(items),
 			)
 
-			logger.info(f"🔪 Starting recursive overlap chunking for: {os.path.basename(file_path)}")
-			chunk_request = ChunkRequest(
-				items=[
-					ChunkItem(source=i.source, len_characters=i.len_characters, text=i.text)
-					for i in resp.items
-				]
-			)
-			chunk_response: ChunkResponse = self.chunker.chunk(chunk_request)
+			logger.info("🔪 Starting recursive overlap chunking for: %s", basename)
+			chunk_response = self._chunk_items(items)
 			logger.info(
-				f"✅ Chunking complete: {len(chunk_response.chunks) if chunk_response.chunks else 0} chunks generated"
+				"✅ Chunking complete: %s chunks generated",
+				len(chunk_response.chunks) if chunk_response.chunks else 0,
 			)
 
-			parent_texts: Dict[str, str] = {}
-			for item in resp.items:
-				source = item.source
-				if source not in parent_texts:
-					parent_texts[source] = item.text
-			logger.info(f"✅ Parent texts built for {len(parent_texts)} unique sources")
+			parent_texts = NodeBuilder.parent_texts_from_items(items)
+			logger.info("✅ Parent texts built for %s unique sources", len(parent_texts))
 
 			if chunk_response.chunks:
-				logger.info(f"🔨 Building nodes from {len(chunk_response.chunks)} chunks...")
+				logger.info("🔨 Building nodes from %s chunks...", len(chunk_response.chunks))
 				leaf_nodes, parent_docs = NodeBuilder.build_nodes_from_chunks(
 					chunk_response.chunks, parent_texts
 				)
 				node_count = len(leaf_nodes)
 				logger.info(
-					f"✅ Built {node_count} leaf nodes and {len(parent_docs)} parent documents"
+					"✅ Built %s leaf nodes and %s parent documents",
+					node_count,
+					len(parent_docs),
 				)
 
 				try:
-					self.storage_setup.create_index_from_nodes(leaf_nodes)
-					logger.info(f"✅ Successfully wrote {node_count} nodes to Qdrant")
+					self.storage_setup.write_nodes(leaf_nodes)
+					logger.info("✅ Successfully wrote %s nodes to Qdrant", node_count)
 				except Exception as e:
-					logger.error(f"❌ Failed to write to Qdrant: {e}")
+					logger.error("❌ Failed to write to Qdrant: %s", e)
 					raise
 			else:
 				logger.warning("⚠️ No chunks to process, no nodes built")
@@ -148,19 +155,23 @@ class DataPreprocessRecursiveOverlap(DataPreprocessBase):
 				"node_count": node_count,
 			}
 			logger.info(
-				f"✅ run_single_doc() completed successfully for: {os.path.basename(file_path)}"
+				"✅ run_single_doc() completed successfully for: %s",
+				basename,
 			)
 			logger.info(
-				f"📊 Final stats: {result['character_count']} chars, {result['chunk_count']} chunks, {result['node_count']} nodes"
+				"📊 Final stats: %s chars, %s chunks, %s nodes",
+				result['character_count'],
+				result['chunk_count'],
+				result['node_count'],
 			)
 			return result
 
 		except Exception as e:
-			logger.error(f"❌ Failed to process {os.path.basename(file_path)}: {str(e)}")
-			logger.error(f"❌ Exception type: {type(e).__name__}")
+			logger.error("❌ Failed to process %s: %s", basename, str(e))
+			logger.error("❌ Exception type: %s", type(e).__name__)
 			import traceback
 
-			logger.error(f"❌ Stack trace:\n{traceback.format_exc()}")
+			logger.error("❌ Stack trace:\n%s", traceback.format_exc())
 			return {
 				"success": False,
 				"error": str(e),
@@ -168,6 +179,102 @@ class DataPreprocessRecursiveOverlap(DataPreprocessBase):
 				"character_count": 0,
 			}
 
+	def run_batch(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+		"""
+		Process several documents as an ingest -> chunk -> Qdrant write pipeline; one result per path.
+
+		Ingestion and Qdrant writes run in their own threads over bounded queues, so parsing the
+		next PDF and writing (embedding + upserting) the previous document overlap with chunking.
+		"""
+		logger.info("📚 Starting run_batch() for %s documents", len(file_paths))
+		ingested: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+		to_write: queue.Queue = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+		results: Dict[str, Dict[str, Any]] = {}
+
+		def failure(file_path: str, error: str) -> Dict[str, Any]:
+			return {"success": False, "error": error, "file_path": file_path, "character_count": 0}
+
+		def ingest_stage() -> None:
+			for file_path in file_paths:
+				try:
+					resp = self.ingestor.ingest(IngestRequest(path_or_url=file_path, media_type="pdf"))
+					ingested.put((file_path, self._non_empty_items(resp.items), None))
+				except Exception as e:
+					ingested.put((file_path, None, e))
+			ingested.put(_STAGE_DONE)
+
+		def write_stage() -> None:
+			while True:
+				unit = to_write.get()
+				if unit is _STAGE_DONE:
+					return
+				file_path, leaf_nodes, result = unit
+				try:
+					if leaf_nodes:
+						self.storage_setup.write_nodes(leaf_nodes)
+					results[file_path] = result
+				except Exception as e:
+					logger.error("❌ Failed to write %s to Qdrant: %s", os.path.basename(file_path), e)
+					results[file_path] = failure(file_path, str(e))
+
+		ingest_thread = threading.Thread(target=ingest_stage, name="ingest-stage", daemon=True)
+		write_thread = threading.Thread(target=write_stage, name="qdrant-write-stage", daemon=True)
+		ingest_thread.start()
+		write_thread.start()
+		try:
+			# Chunking and node building run on the calling thread
+			while True:
+				unit = ingested.get()
+				if unit is _STAGE_DONE:
+					break
+				file_path, items, error = unit
+				if error is not None:
+					logger.error("❌ Failed to ingest %s: %s", os.path.basename(file_path), error)
+					results[file_path] = failure(file_path, str(error))
+					continue
+				if not items:
+					logger.warning("⚠️ No content extracted from document: %s", os.path.basename(file_path))
+					results[file_path] = failure(file_path, "No content extracted from document")
+					continue
+				try:
+					chunk_response = self._chunk_items(items)
+					chunks = chunk_response.chunks or []
+					leaf_nodes = (
+						NodeBuilder.build_nodes_from_chunks(chunks, NodeBuilder.parent_texts_from_items(items))[0] if chunks else []
+					)
+				except Exception as e:
+					logger.error("❌ Failed to chunk %s: %s", os.path.basename(file_path), e)
+					results[file_path] = failure(file_path, str(e))
+					continue
+				to_write.put((file_path, leaf_nodes, {
+					"success": True,
+					"file_path": file_path,
+					"character_count": sum(item.len_characters for item in items),
+					"chunk_count": len(chunks),
+					"node_count": len(leaf_nodes),
+				}))
+			ingest_thread.join()
+		finally:
+			to_write.put(_STAGE_DONE)
+			write_thread.join()
+
+		logger.info(
+			"✅ run_batch() completed: %s/%s documents succeeded",
+			sum(1 for r in results.values() if r['success']),
+			len(file_paths),
+		)
+		return [results[file_path] for file_path in file_paths]
+
+	def _chunk_items(self, items: List[IngestedItem]) -> ChunkResponse:
+		# Ingested items are already validated, so the chunk request skips re-validation
+		chunk_request = ChunkRequest.model_construct(
+			items=[
+				ChunkItem.model_construct(source=i.source, len_characters=i.len_characters, text=i.text)
+				for i in items
+			]
+		)
+		return self.chunker.chunk(chunk_request)
+
 
 data_preprocess_recursive_overlap_config: Dict[str, Any] = {
 	"chunker": "recursive_overlap",
@@ -175,6 +282,15 @@ data_preprocess_recursive_overlap_config: Dict[str, Any] = {
 	"embedding": "e5-small",
 }
 
-data_preprocess_recursive_overlap_pipeline = DataPreprocessRecursiveOverlap(
-	config=data_preprocess_recursive_overlap_config
-)
+
+@functools.lru_cache(maxsize=1)
+def get_data_preprocess_recursive_overlap_pipeline() -> DataPreprocessRecursiveOverlap:
+	"""Return the shared recursive overlap pipeline, loading its embedding model on first use."""
+	return DataPreprocessRecursiveOverlap(config=data_preprocess_recursive_overlap_config)
+
+
+def __getattr__(name: str):
+	# Module-level pipeline name stays importable, but is only built when first accessed
+	if name == "data_preprocess_recursive_overlap_pipeline":
+		return get_data_preprocess_recursive_overlap_pipeline()
+	raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,17 +1,31 @@
 """Simple PDF text extraction for evaluation purposes."""
-from typing import Dict, Any
-import PyPDF2
+from typing import Dict, Any, List
 from pathlib import Path
+import pypdfium2 as pdfium
 from .base import DataPreprocessBase
-from src.ingestion.pdf_ingestor import PDFIngestor
-from src.ingestion.schemas import IngestRequest
 
 
 class SimplePDFPreprocess(DataPreprocessBase):
-    """Simple PDF text extraction using PDFIngestor."""
+    """Simple PDF text extraction using PDFium (pypdfium2)."""
     
-    def __init__(self):
-        self.ingestor = PDFIngestor()
+    @staticmethod
+    def _extract_pages(file_path: str) -> List[str]:
+        """Return the text of every page in order, extracted by PDFium's native text layer."""
+        pdf = pdfium.PdfDocument(file_path)
+        try:
+            pages = []
+            for index in range(len(pdf)):
+                page = pdf[index]
+                textpage = page.get_textpage()
+                try:
+                    # PDFium separates lines with CRLF; normalise to the LF the rest of the code expects
+                    pages.append(textpage.get_text_range().replace("\r\n", "\n"))
+                finally:
+                    textpage.close()
+                    page.close()
+            return pages
+        finally:
+            pdf.close()
     
     def run_single_doc(self, file_path: str) -> Dict[str, Any]:
         """
@@ -46,23 +60,13 @@ class SimplePDFPreprocess(DataPreprocessBase):
                     "page_count": 0
                 }
             
-            # Use PDFIngestor to extract text
-            request = IngestRequest(path_or_url=file_path, media_type="pdf")
-            response = self.ingestor.ingest(request)
-            
-            # Get the text from the response
-            extracted_text = ""
-            if response.items and len(response.items) > 0:
-                extracted_text = response.items[0].text
-            
-            # Get page count separately
-            page_count = 0
+            # One PDFium pass gives both the text and the page count
             try:
-                with open(file_path, 'rb') as file:
-                    pdf_reader = PyPDF2.PdfReader(file)
-                    page_count = len(pdf_reader.pages)
+                pages = self._extract_pages(file_path)
             except Exception:
-                page_count = 0
+                pages = []
+            extracted_text = "\n".join([page_text for page_text in pages if page_text])
+            page_count = len(pages)
             
             if not extracted_text.strip():
                 return {
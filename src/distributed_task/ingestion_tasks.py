@@ -6,9 +6,9 @@ from typing import List, Dict, Any
 from celery import current_task, group, chord
 from celery.exceptions import Ignore
 
+from src.config import INGEST_BATCH_SIZE
 from src.distributed_task.celery_app import celery_app
 from src.distributed_task.progress_tracker import ProgressTracker
-from src.data_preprocess_pipelines.data_preprocess import data_preprocess_semantic_pipeline
 
 # Configure logger for ingestion tasks
 logger = logging.getLogger(__name__)
@@ -37,11 +37,11 @@ def process_single_document_task(self, file_path: str, master_job_id: str, pipel
     try:
         # Get the appropriate pipeline based on type
         if pipeline_type == "recursive_overlap":
-            from src.data_preprocess_pipelines.data_preprocessrecursiveoverlap import data_preprocess_recursive_overlap_pipeline
-            pipeline = data_preprocess_recursive_overlap_pipeline
+            from src.data_preprocess_pipelines.data_preprocessrecursiveoverlap import get_data_preprocess_recursive_overlap_pipeline
+            pipeline = get_data_preprocess_recursive_overlap_pipeline()
         elif pipeline_type == "semantic":
-            from src.data_preprocess_pipelines.data_preprocess import data_preprocess_semantic_pipeline
-            pipeline = data_preprocess_semantic_pipeline
+            from src.data_preprocess_pipelines.data_preprocess import get_data_preprocess_semantic_pipeline
+            pipeline = get_data_preprocess_semantic_pipeline()
         else:
             raise ValueError(f"Unknown pipeline type: {pipeline_type}")
         
@@ -105,6 +105,59 @@ def process_single_document_task(self, file_path: str, master_job_id: str, pipel
         }
 
 
+@celery_app.task(bind=True)
+def process_document_batch_task(self, file_paths: List[str], master_job_id: str, pipeline_type: str = "semantic"):
+    """
+    Celery subtask to process several documents in one pipeline batch
+    
+    Args:
+        file_paths: Paths to the files to process together
+        master_job_id: ID of the master task for progress tracking
+        pipeline_type: Type of pipeline to use ("recursive_overlap" or "semantic")
+    """
+    task_id = self.request.id
+    logger.info(f"🔷 [Task {task_id}] Starting process_document_batch_task for {len(file_paths)} files")
+    logger.info(f"🔷 [Task {task_id}] Master job ID: {master_job_id}")
+    logger.info(f"🔷 [Task {task_id}] Pipeline type: {pipeline_type}")
+    
+    start_time = time.time()
+    progress = ProgressTracker(master_job_id)
+    
+    try:
+        if pipeline_type == "recursive_overlap":
+            from src.data_preprocess_pipelines.data_preprocessrecursiveoverlap import get_data_preprocess_recursive_overlap_pipeline
+            pipeline = get_data_preprocess_recursive_overlap_pipeline()
+        elif pipeline_type == "semantic":
+            from src.data_preprocess_pipelines.data_preprocess import get_data_preprocess_semantic_pipeline
+            pipeline = get_data_preprocess_semantic_pipeline()
+        else:
+            raise ValueError(f"Unknown pipeline type: {pipeline_type}")
+        
+        logger.info(f"🔷 [Task {task_id}] Calling {pipeline_type} pipeline.run_batch()...")
+        results = pipeline.run_batch(file_paths)
+        logger.info(f"🔷 [Task {task_id}] Batch completed in {time.time() - start_time:.2f}s")
+        
+    except Exception as e:
+        error_message = f"Failed to process batch: {str(e)}"
+        logger.error(f"❌ [Task {task_id}] {error_message}")
+        logger.error(f"❌ [Task {task_id}] Stack trace:\n{traceback.format_exc()}")
+        results = [
+            {"success": False, "error": error_message, "file_path": file_path, "character_count": 0}
+            for file_path in file_paths
+        ]
+    
+    # One atomic progress increment per document, as the per-file subtasks do
+    for result in results:
+        progress.increment_processed(
+            success=result["success"],
+            current_file=os.path.basename(result["file_path"]),
+            estimated_time_remaining=None
+        )
+    
+    logger.info(f"✅ [Task {task_id}] Batch task finished: {sum(1 for r in results if r['success'])}/{len(results)} succeeded")
+    return results
+
+
 @celery_app.task(bind=True)
 def ingest_documents_task(self, folder_path: str, file_types: List[str] = None, pipeline_type: str = "recursive_overlap"):
     """
@@ -142,15 +195,16 @@ def ingest_documents_task(self, folder_path: str, file_types: List[str] = None,
         
         logger.info(f"🔶 [Master {job_id}] Scanning folder for files...")
         
-        # Get list of files to process
+        # Get list of files to process: one directory scan, bucketed by extension in file_types order
+        files_by_type: Dict[str, List[str]] = {f".{file_type.lower()}": [] for file_type in file_types}
+        with os.scandir(folder_path) as entries:
+            for entry in entries:
+                files = files_by_type.get(os.path.splitext(entry.name)[1].lower())
+                if files is not None and entry.is_file():
+                    files.append(entry.path)
         all_files = []
-        for file_type in file_types:
-            files = [
-                os.path.join(folder_path, f)
-                for f in os.listdir(folder_path)
-                if f.lower().endswith(f".{file_type.lower()}")
-            ]
-            logger.info(f"🔶 [Master {job_id}] Found {len(files)} .{file_type} files")
+        for extension, files in files_by_type.items():
+            logger.info(f"🔶 [Master {job_id}] Found {len(files)} {extension} files")
             all_files.extend(files)
         
         if not all_files:
@@ -167,14 +221,23 @@ def ingest_documents_task(self, folder_path: str, file_types: List[str] = None,
         progress.initialize_counters(total_files, start_time)
         
         # Create subtasks for each document using Celery group (fan-out pattern)
-        logger.info(f"🔶 [Master {job_id}] Creating {total_files} subtasks...")
+        logger.info(f"🔶 [Master {job_id}] Creating subtasks for {total_files} files...")
         
-        subtask_group = group(
-            process_single_document_task.s(file_path, job_id, pipeline_type)
-            for file_path in all_files
-        )
+        # Several files per subtask: the semantic pipeline fills its model batches, and the
+        # recursive pipeline overlaps ingestion, chunking and Qdrant writes across files
+        batch_size = INGEST_BATCH_SIZE
+        if batch_size > 1:
+            subtask_group = group(
+                process_document_batch_task.s(all_files[i:i + batch_size], job_id, pipeline_type)
+                for i in range(0, total_files, batch_size)
+            )
+        else:
+            subtask_group = group(
+                process_single_document_task.s(file_path, job_id, pipeline_type)
+                for file_path in all_files
+            )
 
-        logger.info(f"🔶 [Master {job_id}] Scheduling {total_files} subtasks for parallel processing...")
+        logger.info(f"🔶 [Master {job_id}] Scheduling subtasks for {total_files} files for parallel processing...")
 
         # Execute all subtasks in parallel (non-blocking)
         group_result = subtask_group.apply_async()
@@ -254,11 +317,11 @@ def ingest_single_file_task(self, file_path: str, file_type: str = None, pipelin
         
         # Get the appropriate pipeline based on type
         if pipeline_type == "recursive_overlap":
-            from src.data_preprocess_pipelines.data_preprocessrecursiveoverlap import data_preprocess_recursive_overlap_pipeline
-            pipeline = data_preprocess_recursive_overlap_pipeline
+            from src.data_preprocess_pipelines.data_preprocessrecursiveoverlap import get_data_preprocess_recursive_overlap_pipeline
+            pipeline = get_data_preprocess_recursive_overlap_pipeline()
         elif pipeline_type == "semantic":
-            from src.data_preprocess_pipelines.data_preprocess import data_preprocess_semantic_pipeline
-            pipeline = data_preprocess_semantic_pipeline
+            from src.data_preprocess_pipelines.data_preprocess import get_data_preprocess_semantic_pipeline
+            pipeline = get_data_preprocess_semantic_pipeline()
         else:
             raise ValueError(f"Unknown pipeline type: {pipeline_type}")
         
@@ -0,0 +1,70 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from typing import List, Optional
+
+from .base import BaseEmbedding
+from .schemas import EmbeddingInput
+
+# SQLite caps bound parameters per statement; look keys up in slices below that
+_LOOKUP_BATCH = 500
+
+
+class EmbeddingCache:
+    """Persistent embedding cache keyed by a content hash of (model name, text).
+
+    Vectors are stored as float32 blobs in a single SQLite file, so re-ingesting the same
+    documents skips the embedding model for every text it has already seen.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key BLOB PRIMARY KEY, vector BLOB NOT NULL)")
+        self._conn.commit()
+
+    @staticmethod
+    def _key(model_name: str, text: str) -> bytes:
+        return hashlib.blake2b(f"{model_name}\0{text}".encode(), digest_size=16).digest()
+
+    def embed(self, embedding: BaseEmbedding, texts: List[str]) -> List[List[float]]:
+        """Return embeddings for texts, embedding only cache misses (in one call) and storing them."""
+        keys = [self._key(embedding.embedding_name, t) for t in texts]
+        vectors: List[Optional[List[float]]] = self._get_many(keys)
+
+        missing = [i for i, v in enumerate(vectors) if v is None]
+        if missing:
+            # Identical texts within one call are embedded once
+            unique_missing = list(dict.fromkeys(texts[i] for i in missing))
+            out = embedding.embed(EmbeddingInput(documents=unique_missing))
+            by_text = dict(zip(unique_missing, out.embeddings))
+            for i in missing:
+                vectors[i] = by_text[texts[i]]
+            self._put_many([(self._key(embedding.embedding_name, t), by_text[t]) for t in unique_missing])
+
+        return vectors  # type: ignore[return-value]
+
+    def _get_many(self, keys: List[bytes]) -> List[Optional[List[float]]]:
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _LOOKUP_BATCH):
+                batch = keys[start:start + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                found.update(rows)
+        return [array("f", found[k]).tolist() if k in found else None for k in keys]
+
+    def _put_many(self, items: List[tuple]) -> None:
+        rows = [(key, array("f", vector).tobytes()) for key, vector in items]
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows)
+            self._conn.commit()
@@ -1,12 +1,15 @@
 """Main evaluation orchestration logic."""
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 import logging
 from datetime import datetime
 from uuid import uuid4
 
+from src.config import INGEST_WORKERS
 from src.embeddings.base import BaseEmbedding
-from src.agents.retrieval_agent.agent import RetrievalAgent
+from src.agents.retrieval_agent.agent import get_retrieval_agent
 from src.data_preprocess_pipelines.simple_pdf_preprocess import SimplePDFPreprocess
 from .question_generator_agent import QuestionGeneratorAgent
 from .models import EvaluationDocument, QuestionDocument, EvaluationResultDocument
@@ -15,6 +18,11 @@ from .metrics import calculate_all_metrics
 logger = logging.getLogger(__name__)
 
 
+def _extract_pdf_text(file_path: str) -> Dict[str, Any]:
+    """Extract one PDF's text; module-level so it can run in a worker process."""
+    return SimplePDFPreprocess().run_single_doc(file_path)
+
+
 class Evaluator:
     """Main evaluator class that orchestrates the evaluation process."""
     
@@ -26,7 +34,7 @@ class Evaluator:
             embedding: Embedding model for retrieval
         """
         self.embedding = embedding
-        self.retrieval_agent = RetrievalAgent(embedding=embedding)
+        self.retrieval_agent = get_retrieval_agent(embedding)
         self.pdf_processor = SimplePDFPreprocess()
         self.question_generator = QuestionGeneratorAgent()
     
@@ -59,11 +67,11 @@ class Evaluator:
         
         question_documents = []
         
-        for pdf_file in pdf_files:
+        # Parse every PDF up front in parallel; question generation below stays sequential
+        extractions = await self._extract_pdfs([str(p) for p in pdf_files])
+        
+        for pdf_file, result in zip(pdf_files, extractions):
             try:
-                # Extract text from PDF
-                result = self.pdf_processor.run_single_doc(str(pdf_file))
-                
                 if not result["success"]:
                     logger.warning(f"Failed to extract text from {pdf_file}: {result.get('error')}")
                     continue
@@ -97,6 +105,25 @@ class Evaluator:
         logger.info(f"Total questions generated and stored: {len(question_documents)}")
         return question_group_id, question_documents
     
+    async def _extract_pdfs(self, file_paths: List[str]) -> List[Dict[str, Any]]:
+        """
+        Extract text from several PDFs without blocking the event loop.
+        
+        PDF parsing is CPU-bound, so files are spread over up to INGEST_WORKERS processes;
+        results are returned in input order.
+        """
+        workers = min(INGEST_WORKERS, len(file_paths))
+        if workers <= 1:
+            return await asyncio.to_thread(
+                lambda: [self.pdf_processor.run_single_doc(path) for path in file_paths]
+            )
+        
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return await asyncio.gather(
+                *(loop.run_in_executor(pool, _extract_pdf_text, path) for path in file_paths)
+            )
+    
     async def load_questions_by_group_id(self, question_group_id: str) -> List[QuestionDocument]:
         """
         Load existing questions from database by question_group_id.
@@ -192,7 +219,7 @@ class Evaluator:
             )
             
             # Extract source paths
-            source_paths = [doc["source"] for doc in results if "source" in doc]
+            source_paths = [doc.source for doc in results]
             return source_paths
             
         except Exception as e:
@@ -2,6 +2,7 @@
 from crewai import Agent, Task, Crew  # type: ignore
 from langchain_openai import ChatOpenAI  # type: ignore
 from src.config import OPENAI_API_KEY
+from src.agents.http_clients import SHARED_OPENAI_ASYNC_HTTP_CLIENT, SHARED_OPENAI_HTTP_CLIENT
 from .schemas import QuestionOutput
 from typing import Optional
 import logging
@@ -28,6 +29,8 @@ class QuestionGeneratorAgent:
             model="gpt-4o-mini",
             temperature=0.7,
             openai_api_key=OPENAI_API_KEY,
+            http_client=SHARED_OPENAI_HTTP_CLIENT,
+            http_async_client=SHARED_OPENAI_ASYNC_HTTP_CLIENT,
         )
     
     def generate_question(self, document_text: str, source_path: str) -> Optional[QuestionOutput]:
@@ -2,12 +2,20 @@ from .base import BaseIngestor
 from .schemas import IngestRequest, IngestResponse, IngestedItem
 import PyPDF2
 from pathlib import Path
+from typing import List
 
 
 class PDFIngestor(BaseIngestor):
 	def __init__(self):
 		super().__init__(name="pdf")
 
+	@staticmethod
+	def extract_pages(path: str) -> List[str]:
+		"""Return the text of every page in order ("" for pages without text), from a single PyPDF2 parse."""
+		with open(path, 'rb') as file:
+			pdf_reader = PyPDF2.PdfReader(file)
+			return [page.extract_text() or "" for page in pdf_reader.pages]
+
 	def ingest(self, request: IngestRequest) -> IngestResponse:
 		"""
 		Uses PyPDF2 to parse PDFs quickly.
@@ -33,16 +41,7 @@ class PDFIngestor(BaseIngestor):
 				return IngestResponse(items=[item])
 			
 			# Extract text from PDF using PyPDF2
-			with open(path_or_url, 'rb') as file:
-				pdf_reader = PyPDF2.PdfReader(file)
-				
-				text_parts = []
-				for page in pdf_reader.pages:
-					page_text = page.extract_text()
-					if page_text:
-						text_parts.append(page_text)
-				
-				text = "\n".join(text_parts)
+			text = "\n".join([page_text for page_text in self.extract_pages(path_or_url) if page_text])
 		
 		except Exception as e:
 			# On any error, return empty text
@@ -1,10 +1,11 @@
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
 from src.posts.router import router as posts_router
 from src.sessions.router import router as sessions_router
 from src.mongodb.client import mongodb_client
 from src.sessions.background_tasks import background_tasks
-from src.vectordb.qdrant_db.manager import QdrantManager
+from src.vectordb.qdrant_db.manager import get_qdrant_manager
 from src.vectordb.qdrant_db.config import qdrant_host, qdrant_port, collection_name
 
 @asynccontextmanager
@@ -15,7 +16,7 @@ async def lifespan(app: FastAPI):
     
     # Initialize Qdrant collection at startup
     try:
-        qdrant_manager = QdrantManager(
+        qdrant_manager = get_qdrant_manager(
             host=qdrant_host,
             port=qdrant_port,
             collection_name=collection_name
@@ -36,6 +37,9 @@ async def lifespan(app: FastAPI):
 
 app = FastAPI(lifespan=lifespan)
 
+# List/status payloads repeat the same keys per row and compress well
+app.add_middleware(GZipMiddleware, minimum_size=500)
+
 app.include_router(posts_router)
 app.include_router(sessions_router)
 
@@ -1,8 +1,14 @@
-from fastapi import APIRouter, HTTPException
-from typing import Optional, Literal
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from typing import Optional, Literal, Union
 import os
+import json
+import asyncio
 from pathlib import Path
-from .schemas import IngestFolderRequest, RetrievalRequest, RetrievalResponse, RetrievedDocument
+from .schemas import IngestFolderRequest, RetrievalRequest, RetrievalResponse, RetrievedDocument, ProjectedRowsResponse
+from .utils import parse_fields, project_rows, conditional_json_response
 from src.sessions.schemas import ChatRequest, ChatResponse, SessionResponse
 from src.sessions.service import session_service
 from src.sessions.models import MessageRole
@@ -26,15 +32,25 @@ from datetime import datetime
 
 router = APIRouter()
 
+# /ingestion/stream checks the local progress store at this interval but only pushes on change
+INGESTION_STREAM_POLL_SECONDS = 1.0
+INGESTION_STREAM_KEEPALIVE_SECONDS = 15.0
+INGESTION_TERMINAL_STATUSES = {"completed", "failed"}
+
+
+def _sse_event(payload: dict) -> str:
+    """Encode a payload as a single Server-Sent Events frame."""
+    return f"data: {json.dumps(payload)}\n\n"
+
 
 def get_pipeline_by_type(pipeline_type: Literal["recursive_overlap", "semantic"]) -> DataPreprocessBase:
     """Get the appropriate data preprocessing pipeline based on type."""
     if pipeline_type == "recursive_overlap":
-        from src.data_preprocess_pipelines.data_preprocessrecursiveoverlap import data_preprocess_recursive_overlap_pipeline
-        return data_preprocess_recursive_overlap_pipeline
+        from src.data_preprocess_pipelines.data_preprocessrecursiveoverlap import get_data_preprocess_recursive_overlap_pipeline
+        return get_data_preprocess_recursive_overlap_pipeline()
     elif pipeline_type == "semantic":
-        from src.data_preprocess_pipelines.data_preprocess import data_preprocess_semantic_pipeline
-        return data_preprocess_semantic_pipeline
+        from src.data_preprocess_pipelines.data_preprocess import get_data_preprocess_semantic_pipeline
+        return get_data_preprocess_semantic_pipeline()
     else:
         raise ValueError(f"Unknown pipeline type: {pipeline_type}")
 
@@ -58,8 +74,8 @@ async def chat(request: ChatRequest):
             raise HTTPException(status_code=500, detail="Failed to add message to session")
         
         # Generate response using existing ChatCrew
-        from src.agents.chat_agent.crew import ChatCrew
-        crew = ChatCrew()
+        from src.agents.chat_agent.crew import get_chat_crew
+        crew = get_chat_crew()
         answer, sources = crew.chat(question=request.message, context=None)
         
         # Add assistant response to session
@@ -79,6 +95,50 @@ async def chat(request: ChatRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Chat error: {str(e)}")
 
+@router.post("/chat/stream", tags=["chat"])
+async def chat_stream(request: ChatRequest):
+    """
+    Chat endpoint that returns the answer as Server-Sent Events.
+    
+    This does not stream LLM tokens: ChatCrew produces the full answer before anything is sent,
+    so time to first text matches /chat. The crew runs in a worker thread so the event loop
+    stays free for other requests, and the client reads frames from an open stream instead of
+    holding one long request. Frames are JSON objects with a "type" of:
+    - delta: {"text": <answer text>}
+    - done: {"session_id": <id>, "sources": [...]}
+    - error: {"detail": <message>}
+    """
+    session = await session_service.get_or_create_session(request.session_id)
+    session = await session_service.add_message_to_session(
+        session.id,
+        request.message,
+        MessageRole.USER,
+        request.metadata
+    )
+    
+    if not session:
+        raise HTTPException(status_code=500, detail="Failed to add message to session")
+    
+    async def event_stream():
+        try:
+            from src.agents.chat_agent.crew import get_chat_crew
+            crew = get_chat_crew()
+            answer, sources = await run_in_threadpool(crew.chat, question=request.message, context=None)
+            
+            # The whole answer goes out in one delta frame; clients still concatenate deltas
+            yield _sse_event({"type": "delta", "text": answer})
+            
+            await session_service.add_message_to_session(
+                session.id,
+                answer,
+                MessageRole.ASSISTANT
+            )
+            yield _sse_event({"type": "done", "session_id": session.id, "sources": sources})
+        except Exception as e:
+            yield _sse_event({"type": "error", "detail": f"Chat error: {str(e)}"})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
 @router.get("/sessions/{session_id}", response_model=SessionResponse, tags=["chat"])
 async def get_session(session_id: str):
     """Get session by id - loads from MongoDB to Redis if needed"""
@@ -122,7 +182,7 @@ async def retrieve_documents(request: RetrievalRequest):
     """
     try:
         # Import here to avoid circular dependencies
-        from src.agents.retrieval_agent.agent import RetrievalAgent
+        from src.agents.retrieval_agent.agent import get_retrieval_agent
         
         # Get pipeline and embedding based on request
         pipeline = get_pipeline_by_type(request.pipeline_type)
@@ -133,17 +193,17 @@ async def retrieve_documents(request: RetrievalRequest):
                 detail="Embedding model not initialized"
             )
         
-        # Use RetrievalAgent for all cases
-        retrieval_agent = RetrievalAgent(embedding=embedding)
+        # Use the shared RetrievalAgent for all cases
+        retrieval_agent = get_retrieval_agent(embedding)
         
-        if not retrieval_agent.is_available():
+        if not await run_in_threadpool(retrieval_agent.is_available):
             raise HTTPException(
                 status_code=503,
                 detail="Vector database is not available or has no data"
             )
         
         # Retrieve documents with optional query enhancement and reranking
-        detailed_results = retrieval_agent.retrieve(
+        detailed_results = await retrieval_agent.aretrieve(
             question=request.query,
             use_query_enhancer=request.use_query_enhancer,
             use_reranking=request.use_reranking,
@@ -153,10 +213,10 @@ async def retrieve_documents(request: RetrievalRequest):
         # Convert to response format
         documents = [
             RetrievedDocument(
-                text=doc["text"],
-                source=doc["source"],
-                score=doc["score"],
-                metadata=doc["metadata"]
+                text=doc.text,
+                source=doc.source,
+                score=doc.score,
+                metadata=doc.metadata
             )
             for doc in detailed_results
         ]
@@ -233,7 +293,7 @@ async def start_single_file_ingestion(request: SingleFileIngestionRequest):
 
 
 @router.get("/ingestion/status/{job_id}", response_model=TaskProgress, tags=["ingestion"])
-async def get_ingestion_status(job_id: str):
+async def get_ingestion_status(job_id: str, request: Request):
     """
     Get the current status and progress of an ingestion job.
     
@@ -243,45 +303,10 @@ async def get_ingestion_status(job_id: str):
     Returns:
         Current status including progress information, estimated time remaining,
         success/failure counts, and current file being processed.
+        Responses carry an ETag; pollers sending If-None-Match get 304 when unchanged.
     """
     try:
-        # Get progress from Redis using ProgressTracker
-        progress_data = ProgressTracker.get_progress(job_id)
-        
-        if progress_data:
-            return TaskProgress(**progress_data)
-        
-        # If no Redis data, try to get from Celery
-        from src.distributed_task.celery_app import celery_app
-        task_result = celery_app.AsyncResult(job_id)
-        
-        if task_result.state == "PENDING":
-            return TaskProgress(job_id=job_id, status="pending")
-        elif task_result.state == "PROGRESS":
-            meta = task_result.info or {}
-            return TaskProgress(job_id=job_id, **meta)
-        elif task_result.state == "SUCCESS":
-            meta = task_result.info or {}
-            return TaskProgress(
-                job_id=job_id,
-                status="completed",
-                total_documents=meta.get("total_files"),
-                processed_documents=meta.get("total_files"),
-                successful_documents=meta.get("successful_files"),
-                failed_documents=meta.get("failed_files"),
-                documents_left=0,
-                progress_percentage=100.0,
-                total_time_seconds=meta.get("total_time_seconds")
-            )
-        elif task_result.state == "FAILURE":
-            return TaskProgress(
-                job_id=job_id,
-                status="failed",
-                error_message=str(task_result.info) if task_result.info else "Unknown error"
-            )
-        else:
-            return TaskProgress(job_id=job_id, status=task_result.state.lower())
-            
+        return conditional_json_response(request, _load_ingestion_progress(job_id))
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -289,6 +314,82 @@ async def get_ingestion_status(job_id: str):
         )
 
 
+def _load_ingestion_progress(job_id: str) -> TaskProgress:
+    """Resolve job progress from Redis, falling back to the Celery task state."""
+    # Get progress from Redis using ProgressTracker
+    progress_data = ProgressTracker.get_progress(job_id)
+    
+    if progress_data:
+        return TaskProgress(**progress_data)
+    
+    # If no Redis data, try to get from Celery
+    from src.distributed_task.celery_app import celery_app
+    task_result = celery_app.AsyncResult(job_id)
+    
+    if task_result.state == "PENDING":
+        return TaskProgress(job_id=job_id, status="pending")
+    elif task_result.state == "PROGRESS":
+        meta = task_result.info or {}
+        return TaskProgress(job_id=job_id, **meta)
+    elif task_result.state == "SUCCESS":
+        meta = task_result.info or {}
+        return TaskProgress(
+            job_id=job_id,
+            status="completed",
+            total_documents=meta.get("total_files"),
+            processed_documents=meta.get("total_files"),
+            successful_documents=meta.get("successful_files"),
+            failed_documents=meta.get("failed_files"),
+            documents_left=0,
+            progress_percentage=100.0,
+            total_time_seconds=meta.get("total_time_seconds")
+        )
+    elif task_result.state == "FAILURE":
+        return TaskProgress(
+            job_id=job_id,
+            status="failed",
+            error_message=str(task_result.info) if task_result.info else "Unknown error"
+        )
+    else:
+        return TaskProgress(job_id=job_id, status=task_result.state.lower())
+
+
+@router.get("/ingestion/stream/{job_id}", tags=["ingestion"])
+async def stream_ingestion_status(job_id: str, request: Request):
+    """
+    Stream ingestion job progress as Server-Sent Events.
+    
+    A frame with the same payload as /ingestion/status/{job_id} is pushed only when
+    the progress changes, and the stream closes once the job completes or fails.
+    Idle periods only carry a keep-alive comment.
+    """
+    async def event_stream():
+        last_payload = None
+        idle_seconds = 0.0
+        while not await request.is_disconnected():
+            try:
+                progress = await run_in_threadpool(_load_ingestion_progress, job_id)
+            except Exception as e:
+                yield _sse_event({"error": f"Failed to get job status: {str(e)}"})
+                return
+            
+            payload = jsonable_encoder(progress)
+            if payload != last_payload:
+                last_payload = payload
+                idle_seconds = 0.0
+                yield _sse_event(payload)
+                if progress.status in INGESTION_TERMINAL_STATUSES:
+                    return
+            elif idle_seconds >= INGESTION_STREAM_KEEPALIVE_SECONDS:
+                idle_seconds = 0.0
+                yield ": keep-alive\n\n"
+            
+            await asyncio.sleep(INGESTION_STREAM_POLL_SECONDS)
+            idle_seconds += INGESTION_STREAM_POLL_SECONDS
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
 @router.get("/ingestion/jobs", tags=["ingestion"])
 async def list_active_ingestion_jobs():
     """
@@ -443,13 +544,15 @@ async def start_evaluation(request: StartEvaluationRequest):
         )
 
 
-@router.get("/evaluations", response_model=EvaluationListResponse, tags=["evaluation"])
-async def list_evaluations(limit: int = 50):
+@router.get("/evaluations", response_model=Union[EvaluationListResponse, ProjectedRowsResponse], tags=["evaluation"])
+async def list_evaluations(limit: int = 50, fields: Optional[str] = None):
     """
     List all evaluations with their status and results.
     
     Args:
         limit: Maximum number of evaluations to return (default: 50)
+        fields: Optional comma-separated field names (e.g. "evaluation_id,status").
+            When given, only those fields are returned as positional rows.
         
     Returns:
         List of evaluations sorted by creation date (newest first)
@@ -470,6 +573,14 @@ async def list_evaluations(limit: int = 50):
         # List evaluations
         evaluations = await eval_service.list_evaluations(limit=limit)
         
+        field_names = parse_fields(fields)
+        if field_names:
+            return ProjectedRowsResponse(
+                fields=field_names,
+                rows=project_rows(evaluations, field_names),
+                total=len(evaluations)
+            )
+        
         return EvaluationListResponse(
             evaluations=evaluations,
             total=len(evaluations)
@@ -483,7 +594,7 @@ async def list_evaluations(limit: int = 50):
 
 
 @router.get("/evaluation/{evaluation_id}", response_model=EvaluationStatusResponse, tags=["evaluation"])
-async def get_evaluation_status(evaluation_id: str):
+async def get_evaluation_status(evaluation_id: str, request: Request):
     """
     Get the status and results of an evaluation.
     
@@ -503,6 +614,7 @@ async def get_evaluation_status(evaluation_id: str):
     Use related_evaluation_ids to find other evaluations with the same questions
     but different retrieval parameters (e.g., comparing with/without reranking).
     You can fetch each related evaluation individually using this endpoint.
+    Responses carry an ETag; pollers sending If-None-Match get 304 when unchanged.
     """
     try:
         # Get embedding from default pipeline (recursive_overlap)
@@ -526,7 +638,7 @@ async def get_evaluation_status(evaluation_id: str):
                 detail=f"Evaluation not found: {evaluation_id}"
             )
         
-        return status
+        return conditional_json_response(request, status)
         
     except HTTPException:
         raise
@@ -629,3 +741,80 @@ async def list_assets(path: Optional[str] = None):
             status_code=500,
             detail=f"Failed to list assets: {str(e)}"
         )
+
+
+# ===== UI ROUTES =====
+
+@router.api_route("/health", methods=["GET", "HEAD"], tags=["ui"])
+async def health():
+    """Lightweight liveness check; also used by the UI client to pre-warm its connection pool."""
+    return {"status": "ok"}
+
+
+def _bootstrap_error(error: Exception) -> str:
+    """Extract a readable message from an exception raised by a bundled route."""
+    return error.detail if isinstance(error, HTTPException) else str(error)
+
+
+@router.get("/ui/bootstrap", tags=["ui"])
+async def ui_bootstrap(
+    sessions_limit: int = 100,
+    evaluations_limit: int = 100,
+    recent_evaluations_limit: int = 50,
+    session_fields: Optional[str] = None,
+    evaluation_fields: Optional[str] = None
+):
+    """
+    Return everything the UI needs to populate its dropdowns in a single response.
+    
+    Each section has the same shape as its standalone endpoint (/sessions, /assets/list,
+    /evaluations), including the ?fields= projection via session_fields / evaluation_fields.
+    A failing section carries an "error" key instead of failing the whole call.
+    
+    Returns:
+        Dictionary with:
+        - sessions: Sessions list
+        - assets: Top-level assets listing
+        - evaluations_full: Up to evaluations_limit evaluations (newest first)
+        - evaluations_recent: The newest recent_evaluations_limit of those
+    """
+    sessions, assets, evaluations = await asyncio.gather(
+        session_service.list_all_sessions(limit=sessions_limit),
+        list_assets(),
+        list_evaluations(limit=evaluations_limit, fields=evaluation_fields),
+        return_exceptions=True
+    )
+    
+    session_field_names = parse_fields(session_fields)
+    if isinstance(sessions, Exception):
+        sessions_section = {"error": _bootstrap_error(sessions), "sessions": [], "total": 0}
+    elif session_field_names:
+        sessions_section = {
+            "fields": session_field_names,
+            "rows": project_rows(sessions, session_field_names),
+            "total": len(sessions)
+        }
+    else:
+        sessions_section = {"sessions": sessions, "total": len(sessions)}
+    
+    if isinstance(assets, Exception):
+        assets = {"error": _bootstrap_error(assets), "folders": [], "files": []}
+    
+    if isinstance(evaluations, Exception):
+        evaluations_full = {"error": _bootstrap_error(evaluations), "evaluations": [], "total": 0}
+        evaluations_recent = evaluations_full
+    elif isinstance(evaluations, ProjectedRowsResponse):
+        evaluations_full = evaluations
+        recent = evaluations.rows[:recent_evaluations_limit]
+        evaluations_recent = ProjectedRowsResponse(fields=evaluations.fields, rows=recent, total=len(recent))
+    else:
+        evaluations_full = evaluations
+        recent = evaluations.evaluations[:recent_evaluations_limit]
+        evaluations_recent = EvaluationListResponse(evaluations=recent, total=len(recent))
+    
+    return {
+        "sessions": sessions_section,
+        "assets": assets,
+        "evaluations_full": evaluations_full,
+        "evaluations_recent": evaluations_recent
+    }
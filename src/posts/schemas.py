@@ -38,3 +38,9 @@ class RetrievalResponse(BaseModel):
     query: str
     documents: List[RetrievedDocument]
     total_retrieved: int
+
+# Projected list schema (returned when a list endpoint is called with ?fields=)
+class ProjectedRowsResponse(BaseModel):
+    fields: List[str]
+    rows: List[List[Any]]
+    total: int
@@ -0,0 +1,42 @@
+import hashlib
+import json
+from typing import Any, Iterable, List, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Parse a comma-separated ``fields`` query parameter into a list of names."""
+    if not fields:
+        return None
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    return names or None
+
+
+def project_rows(records: Iterable[Any], fields: List[str]) -> List[List[Any]]:
+    """Project records (dicts or pydantic models) onto fields as positional rows.
+
+    Missing fields are returned as None so every row has the same length as fields.
+    """
+    rows: List[List[Any]] = []
+    for record in records:
+        if isinstance(record, dict):
+            get = record.get
+            rows.append([get(name) for name in fields])
+        else:
+            rows.append([getattr(record, name, None) for name in fields])
+    return rows
+
+
+def conditional_json_response(request: Request, payload: Any) -> Response:
+    """Serialize payload as JSON with a content ETag, answering 304 when the client already has it.
+
+    Lets pollers send If-None-Match and skip the body when nothing changed.
+    """
+    body = json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode("utf-8")
+    etag = f'"{hashlib.sha1(body).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
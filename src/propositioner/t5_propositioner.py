@@ -50,7 +50,7 @@ class T5Propositioner(BasePropositioner):
 		for item in request.items:
 			text = item.text or ""
 			if not text:
-				results.append(ChunkItem(source=item.source, len_characters=0, text=""))
+				results.append(ChunkItem.from_text(item.source, ""))
 				continue
 
 			sentences = self._split_sentences(text)
@@ -91,9 +91,9 @@ class T5Propositioner(BasePropositioner):
 					pass
 
 			merged_text = " ".join(aggregated_props)
-			results.append(ChunkItem(source=item.source, len_characters=len(merged_text), text=merged_text))
+			results.append(ChunkItem.from_text(item.source, merged_text))
 
-		return ChunkResponse(chunks=results)
+		return ChunkResponse.model_construct(chunks=results)
 
 	def _split_sentences(self, text: str) -> List[str]:
 		if NLTKTextSplitter is None:
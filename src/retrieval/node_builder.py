@@ -1,4 +1,4 @@
-from typing import List, Dict
+from typing import Any, Dict, Iterable, List
 import uuid
 from llama_index.core.schema import TextNode, Document  # type: ignore
 from src.chunking.schemas import ChunkItem
@@ -7,6 +7,15 @@ from src.chunking.schemas import ChunkItem
 class NodeBuilder:
 	"""Build LlamaIndex nodes from chunks with parent-child relationships."""
 
+	@staticmethod
+	def parent_texts_from_items(items: Iterable[Any]) -> Dict[str, str]:
+		"""Map each source to the text of its first item, in a single pass."""
+		parent_texts: Dict[str, str] = {}
+		setdefault = parent_texts.setdefault
+		for item in items:
+			setdefault(item.source, item.text)
+		return parent_texts
+
 	@staticmethod
 	def build_nodes_from_chunks(chunks: List[ChunkItem], parent_texts: Dict[str, str]) -> tuple[List[TextNode], List[Document]]:
 		"""
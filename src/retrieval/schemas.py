@@ -1,5 +1,6 @@
+from dataclasses import dataclass, field
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 class QueryRequest(BaseModel):
 	query: str
@@ -13,3 +14,25 @@ class RetrievalResult(BaseModel):
 class QueryResponse(BaseModel):
 	results: List[RetrievalResult]
 
+
+@dataclass(slots=True)
+class RetrievedDoc:
+	"""A retrieved chunk; slot attributes keep per-document field access cheap in hot loops."""
+	text: str
+	source: str = "unknown"
+	score: Optional[float] = None
+	metadata: Dict[str, Any] = field(default_factory=dict)
+	# Stored chunk embedding when the retriever fetched it; used for dedup, never serialized
+	vector: Optional[List[float]] = field(default=None, repr=False)
+
+	@classmethod
+	def from_dict(cls, data: Dict[str, Any]) -> "RetrievedDoc":
+		return cls(
+			text=data["text"],
+			source=data.get("source", "unknown"),
+			score=data.get("score"),
+			metadata=data.get("metadata") or {}
+		)
+
+	def to_dict(self) -> Dict[str, Any]:
+		return {"text": self.text, "source": self.source, "score": self.score, "metadata": self.metadata}
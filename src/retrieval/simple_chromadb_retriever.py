@@ -2,6 +2,7 @@ from typing import List, Tuple, Optional
 from llama_index.core import VectorStoreIndex  # type: ignore
 from src.embeddings.base import BaseEmbedding as CustomBaseEmbedding
 from src.retrieval.embedding_adapter import LlamaIndexEmbeddingAdapter
+from src.retrieval.schemas import RetrievedDoc
 from src.vectordb.chromadb.manager import ChromaDBManager
 from src.chromadb.config import db_path
 
@@ -44,12 +45,16 @@ class SimpleChromaDBRetriever:
 				# Collection might be empty or have issues
 				return
 				
-	def retrieve(self, query: str, top_k: int = 6, auto_merge: bool = True) -> Tuple[str, List[str]]:
-		"""Retrieve relevant chunks using LlamaIndex retriever."""
+	def retrieve(self, query: str, top_k: int = 6, auto_merge: bool = True) -> List[RetrievedDoc]:
+		"""Retrieve relevant chunks using LlamaIndex retriever.
+		
+		Returns one RetrievedDoc per chunk (same shape as SimpleQdrantRetriever), so callers
+		never have to join chunks and split them back apart.
+		"""
 		self._ensure_connection()
 		
 		if self.retriever is None:
-			return "", []
+			return []
 			
 		# Update top_k if different
 		self.retriever.similarity_top_k = top_k
@@ -57,18 +62,17 @@ class SimpleChromaDBRetriever:
 		# Use the retriever (base retriever without auto-merging for now)
 		nodes = self.retriever.retrieve(query)
 		
-		# Extract context and sources from nodes
-		context_parts = []
-		sources = set()
-		
+		results = []
 		for node in nodes:
-			context_parts.append(node.text)
-			if hasattr(node, 'metadata') and node.metadata:
-				source = node.metadata.get("source", "unknown")
-				if source != "unknown":
-					sources.add(source)
-				
-		return "\n\n".join(context_parts), list(sources)
+			metadata = dict(node.metadata) if getattr(node, 'metadata', None) else {}
+			results.append(RetrievedDoc(
+				text=node.text,
+				source=metadata.get("source", "unknown"),
+				score=float(node.score) if getattr(node, 'score', None) is not None else None,
+				metadata=metadata
+			))
+		
+		return results
 		
 	def is_available(self) -> bool:
 		"""Check if ChromaDB collection exists and has data."""
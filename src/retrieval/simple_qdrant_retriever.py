@@ -1,12 +1,18 @@
+import asyncio
 from typing import List, Tuple, Optional
 from llama_index.core import VectorStoreIndex  # type: ignore
+from llama_index.core.vector_stores.utils import metadata_dict_to_node  # type: ignore
+from qdrant_client import models as qdrant_models
 from src.embeddings.base import BaseEmbedding as CustomBaseEmbedding
 from src.retrieval.embedding_adapter import LlamaIndexEmbeddingAdapter
-from src.vectordb.qdrant_db.manager import QdrantManager
+from src.retrieval.schemas import RetrievedDoc
+from src.embeddings.schemas import EmbeddingInput
+from src.vectordb.qdrant_db.manager import get_qdrant_manager, get_async_qdrant_client
 from src.vectordb.qdrant_db.config import (
 	qdrant_host as default_qdrant_host,
 	qdrant_port as default_qdrant_port,
-	collection_name as default_collection_name
+	collection_name as default_collection_name,
+	search_params
 )
 
 
@@ -25,8 +31,8 @@ class SimpleQdrantRetriever:
 		self.qdrant_port = qdrant_port if qdrant_port is not None else default_qdrant_port
 		self.collection_name = collection_name if collection_name is not None else default_collection_name
 		
-		# Initialize Qdrant manager ONCE
-		self.qdrant_manager = QdrantManager(
+		# Shared Qdrant manager (one client and vector store per collection)
+		self.qdrant_manager = get_qdrant_manager(
 			host=self.qdrant_host,
 			port=self.qdrant_port,
 			collection_name=self.collection_name
@@ -36,6 +42,7 @@ class SimpleQdrantRetriever:
 		self.collection_name = self.qdrant_manager.get_collection()
 		self.vector_store = self.qdrant_manager.get_vector_store()
 		self.client = self.qdrant_manager.get_client()
+		self.aclient = get_async_qdrant_client(self.qdrant_host, self.qdrant_port)
 		self.embed_adapter = LlamaIndexEmbeddingAdapter(self.embedding)
 		
 		self.index = None
@@ -57,7 +64,7 @@ class SimpleQdrantRetriever:
 				# Collection might be empty or have issues
 				return
 				
-	def retrieve(self, query: str, top_k: int = 6) -> List[dict]:
+	def retrieve(self, query: str, top_k: int = 6) -> List[RetrievedDoc]:
 		"""Retrieve relevant chunks with detailed information including scores and metadata.
 		
 		Args:
@@ -65,41 +72,90 @@ class SimpleQdrantRetriever:
 			top_k: Number of documents to retrieve (default: 6)
 		
 		Returns:
-			List of dicts with keys: text, source, score, metadata
+			List of RetrievedDoc with text, source, score, metadata
 		"""
 		self._ensure_connection()
 		
 		if self.retriever is None:
 			return []
 			
-		# Update top_k if different
-		self.retriever.similarity_top_k = top_k
-		
-		# Use the retriever
-		nodes = self.retriever.retrieve(query)
-		
-		# Extract detailed information from nodes
-		results = []
-		for node in nodes:
-			doc_info = {
-				"text": node.text,
-				"source": "unknown",
-				"score": None,
-				"metadata": {}
-			}
-			
-			# Extract score if available
-			if hasattr(node, 'score') and node.score is not None:
-				doc_info["score"] = float(node.score)
-			
-			# Extract metadata
-			if hasattr(node, 'metadata') and node.metadata:
-				doc_info["metadata"] = dict(node.metadata)
-				doc_info["source"] = node.metadata.get("source", "unknown")
-			
-			results.append(doc_info)
+		return self.search_vector(self.embed_queries([query])[0], top_k=top_k)
+		
+	async def aretrieve(self, query: str, top_k: int = 6) -> List[RetrievedDoc]:
+		"""Async retrieve(): the embedding runs in a worker thread and the search awaits the async gRPC client."""
+		self._ensure_connection()
+		
+		if self.retriever is None:
+			return []
+		
+		vectors = await asyncio.to_thread(self.embed_queries, [query])
+		response = await self.aclient.query_points(
+			collection_name=self.collection_name,
+			query=vectors[0],
+			limit=top_k,
+			search_params=search_params,
+			with_payload=True,
+			with_vectors=True
+		)
+		return self._points_to_docs(response.points)
+		
+	def retrieve_batch(self, queries: List[str], top_k: int = 6) -> List[List[RetrievedDoc]]:
+		"""Retrieve for several queries with one embedding call and one Qdrant batch request.
+		
+		Args:
+			queries: The search queries
+			top_k: Number of documents to retrieve per query (default: 6)
+		
+		Returns:
+			One list of RetrievedDoc per query, in query order
+		"""
+		if not queries:
+			return []
+		return self.search_batch(self.embed_queries(queries), top_k=top_k)
+		
+	def embed_queries(self, queries: List[str]) -> List[List[float]]:
+		"""Embed all queries in a single embedding call."""
+		return self.embedding.embed(EmbeddingInput(documents=queries)).embeddings
+		
+	def search_vector(self, vector: List[float], top_k: int = 6) -> List[RetrievedDoc]:
+		"""Search with a precomputed query embedding."""
+		# Query Qdrant directly so the binary-quantization search params (oversample + rescore) apply
+		response = self.client.query_points(
+			collection_name=self.collection_name,
+			query=vector,
+			limit=top_k,
+			search_params=search_params,
+			with_payload=True,
+			with_vectors=True
+		)
+		return self._points_to_docs(response.points)
+		
+	def search_batch(self, vectors: List[List[float]], top_k: int = 6) -> List[List[RetrievedDoc]]:
+		"""Search several precomputed query embeddings in one Qdrant batch request, in input order."""
+		responses = self.client.query_batch_points(
+			collection_name=self.collection_name,
+			requests=[
+				qdrant_models.QueryRequest(query=vector, limit=top_k, params=search_params, with_payload=True, with_vector=True)
+				for vector in vectors
+			]
+		)
+		return [self._points_to_docs(response.points) for response in responses]
 		
-		return results
+	def _points_to_docs(self, points) -> List[RetrievedDoc]:
+		"""Convert Qdrant scored points into RetrievedDoc."""
+		docs = []
+		for point in points:
+			# Payloads are written by LlamaIndex's QdrantVectorStore; rebuild the node the same way it does
+			node = metadata_dict_to_node(point.payload or {})
+			metadata = dict(node.metadata) if node.metadata else {}
+			docs.append(RetrievedDoc(
+				text=node.get_content(),
+				source=metadata.get("source", "unknown"),
+				score=float(point.score) if point.score is not None else None,
+				metadata=metadata,
+				vector=point.vector if isinstance(point.vector, list) else None
+			))
+		return docs
 		
 	def is_available(self) -> bool:
 		"""Check if Qdrant collection exists and has data."""
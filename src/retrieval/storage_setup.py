@@ -1,18 +1,22 @@
+from concurrent.futures import ThreadPoolExecutor
 from llama_index.core import VectorStoreIndex  # type: ignore
-from llama_index.core.schema import TextNode  # type: ignore
+from llama_index.core.schema import MetadataMode, TextNode  # type: ignore
 from llama_index.core.storage.storage_context import StorageContext  # type: ignore
 from typing import List
 import os
 
 from .embedding_adapter import LlamaIndexEmbeddingAdapter
 from src.embeddings.base import BaseEmbedding as CustomBaseEmbedding
-from src.vectordb.qdrant_db.manager import QdrantManager
+from src.vectordb.qdrant_db.manager import get_qdrant_manager
 from src.vectordb.qdrant_db.config import (
 	qdrant_host as default_qdrant_host,
 	qdrant_port as default_qdrant_port,
 	collection_name as default_collection_name
 )
 
+# Nodes embedded per slice in write_nodes; each slice is upserted while the next one is embedded
+WRITE_BATCH_SIZE = 64
+
 
 class StorageSetup:
 	"""Set up LlamaIndex with Qdrant backend."""
@@ -29,8 +33,8 @@ class StorageSetup:
 		self.qdrant_port = qdrant_port
 		self.collection_name = collection_name
 		
-		# Initialize Qdrant manager ONCE
-		self.qdrant_manager = QdrantManager(
+		# Shared Qdrant manager (one client and vector store per collection)
+		self.qdrant_manager = get_qdrant_manager(
 			host=self.qdrant_host,
 			port=self.qdrant_port,
 			collection_name=self.collection_name
@@ -56,6 +60,28 @@ class StorageSetup:
 		# Qdrant persists automatically, no need to call persist()
 		return index
 
+	def write_nodes(self, leaf_nodes: List[TextNode]) -> None:
+		"""
+		Embed and upsert nodes into Qdrant in slices.
+		A single background writer upserts slice k while slice k + 1 is embedded, so network
+		round-trips overlap with embedding; upsert errors are raised here.
+		"""
+		if not leaf_nodes:
+			return
+		with ThreadPoolExecutor(max_workers=1) as writer:
+			pending = None
+			for start in range(0, len(leaf_nodes), WRITE_BATCH_SIZE):
+				batch = leaf_nodes[start:start + WRITE_BATCH_SIZE]
+				# Same text VectorStoreIndex embeds: node content plus its embeddable metadata
+				texts = [node.get_content(metadata_mode=MetadataMode.EMBED) for node in batch]
+				for node, vector in zip(batch, self.embed_adapter.get_text_embedding_batch(texts)):
+					node.embedding = vector
+				if pending is not None:
+					# At most one upsert in flight; surfaces the previous slice's error
+					pending.result()
+				pending = writer.submit(self.vector_store.add, batch)
+			pending.result()
+
 	def load_existing_index(self) -> VectorStoreIndex:
 		"""Load existing index from Qdrant."""
 		try:
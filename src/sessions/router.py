@@ -1,18 +1,21 @@
 from fastapi import APIRouter, HTTPException
-from typing import List
+from typing import List, Optional
 from .service import session_service
 from .schemas import SessionResponse
+from src.posts.utils import parse_fields, project_rows
 
 router = APIRouter()
 
 
 @router.get("/sessions", tags=["sessions"])
-async def list_all_sessions(limit: int = 100):
+async def list_all_sessions(limit: int = 100, fields: Optional[str] = None):
     """
     List all sessions from both Redis (active) and MongoDB (archived).
     
     Args:
         limit: Maximum number of sessions to return (default: 100)
+        fields: Optional comma-separated field names (e.g. "session_id,message_count").
+            When given, only those fields are returned as positional rows.
         
     Returns:
         List of sessions with basic information (id, created_at, message_count, last_activity)
@@ -20,6 +23,14 @@ async def list_all_sessions(limit: int = 100):
     try:
         sessions = await session_service.list_all_sessions(limit=limit)
         
+        field_names = parse_fields(fields)
+        if field_names:
+            return {
+                "fields": field_names,
+                "rows": project_rows(sessions, field_names),
+                "total": len(sessions)
+            }
+        
         return {
             "sessions": sessions,
             "total": len(sessions)
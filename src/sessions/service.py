@@ -236,7 +236,7 @@ class SessionService:
                 logger.warning(f"Could not fetch Redis sessions: {redis_error}")
             
             # Sort by last_activity descending
-            sessions_list.sort(key=lambda x: x.get("last_activity", ""), reverse=True)
+            sessions_list.sort(key=lambda x: x["last_activity"] or "", reverse=True)
             
             return sessions_list[:limit]
             
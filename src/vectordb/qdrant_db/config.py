@@ -1,7 +1,21 @@
-from src.config import QDRANT_HOST, QDRANT_PORT, QDRANT_COLLECTION_NAME
+from qdrant_client import models
+
+from src.config import QDRANT_HOST, QDRANT_PORT, QDRANT_GRPC_PORT, QDRANT_COLLECTION_NAME
 
 
 qdrant_host = QDRANT_HOST
 qdrant_port = QDRANT_PORT
+qdrant_grpc_port = QDRANT_GRPC_PORT
 collection_name = QDRANT_COLLECTION_NAME
 
+
+# New collections keep a 1-bit copy of every vector in RAM next to the FP32 originals
+quantization_config = models.BinaryQuantization(
+	binary=models.BinaryQuantizationConfig(always_ram=True)
+)
+
+# Search the binary index for oversampling * limit candidates, then rescore them on FP32 vectors.
+# Collections created without quantization ignore these params and search FP32 directly.
+search_params = models.SearchParams(
+	quantization=models.QuantizationSearchParams(ignore=False, rescore=True, oversampling=2.0)
+)
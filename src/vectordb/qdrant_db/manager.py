@@ -1,8 +1,24 @@
-from qdrant_client import QdrantClient
+import functools
+
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.models import Distance, VectorParams
 from llama_index.vector_stores.qdrant import QdrantVectorStore  # type: ignore
 from llama_index.core.storage.storage_context import StorageContext  # type: ignore
 
+from src.vectordb.qdrant_db.config import quantization_config, qdrant_grpc_port
+
+
+@functools.lru_cache(maxsize=4)
+def get_qdrant_client(host: str, port: int) -> QdrantClient:
+	"""Return the process-wide Qdrant client for host/port; searches go over gRPC."""
+	return QdrantClient(host=host, port=port, grpc_port=qdrant_grpc_port, prefer_grpc=True)
+
+
+@functools.lru_cache(maxsize=4)
+def get_async_qdrant_client(host: str, port: int) -> AsyncQdrantClient:
+	"""Return the shared async Qdrant client for host/port, for use from the API server's event loop."""
+	return AsyncQdrantClient(host=host, port=port, grpc_port=qdrant_grpc_port, prefer_grpc=True)
+
 
 class QdrantManager:
 	"""Manages Qdrant client, collection, vector store, and storage context - initialized once."""
@@ -12,8 +28,8 @@ class QdrantManager:
 		self.port = port
 		self.collection_name = collection_name
 		
-		# Initialize Qdrant client once
-		self.client = QdrantClient(host=self.host, port=self.port)
+		# Clients are shared per host/port so every manager reuses one connection
+		self.client = get_qdrant_client(self.host, self.port)
 		
 		# Ensure collection exists with proper configuration
 		self._ensure_collection()
@@ -37,10 +53,11 @@ class QdrantManager:
 			collection_names = [col.name for col in collections]
 			
 			if self.collection_name not in collection_names:
-				# Create collection with 384 dimensions (for e5-small embedding)
+				# Create collection with 384 dimensions (for e5-small embedding), binary-quantized for search
 				self.client.create_collection(
 					collection_name=self.collection_name,
-					vectors_config=VectorParams(size=384, distance=Distance.COSINE)
+					vectors_config=VectorParams(size=384, distance=Distance.COSINE),
+					quantization_config=quantization_config
 				)
 				print(f"✓ Created Qdrant collection: {self.collection_name}")
 			else:
@@ -66,3 +83,8 @@ class QdrantManager:
 		"""Return the Qdrant client."""
 		return self.client
 
+
+@functools.lru_cache(maxsize=4)
+def get_qdrant_manager(host: str, port: int, collection_name: str = "documents") -> QdrantManager:
+	"""Return a shared QdrantManager, so the collection check and vector store setup run once."""
+	return QdrantManager(host=host, port=port, collection_name=collection_name)
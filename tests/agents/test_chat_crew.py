@@ -0,0 +1,73 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+for _module in ("crewai", "langchain_openai", "llama_index.core", "qdrant_client", "torch", "transformers", "spacy",
+                "PyPDF2", "docling", "langchain_text_splitters"):
+    pytest.importorskip(_module)
+
+from src.agents.chat_agent import agent as agent_module
+from src.agents.chat_agent import crew as crew_module
+from src.agents.chat_agent.agent import ChatAgent
+from src.agents.chat_agent.crew import ChatCrew
+
+
+class FakeAgent:
+    def __init__(self, llm, **kwargs):
+        self.llm = llm
+        self.run_state = None
+
+
+class FakeCrew:
+    """Writes per-run state onto its agent, like Agent.execute_task, and holds it across a barrier."""
+
+    barrier = None
+
+    def __init__(self, agents, tasks, verbose=False):
+        self.agent = agents[0]
+
+    def kickoff(self, inputs):
+        self.agent.run_state = inputs["question"]
+        # Both calls are inside kickoff at once before either reads its state back
+        self.barrier.wait(timeout=5)
+        return f"answer to {self.agent.run_state}"
+
+
+@pytest.fixture
+def chat_crew(monkeypatch):
+    monkeypatch.setattr(agent_module, "Agent", FakeAgent)
+    monkeypatch.setattr(ChatAgent, "_create_crewai_llm", lambda self: object())
+    monkeypatch.setattr(crew_module, "Crew", FakeCrew)
+    monkeypatch.setattr(crew_module, "create_chat_task", lambda agent: agent)
+    monkeypatch.setattr(FakeCrew, "barrier", threading.Barrier(2))
+
+    # Skip __init__, which loads the semantic pipeline for the retrieval agent
+    chat_crew = ChatCrew.__new__(ChatCrew)
+    chat_crew.agent = ChatAgent()
+    chat_crew.retrieval_agent = None
+    chat_crew.use_query_enhancer = False
+    chat_crew.use_reranking = False
+    return chat_crew
+
+
+def test_concurrent_chats_do_not_share_agent_state(chat_crew):
+    built = []
+    build_agent = chat_crew.agent.build_agent
+
+    def tracking_build_agent():
+        agent = build_agent()
+        built.append(agent)
+        return agent
+
+    chat_crew.agent.build_agent = tracking_build_agent
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        first = pool.submit(chat_crew.chat, "What is GDPR?", "ctx")
+        second = pool.submit(chat_crew.chat, "What is the AI Act?", "ctx")
+        assert first.result(timeout=10) == ("answer to What is GDPR?", [])
+        assert second.result(timeout=10) == ("answer to What is the AI Act?", [])
+
+    # Each call ran on its own Agent, while the LLM was built once and shared
+    assert len(built) == 2 and built[0] is not built[1]
+    assert built[0].llm is built[1].llm is chat_crew.agent.llm
@@ -0,0 +1,94 @@
+import math
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("crewai")
+pytest.importorskip("langchain_openai")
+pytest.importorskip("llama_index.core")
+pytest.importorskip("qdrant_client")
+
+from src.agents.retrieval_agent.agent import DEDUP_SIMILARITY_THRESHOLD, RRF_K, _duplicate_owners, _fuse_documents
+from src.retrieval.schemas import RetrievedDoc
+
+
+def _doc(text, vector=None):
+    return RetrievedDoc(text=text, source=f"{text}.pdf", vector=vector)
+
+
+def test_fuse_empty():
+    assert _fuse_documents([]) == []
+    assert _fuse_documents([[], []]) == []
+
+
+def test_fuse_single_query_keeps_rank_order():
+    docs = [_doc("a"), _doc("b"), _doc("c")]
+    assert _fuse_documents([docs]) == docs
+
+
+def test_fuse_ranks_chunks_found_by_several_queries_first():
+    a, b, c = _doc("a"), _doc("b"), _doc("c")
+    b_again = _doc("b")
+    # b scores 2 / (RRF_K + 2), above a and c at 1 / (RRF_K + 1) each
+    fused = _fuse_documents([[a, b], [c, b_again]])
+    assert [doc.text for doc in fused] == ["b", "a", "c"]
+    # The first occurrence represents a collapsed duplicate
+    assert fused[0] is b
+
+
+def test_fuse_ties_keep_first_seen_order():
+    fused = _fuse_documents([[_doc("x")], [_doc("y")], [_doc("z")]])
+    assert [doc.text for doc in fused] == ["x", "y", "z"]
+
+
+def test_fuse_scores_follow_reciprocal_rank():
+    # d at rank 1 in one query: 1 / (K + 1)
+    # e at rank 3 in two queries: 2 / (K + 3), which is larger for K = 60
+    q1 = [_doc("d"), _doc("f1"), _doc("e")]
+    q2 = [_doc("f2"), _doc("f3"), _doc("e")]
+    assert 2 / (RRF_K + 3) > 1 / (RRF_K + 1)
+    fused = _fuse_documents([q1, q2])
+    assert [doc.text for doc in fused][:2] == ["e", "d"]
+    assert len(fused) == 5
+
+
+def _unit(angle):
+    return [math.cos(angle), math.sin(angle)]
+
+
+def test_duplicate_owners_collapses_near_identical_vectors():
+    # Whitespace variants of one chunk have different text but near-identical embeddings
+    docs = [_doc("Article 5", [1.0, 0.0]), _doc("Article  5", [0.999, 0.01]), _doc("Recital 12", [0.0, 1.0])]
+    assert _duplicate_owners(docs) == [0, 0, 2]
+
+
+def test_duplicate_owners_uses_cosine_not_magnitude():
+    docs = [_doc("a", [1.0, 1.0]), _doc("b", [10.0, 10.0])]
+    assert _duplicate_owners(docs) == [0, 0]
+
+
+def test_duplicate_owners_threshold_boundary():
+    above = math.acos(DEDUP_SIMILARITY_THRESHOLD) * 0.9
+    below = math.acos(DEDUP_SIMILARITY_THRESHOLD) * 1.1
+    assert _duplicate_owners([_doc("a", _unit(0.0)), _doc("b", _unit(above))]) == [0, 0]
+    assert _duplicate_owners([_doc("a", _unit(0.0)), _doc("b", _unit(below))]) == [0, 1]
+
+
+def test_duplicate_owners_maps_to_most_similar_kept_document():
+    # c is close to b only, so it belongs to b even though a was kept first
+    docs = [_doc("a", _unit(0.0)), _doc("b", _unit(1.0)), _doc("c", _unit(1.01))]
+    assert _duplicate_owners(docs) == [0, 1, 1]
+
+
+def test_duplicate_owners_falls_back_to_exact_text_without_vectors():
+    docs = [_doc("a", [1.0, 0.0]), _doc("a"), _doc("b", [1.0, 0.0]), _doc("b")]
+    # One missing vector disables the cosine path for the whole batch
+    assert _duplicate_owners(docs) == [0, 0, 2, 2]
+
+
+def test_fuse_collapses_near_duplicates_across_queries():
+    a = _doc("Article 5", [1.0, 0.0])
+    a_variant = _doc("Article  5", [0.999, 0.01])
+    b = _doc("Recital 12", [0.0, 1.0])
+    fused = _fuse_documents([[b, a], [a_variant]])
+    assert fused == [a, b]
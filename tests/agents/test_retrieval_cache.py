@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("crewai")
+pytest.importorskip("langchain_openai")
+pytest.importorskip("llama_index.core")
+pytest.importorskip("qdrant_client")
+
+from src.agents.retrieval_agent import cache as cache_module
+from src.agents.retrieval_agent.cache import RetrievalCache
+from src.retrieval.schemas import RetrievedDoc
+
+OPTIONS = ("e5-small", True, True, 5)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = SimpleNamespace(value=1000.0)
+    monkeypatch.setattr(cache_module, "time", SimpleNamespace(monotonic=lambda: now.value))
+    return now
+
+
+def _results():
+    return [RetrievedDoc(text="Article 5", source="gdpr.pdf", score=0.9, metadata={"page": 3})]
+
+
+def test_exact_hit_and_misses(clock):
+    cache = RetrievalCache()
+    cache.put("what is gdpr?", [1.0, 0.0], OPTIONS, _results())
+    assert cache.get("what is gdpr?", OPTIONS) == _results()
+    assert cache.get("what is the ai act?", OPTIONS) is None
+    # Entries are scoped by retrieval options
+    assert cache.get("what is gdpr?", ("e5-small", False, True, 5)) is None
+
+
+def test_semantic_hit_for_near_duplicate_question(clock):
+    cache = RetrievalCache(similarity_threshold=0.97)
+    cache.put("what is gdpr?", [1.0, 0.0], OPTIONS, _results())
+    # Magnitude does not matter, only direction
+    assert cache.get_similar([2.0, 0.05], OPTIONS) == _results()
+    assert cache.get_similar([0.7, 0.7], OPTIONS) is None
+    assert cache.get_similar([1.0, 0.0], ("other",)) is None
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = RetrievalCache(ttl_seconds=60)
+    cache.put("what is gdpr?", [1.0, 0.0], OPTIONS, _results())
+    clock.value += 59
+    assert cache.get("what is gdpr?", OPTIONS) is not None
+    assert cache.get_similar([1.0, 0.0], OPTIONS) is not None
+    clock.value += 2
+    assert cache.get("what is gdpr?", OPTIONS) is None
+    assert cache.get_similar([1.0, 0.0], OPTIONS) is None
+
+
+def test_exact_tier_evicts_least_recently_used(clock):
+    cache = RetrievalCache(max_entries=2)
+    cache.put("q1", [1.0, 0.0], OPTIONS, _results())
+    cache.put("q2", [0.0, 1.0], OPTIONS, _results())
+    assert cache.get("q1", OPTIONS) is not None
+    cache.put("q3", [-1.0, 0.0], OPTIONS, _results())
+    assert cache.get("q2", OPTIONS) is None
+    assert cache.get("q1", OPTIONS) is not None
+    assert cache.get("q3", OPTIONS) is not None
+
+
+def test_callers_cannot_mutate_cached_results(clock):
+    cache = RetrievalCache()
+    stored = _results()
+    cache.put("what is gdpr?", [1.0, 0.0], OPTIONS, stored)
+    stored[0].score = None
+    stored[0].metadata["page"] = 99
+
+    hit = cache.get("what is gdpr?", OPTIONS)
+    hit[0].score = None
+    hit[0].metadata["reranked"] = True
+    similar = cache.get_similar([1.0, 0.0], OPTIONS)
+    similar[0].metadata.clear()
+
+    assert cache.get("what is gdpr?", OPTIONS) == _results()
+    assert cache.get_similar([1.0, 0.0], OPTIONS) == _results()
+
+
+def test_clear(clock):
+    cache = RetrievalCache()
+    cache.put("what is gdpr?", [1.0, 0.0], OPTIONS, _results())
+    cache.clear()
+    assert cache.get("what is gdpr?", OPTIONS) is None
+    assert cache.get_similar([1.0, 0.0], OPTIONS) is None
@@ -0,0 +1,153 @@
+import random
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from src.chunking.recursive_overlap_chunker import RecursiveOverlapChunker
+from src.chunking.schemas import ChunkItem, ChunkRequest
+
+
+LEGAL_TEXT = (
+    "Article 1\nSubject matter and scope\n\n"
+    "1. This Regulation lays down harmonised rules on artificial intelligence. "
+    "It applies to providers placing AI systems on the market in the Union.\n"
+    "2. This Regulation does not apply to areas outside the scope of Union law.\n\n"
+    "Article 2\nDefinitions\n\n"
+    "For the purposes of this Regulation, the following definitions apply: "
+    "(1) 'AI system' means a machine-based system designed to operate with varying levels of autonomy; "
+    "(2) 'risk' means the combination of the probability of an occurrence of harm and the severity of that harm.\n"
+    "Supercalifragilisticexpialidociousunbrokenwordthatexceedsanychunksize\n\n\n"
+    "   \n\nArticle 3\nEntry into force. This Regulation shall enter into force on the twentieth day."
+)
+
+
+def _make_chunker(chunk_size: int, overlap_ratio: float = 0.2) -> RecursiveOverlapChunker:
+    return RecursiveOverlapChunker(SimpleNamespace(max_characters=chunk_size), overlap_ratio)
+
+
+def _recursive_split(chunker: RecursiveOverlapChunker, text: str) -> List[str]:
+    """Reference copy of the recursive splitter the worklist version replaced."""
+    chunks: List[str] = []
+
+    def split_fragment(fragment: str, level: int) -> None:
+        fragment = fragment.strip()
+        if not fragment:
+            return
+        if len(fragment) <= chunker.chunk_size:
+            chunks.append(fragment)
+            return
+
+        if level >= len(chunker.separators):
+            for start in range(0, len(fragment), chunker.chunk_size):
+                chunk = fragment[start : start + chunker.chunk_size].strip()
+                if chunk:
+                    chunks.append(chunk)
+            return
+
+        separator = chunker.separators[level]
+        pieces = fragment.split(separator) if separator else list(fragment)
+        if len(pieces) == 1:
+            split_fragment(fragment, level + 1)
+            return
+
+        buffer = ""
+        for idx, piece in enumerate(pieces):
+            piece = piece.strip()
+            if not piece:
+                continue
+            candidate = f"{buffer}{separator}{piece}" if buffer else piece
+            if len(candidate) > chunker.chunk_size and buffer:
+                split_fragment(buffer, level + 1)
+                buffer = piece
+            elif len(candidate) > chunker.chunk_size:
+                split_fragment(piece, level + 1)
+                buffer = ""
+            else:
+                buffer = candidate
+
+            if buffer and idx < len(pieces) - 1 and separator:
+                buffer = f"{buffer}{separator}"
+
+        if buffer:
+            if buffer.endswith(separator):
+                buffer = buffer[: -len(separator)]
+            split_fragment(buffer, level + 1)
+
+    split_fragment(text.strip(), 0)
+    return [chunk for chunk in chunks if chunk]
+
+
+def _random_text(rng: random.Random) -> str:
+    words = ["the", "Member", "State", "shall", "ensure", "that", "data", "Article", "12(3)", "processing",
+             "a" * rng.randint(20, 90)]
+    separators = [" ", " ", " ", ". ", "\n", "\n\n", "  ", " \n "]
+    return "".join(rng.choice(words) + rng.choice(separators) for _ in range(rng.randint(0, 400)))
+
+
+@pytest.mark.parametrize("chunk_size", [7, 40, 120, 512])
+def test_worklist_split_matches_recursive_reference(chunk_size):
+    chunker = _make_chunker(chunk_size)
+    assert chunker._split_text(LEGAL_TEXT) == _recursive_split(chunker, LEGAL_TEXT)
+
+
+def test_worklist_split_matches_recursive_reference_on_seeded_inputs():
+    rng = random.Random(1234)
+    for _ in range(300):
+        chunker = _make_chunker(rng.randint(5, 200))
+        text = _random_text(rng)
+        assert chunker._split_text(text) == _recursive_split(chunker, text)
+
+
+def test_split_emits_stripped_chunks_within_size():
+    chunker = _make_chunker(60)
+    chunks = chunker._split_text(LEGAL_TEXT)
+    assert chunks
+    for chunk in chunks:
+        assert chunk and chunk == chunk.strip()
+        assert len(chunk) <= 60
+
+
+def test_overlap_tail_starts_on_word_boundary():
+    chunker = _make_chunker(50)  # chunk_overlap == 10
+    assert chunker._overlap_tail("the quick brown foxes jump") == "foxes jump"
+    assert chunker._overlap_tail("the quick brownfoxes jump") == "jump"
+    # A tail without whitespace is kept whole rather than dropped
+    assert chunker._overlap_tail("abcdefghijklmnop") == "ghijklmnop"
+    assert chunker._overlap_tail("short") == "short"
+    # A tail that starts on whitespace keeps its first whole word and no leading space
+    assert chunker._overlap_tail("aaaaa bbb ccccc") == "bbb ccccc"
+    assert chunker._overlap_tail("aaaa  bbb ccccc") == "bbb ccccc"
+
+
+def test_apply_overlap_after_whitespace_cut_has_single_space():
+    chunker = _make_chunker(50)
+    assert chunker._apply_overlap(["aaaaa bbb ccccc", "ddd"]) == ["aaaaa bbb ccccc", "bbb ccccc ddd"]
+
+
+def test_apply_overlap_prefixes_previous_tail():
+    chunker = _make_chunker(50)
+    chunks = ["the quick brownfoxes jump", "over the lazy dog", "x" * 50]
+    assert chunker._apply_overlap(chunks) == [
+        "the quick brownfoxes jump",
+        "jump over the lazy dog",
+        # Capped at chunk_size, keeping the end of the combined text
+        "x" * 50,
+    ]
+
+
+def test_apply_overlap_disabled():
+    chunker = _make_chunker(50, overlap_ratio=0.0)
+    chunks = ["first chunk", "second chunk"]
+    assert chunker._apply_overlap(chunks) == chunks
+
+
+def test_chunk_keeps_item_source():
+    chunker = _make_chunker(80)
+    request = ChunkRequest(items=[ChunkItem(source="a.pdf", len_characters=len(LEGAL_TEXT), text=LEGAL_TEXT)])
+    response = chunker.chunk(request)
+    assert response.chunks
+    assert {chunk.source for chunk in response.chunks} == {"a.pdf"}
+    assert all(chunk.len_characters == len(chunk.text) for chunk in response.chunks)
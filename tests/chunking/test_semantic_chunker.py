@@ -0,0 +1,118 @@
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("torch")
+pytest.importorskip("spacy")
+pytest.importorskip("langchain_text_splitters")
+
+from src.chunking.semantic_chunker import SemanticChunker, _simhash
+
+
+class CountingEmbedding:
+    """Maps each text to a vector derived from its length and records what was embedded."""
+
+    embedding_name = "counting"
+
+    def __init__(self):
+        self.embedded = []
+
+    def embed(self, request):
+        self.embedded.extend(request.documents)
+        return SimpleNamespace(embeddings=[[float(len(text)), 1.0] for text in request.documents])
+
+
+@pytest.fixture
+def chunker():
+    # Skip __init__, which loads the spaCy pipeline and opens the on-disk embedding cache
+    chunker = SemanticChunker.__new__(SemanticChunker)
+    chunker.embeddings = CountingEmbedding()
+    chunker.embedding_cache = None
+    return chunker
+
+
+def test_simhash_is_deterministic_and_case_insensitive():
+    text = "The controller shall implement appropriate technical and organisational measures."
+    assert _simhash(text) == _simhash(text)
+    assert _simhash(text) == _simhash(text.upper())
+    assert 0 <= _simhash(text) < 2 ** 64
+
+
+def test_simhash_separates_unrelated_texts():
+    a = _simhash("The controller shall implement appropriate technical and organisational measures.")
+    b = _simhash("Member States may provide for more specific rules on processing employee data.")
+    assert a != b
+
+
+def test_simhash_handles_short_and_empty_texts():
+    assert _simhash("Article") == _simhash("article")
+    assert _simhash("") == _simhash("")
+
+
+def test_embed_texts_embeds_one_representative_per_signature(chunker):
+    footer = "Official Journal of the European Union L 119/1"
+    texts = [footer, "Article 5 Principles relating to processing.", footer.upper(), "Recital 39."]
+    vectors = chunker._embed_texts(texts).tolist()
+
+    # The repeated footer is embedded once and its vector reused for the later copy
+    assert chunker.embeddings.embedded.count(footer) == 1
+    assert footer.upper() not in chunker.embeddings.embedded
+    assert len(vectors) == len(texts)
+    assert vectors[2] == vectors[0]
+    assert vectors[1] == [float(len(texts[1])), 1.0]
+    assert vectors[3] == [float(len(texts[3])), 1.0]
+
+
+def test_embed_batched_restores_input_order(chunker, monkeypatch):
+    monkeypatch.setattr("src.chunking.semantic_chunker.EMBED_BATCH_SIZE", 2)
+    texts = ["ccc", "a", "bbbbb", "dd"]
+    assert chunker._embed_batched(texts) == [[3.0, 1.0], [1.0, 1.0], [5.0, 1.0], [2.0, 1.0]]
+    # Batches are length-sorted so similar lengths share padding
+    assert chunker.embeddings.embedded == ["a", "dd", "ccc", "bbbbb"]
+
+
+SENTENCES = ["S0.", "S1.", "S2.", "S3.", "S4.", "S5."]
+
+
+def _dict_groups_slice(sentences, break_indices):
+    """Reference copy of the per-group dict slicing the combined-sentence list replaced."""
+    grouped = [{"index": idx} for idx in range(len(sentences))]
+    chunks = []
+    start_idx = 0
+    for idx in break_indices:
+        end_idx = idx + 1
+        chunks.append(" ".join(sentences[grouped[start_idx]["index"]:grouped[end_idx]["index"] + 1]))
+        start_idx = end_idx + 1
+    if start_idx < len(grouped):
+        segment = sentences[grouped[start_idx]["index"]:grouped[-1]["index"] + 1]
+        if segment:
+            chunks.append(" ".join(segment))
+    return chunks
+
+
+def test_combine_with_buffer_centres_groups_on_sentences(chunker):
+    assert chunker._combine_with_buffer(SENTENCES[:4], 1) == ["S0. S1.", "S0. S1. S2.", "S1. S2. S3.", "S2. S3."]
+    assert chunker._combine_with_buffer(SENTENCES[:3], 2) == ["S0. S1. S2."] * 3
+    assert chunker._combine_with_buffer([], 1) == []
+
+
+@pytest.mark.parametrize("break_indices, expected", [
+    ([], ["S0. S1. S2. S3. S4. S5."]),
+    ([1], ["S0. S1. S2.", "S3. S4. S5."]),
+    ([0, 3], ["S0. S1.", "S2. S3. S4.", "S5."]),
+    ([4], ["S0. S1. S2. S3. S4. S5."]),
+])
+def test_slice_by_breakpoints(chunker, break_indices, expected):
+    assert chunker._slice_by_breakpoints(SENTENCES, break_indices) == expected
+
+
+def test_slice_by_breakpoints_matches_dict_groups_reference(chunker):
+    for n in range(2, 8):
+        sentences = [f"S{i}." for i in range(n)]
+        # Breakpoints come from np.flatnonzero over n - 1 distances: sorted, unique, in range
+        for r in range(n):
+            for break_indices in itertools.combinations(range(n - 1), r):
+                assert chunker._slice_by_breakpoints(sentences, list(break_indices)) == \
+                    _dict_groups_slice(sentences, list(break_indices))
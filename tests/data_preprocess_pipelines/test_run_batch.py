@@ -0,0 +1,119 @@
+from typing import Dict, List
+
+import pytest
+
+pytest.importorskip("pydantic")
+
+from src.chunking.schemas import ChunkItem, ChunkResponse
+from src.data_preprocess_pipelines.base import DataPreprocessBase
+from src.ingestion.schemas import IngestedItem, IngestResponse
+
+
+def _item(source: str, text: str) -> IngestedItem:
+    return IngestedItem(source=source, len_characters=len(text), text=text)
+
+
+DOCUMENTS: Dict[str, List[IngestedItem]] = {
+    "a.pdf": [_item("a.pdf", "Article 1. Scope."), _item("a.pdf", "Article 2. Definitions.")],
+    "blank.pdf": [_item("blank.pdf", ""), _item("blank.pdf", "  \n ")],
+    "b.pdf": [_item("b.pdf", "Recital 12.")],
+}
+
+
+class FakeIngestor:
+    def ingest(self, request):
+        if request.path_or_url == "broken.pdf":
+            raise IOError("cannot open broken.pdf")
+        return IngestResponse(items=DOCUMENTS[request.path_or_url])
+
+
+class FakeChunker:
+    """One chunk per sentence; records every call."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = []
+
+    def chunk(self, request):
+        self.calls.append([item.source for item in request.items])
+        if self.fail:
+            raise RuntimeError("chunker crashed")
+        return ChunkResponse(chunks=[
+            ChunkItem(source=item.source, len_characters=len(sentence), text=sentence)
+            for item in request.items
+            for sentence in item.text.split(". ")
+        ])
+
+
+class FakeStorage:
+    def __init__(self):
+        self.writes = []
+
+    def write_nodes(self, nodes):
+        self.writes.append(list(nodes))
+
+
+def test_base_run_batch_runs_each_document_in_order():
+    class Pipeline(DataPreprocessBase):
+        def run_single_doc(self, file_path):
+            return {"success": True, "file_path": file_path}
+
+    assert Pipeline().run_batch(["b.pdf", "a.pdf"]) == [
+        {"success": True, "file_path": "b.pdf"},
+        {"success": True, "file_path": "a.pdf"},
+    ]
+
+
+@pytest.fixture
+def semantic_pipeline():
+    for module in ("torch", "transformers", "spacy", "PyPDF2", "docling", "llama_index.core", "qdrant_client",
+                   "langchain_text_splitters"):
+        pytest.importorskip(module)
+    from src.data_preprocess_pipelines.data_preprocess import DataPreprocessSemantic
+
+    # Skip __init__, which loads the propositioner and embedding models
+    pipeline = DataPreprocessSemantic.__new__(DataPreprocessSemantic)
+    pipeline.ingestor = FakeIngestor()
+    pipeline.chunker = FakeChunker()
+    pipeline.storage_setup = FakeStorage()
+    return pipeline
+
+
+def test_semantic_run_batch_chunks_and_writes_once(semantic_pipeline):
+    paths = ["a.pdf", "blank.pdf", "broken.pdf", "b.pdf"]
+    results = semantic_pipeline.run_batch(paths)
+
+    assert [r["file_path"] for r in results] == paths
+    a, blank, broken, b = results
+    assert a["success"] and a["chunk_count"] == 4 and a["node_count"] == 4
+    assert a["character_count"] == sum(item.len_characters for item in DOCUMENTS["a.pdf"])
+    assert b["success"] and b["chunk_count"] == 1 and b["node_count"] == 1
+    assert not blank["success"] and blank["error"] == "No content extracted from document"
+    assert not broken["success"] and "broken.pdf" in broken["error"]
+
+    # Every non-empty item goes through one chunker call and one Qdrant write
+    assert semantic_pipeline.chunker.calls == [["a.pdf", "a.pdf", "b.pdf"]]
+    assert len(semantic_pipeline.storage_setup.writes) == 1
+    nodes = semantic_pipeline.storage_setup.writes[0]
+    assert len(nodes) == 5
+    # Chunk indices restart for each document
+    assert [(n.metadata["source"], n.metadata["chunk_index"]) for n in nodes] == [
+        ("a.pdf", 0), ("a.pdf", 1), ("a.pdf", 2), ("a.pdf", 3), ("b.pdf", 0),
+    ]
+
+
+def test_semantic_run_batch_marks_ingested_documents_failed_when_chunking_fails(semantic_pipeline):
+    semantic_pipeline.chunker = FakeChunker(fail=True)
+    results = semantic_pipeline.run_batch(["a.pdf", "broken.pdf", "b.pdf"])
+
+    assert [r["success"] for r in results] == [False, False, False]
+    assert results[0]["error"] == "chunker crashed"
+    assert results[2]["error"] == "chunker crashed"
+    assert "broken.pdf" in results[1]["error"]
+    assert semantic_pipeline.storage_setup.writes == []
+
+
+def test_semantic_run_single_doc_matches_batch_counts(semantic_pipeline):
+    result = semantic_pipeline.run_single_doc("a.pdf")
+    assert result["success"] and result["chunk_count"] == 4 and result["node_count"] == 4
+    assert semantic_pipeline.run_single_doc("blank.pdf")["success"] is False
@@ -0,0 +1,22 @@
+from gradio_app.choice_builders import evaluation_choices, evaluation_reuse_choices, session_choices
+
+
+def test_session_choices_fall_back_to_session_id():
+    rows = [["abcdef123456", "What is GDPR?", 2], ["0123456789ab", None, None]]
+    assert session_choices(rows) == [
+        ("What is GDPR?... (2 msgs)", "abcdef123456"),
+        ("Session 01234567... (0 msgs)", "0123456789ab"),
+    ]
+
+
+def test_evaluation_choices_show_unknown_for_missing_status():
+    rows = [["eval-1", "completed", "/data/eu/gdpr"], ["eval-2", None, None]]
+    assert evaluation_choices(rows) == [
+        ("eval-1... (completed, gdpr)", "eval-1"),
+        ("eval-2... (unknown, )", "eval-2"),
+    ]
+
+
+def test_evaluation_reuse_choices_only_completed():
+    rows = [["eval-1", "completed", "/data/eu/gdpr", 12], ["eval-2", "running", "/data/eu/ai", 3]]
+    assert evaluation_reuse_choices(rows) == [("eval-1... (gdpr, 12 docs)", "eval-1")]